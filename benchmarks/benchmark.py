@@ -0,0 +1,166 @@
+"""End-To-End Benchmark
+
+Runs the registry client and a full sweep against a local fake HTTPS
+registry and a fake `trivy` executable, then reports tags/sec, wall time,
+peak RSS and a per-phase breakdown for every size.
+
+Usage: PYTHONPATH=src:tests python benchmarks/benchmark.py [options]
+"""
+
+from argparse import ArgumentParser, Namespace
+from contextlib import contextmanager
+from json import dumps
+from logging import WARNING, getLogger
+from os import environ, path, pathsep
+from resource import RUSAGE_CHILDREN, RUSAGE_SELF, getrusage
+from sys import exit as sys_exit
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Iterator
+from fake_registry import FakeRegistry
+from docker_registry_client import DockerRegistryClient
+from report import export_scan_results
+from scanner_options import ScannerOptions
+from sweep import Sweep
+
+FAKE_TRIVY_DIR: str = path.join(
+    path.dirname(path.abspath(__file__)), "..", "tests", "fake_trivy"
+)
+
+
+@contextmanager
+def phase(phases: dict[str, float], name: str) -> Iterator[None]:
+    """Time Benchmark Phase Context Manager"""
+
+    start: float = perf_counter()
+    try:
+        yield
+    finally:
+        phases.update({name: round(perf_counter() - start, 3)})
+
+
+def run_benchmark(size: int, args: Namespace) -> dict[str, Any]:
+    """Run Benchmark For A Number Of Tags Function"""
+
+    phases: dict[str, float] = {}
+    repositories: int = max(1, size // args.tags_per_repository)
+
+    with FakeRegistry(
+        repositories=repositories,
+        tags=args.tags_per_repository,
+        aliases=args.aliases,
+        latency=args.latency,
+        page_size=args.page_size,
+    ) as registry, TemporaryDirectory() as tmp_dir:
+        client: DockerRegistryClient = DockerRegistryClient(
+            registry_url=registry.url,
+            ca_file=registry.ca_file,
+            max_connections=args.registry_concurrency,
+        )
+        start: float = perf_counter()
+
+        with phase(phases=phases, name="catalog"):
+            images: list[str] = list(client.iter_images(page_size=args.page_size))
+        with phase(phases=phases, name="tags"):
+            image_tags: list[str] = [
+                image_tag
+                for image in images
+                for image_tag in client.iter_image_tags(
+                    image=image, page_size=args.page_size
+                )
+            ]
+        with phase(phases=phases, name="digests"):
+            client.get_image_digests(image_tags=image_tags)
+
+        sweep: Sweep = Sweep(
+            client=client,
+            options=ScannerOptions(processes=args.processes),
+            page_size=args.page_size,
+            registry_concurrency=args.registry_concurrency,
+        )
+        with phase(phases=phases, name="sweep"):
+            sweep.run(images=client.iter_images(page_size=args.page_size))
+        with phase(phases=phases, name="report"):
+            export_scan_results(
+                scan_results=sweep.scan_results,
+                output_file=path.join(tmp_dir, "scan_results_report.json"),
+            )
+
+        wall_time: float = perf_counter() - start
+        client.close()
+        registry_requests: dict[str, int] = dict(registry.requests)
+
+    return {
+        "tags": len(image_tags),
+        "wall_time": round(wall_time, 3),
+        "tags_per_second": round(len(image_tags) / phases.get("sweep"), 2),
+        "peak_rss_kb": getrusage(RUSAGE_SELF).ru_maxrss,
+        "peak_children_rss_kb": getrusage(RUSAGE_CHILDREN).ru_maxrss,
+        "phases": phases,
+        "registry_requests": registry_requests,
+    }
+
+
+def parse_args() -> Namespace:
+    """Parse Command Line Arguments Function"""
+
+    parser: ArgumentParser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--tags-per-repository", type=int, default=10)
+    parser.add_argument("--aliases", type=int, default=1)
+    parser.add_argument("--processes", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--registry-concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--trivy-delay", type=float, default=0.0, help="seconds")
+    parser.add_argument("--trivy-exit-code", type=int, default=111)
+    parser.add_argument("--output", help="JSON file receiving the results")
+    parser.add_argument(
+        "--min-tags-per-second",
+        type=float,
+        default=0.0,
+        help="fail when any size scans slower than this",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Benchmark Main Function"""
+
+    args: Namespace = parse_args()
+    getLogger().setLevel(WARNING)
+    environ.update(
+        {
+            "PATH": f"{FAKE_TRIVY_DIR}{pathsep}{environ.get('PATH', '')}",
+            "FAKE_TRIVY_DELAY": str(args.trivy_delay),
+            "FAKE_TRIVY_EXIT_CODE": str(args.trivy_exit_code),
+        }
+    )
+
+    results: list[dict[str, Any]] = []
+    for size in args.sizes:
+        result: dict[str, Any] = run_benchmark(size=size, args=args)
+        results.append(result)
+        print(
+            f"{result.get('tags'):>6} tags | {result.get('wall_time'):>8.3f}s wall"
+            f" | {result.get('tags_per_second'):>8.2f} tags/s"
+            f" | {result.get('peak_rss_kb') // 1024:>4} MiB RSS"
+            f" | {result.get('phases')}"
+        )
+
+    if args.output:
+        with open(file=args.output, mode="w", encoding="UTF-8") as file:
+            file.write(dumps(results, indent=2))
+
+    too_slow: list[dict[str, Any]] = [
+        result
+        for result in results
+        if result.get("tags_per_second") < args.min_tags_per_second
+    ]
+    for result in too_slow:
+        print(f"❌ {result.get('tags')} tags: {result.get('tags_per_second')} tags/s")
+    return 1 if too_slow else 0
+
+
+if __name__ == "__main__":
+    sys_exit(main())
@@ -4,20 +4,74 @@ from typing import Final, Optional
 from os import getenv
 
 LOGGING_LEVEL: Final[str] = getenv(key="LOGGING_LEVEL", default="INFO")
+LOGGING_FORMAT: Final[str] = getenv(key="LOGGING_FORMAT", default="text").lower()
+LOGGING_STATUS_INTERVAL: Final[float] = float(
+    getenv(key="LOGGING_STATUS_INTERVAL", default="0")
+)
+LOGGING_STATUS_LINES: Final[int] = int(getenv(key="LOGGING_STATUS_LINES", default="10"))
 DOCKER_REGISTRY_URL: Final[Optional[str]] = getenv(key="DOCKER_REGISTRY_URL")
+DOCKER_REGISTRIES_FILE: Final[Optional[str]] = getenv(key="DOCKER_REGISTRIES_FILE")
 DOCKER_REGISTRY_CA_FILE: Final[Optional[str]] = getenv(key="DOCKER_REGISTRY_CA_FILE")
+DOCKER_REGISTRY_USERNAME: Final[Optional[str]] = getenv(key="DOCKER_REGISTRY_USERNAME")
+DOCKER_REGISTRY_PASSWORD: Final[Optional[str]] = getenv(key="DOCKER_REGISTRY_PASSWORD")
 DOCKER_IMAGES_FILTER: Final[str] = getenv(key="DOCKER_IMAGES_FILTER", default=r".*")
 DOCKER_TAGS_FILTER: Final[str] = getenv(key="DOCKER_TAGS_FILTER", default=r".*")
+DOCKER_TAGS_KEEP_SEMVER: Final[int] = int(
+    getenv(key="DOCKER_TAGS_KEEP_SEMVER", default="0")
+)
+DOCKER_TAGS_KEEP_RECENT: Final[int] = int(
+    getenv(key="DOCKER_TAGS_KEEP_RECENT", default="0")
+)
+DOCKER_TAGS_MAX_AGE: Final[Optional[str]] = getenv(key="DOCKER_TAGS_MAX_AGE")
 IMAGE_LIST_NBR_MAX: Final[int] = int(getenv(key="IMAGE_LIST_NBR_MAX", default="1000"))
+REGISTRY_PAGE_SIZE: Final[int] = int(
+    getenv(key="REGISTRY_PAGE_SIZE", default=str(IMAGE_LIST_NBR_MAX))
+)
 HTTPS_CONNECTION_TIMEOUT: Final[int] = int(
     getenv(key="HTTP_CONNECTION_TIMEOUT", default="3")
 )
+REGISTRY_CONCURRENCY: Final[int] = int(getenv(key="REGISTRY_CONCURRENCY", default="4"))
+REGISTRY_RATE_LIMIT: Final[float] = float(
+    getenv(key="REGISTRY_RATE_LIMIT", default="0")
+)
+REGISTRY_RATE_BURST: Final[int] = int(getenv(key="REGISTRY_RATE_BURST", default="10"))
+REGISTRY_MAX_RETRIES: Final[int] = int(getenv(key="REGISTRY_MAX_RETRIES", default="5"))
 SCAN_SEVERITY: Final[str] = getenv(key="SCAN_SEVERITY", default="HIGH,CRITICAL")
 SCAN_MIN_SEVERITY: Final[Optional[str]] = getenv(key="SCAN_MIN_SEVERITY")
 SCAN_RESULTS_REPORT_FILE: Final[str] = getenv(
     key="SCAN_RESULTS_REPORT_FILE", default="./scan_results_report.json"
 )
+SCAN_RESULTS_STREAM_FILE: Final[Optional[str]] = getenv(key="SCAN_RESULTS_STREAM_FILE")
+SCAN_RESULTS_DELTA_FILE: Final[Optional[str]] = getenv(key="SCAN_RESULTS_DELTA_FILE")
+RESULTS_DB_FILE: Final[Optional[str]] = getenv(key="RESULTS_DB_FILE")
+SCAN_RESULTS_FSYNC_EVERY: Final[int] = int(
+    getenv(key="SCAN_RESULTS_FSYNC_EVERY", default="100")
+)
+SCAN_TIMEOUT: Final[str] = getenv(key="SCAN_TIMEOUT", default="30m")
+SCAN_RETRIES: Final[int] = int(getenv(key="SCAN_RETRIES", default="2"))
 SCAN_SCANNERS: Final[str] = getenv(key="SCAN_SCANNERS", default="vuln,secret")
 MULTIPROCESSING_PROCESSES: Final[int] = int(
     getenv(key="MULTIPROCESSING_PROCESSES", default="5")
 )
+SCAN_CACHE_FILE: Final[Optional[str]] = getenv(key="SCAN_CACHE_FILE")
+TRIVY_SERVER_MODE: Final[bool] = getenv(
+    key="TRIVY_SERVER_MODE", default="false"
+).lower() in ["1", "true", "yes"]
+TRIVY_SERVER_LISTEN: Final[str] = getenv(
+    key="TRIVY_SERVER_LISTEN", default="127.0.0.1:4954"
+)
+TRIVY_CACHE_DIR: Final[Optional[str]] = getenv(key="TRIVY_CACHE_DIR")
+TRIVY_CACHE_MAX_SIZE: Final[Optional[str]] = getenv(key="TRIVY_CACHE_MAX_SIZE")
+SBOM_CACHE_DIR: Final[Optional[str]] = getenv(key="SBOM_CACHE_DIR")
+METRICS_FILE: Final[Optional[str]] = getenv(key="METRICS_FILE")
+PROGRESS_INTERVAL: Final[float] = float(getenv(key="PROGRESS_INTERVAL", default="60"))
+DAEMON_LISTEN: Final[str] = getenv(
+    key="DAEMON_LISTEN", default="0.0.0.0:8000"  # nosec B104
+)
+SCAN_QUEUE_FILE: Final[str] = getenv(key="SCAN_QUEUE_FILE", default="scan_queue.sqlite")
+RESCAN_INTERVAL: Final[float] = float(getenv(key="RESCAN_INTERVAL", default="86400"))
+NOTIFICATIONS_TOKEN: Final[Optional[str]] = getenv(key="NOTIFICATIONS_TOKEN")
+SHARD_INDEX: Final[int] = int(getenv(key="SHARD_INDEX", default="0"))
+SHARD_COUNT: Final[int] = int(getenv(key="SHARD_COUNT", default="1"))
+SCAN_TIME_BUDGET: Final[Optional[str]] = getenv(key="SCAN_TIME_BUDGET")
+SCAN_CRITICAL_TAGS: Final[Optional[str]] = getenv(key="SCAN_CRITICAL_TAGS")
@@ -0,0 +1,259 @@
+"""Daemon Mode (scans pushed Docker images from registry notifications)"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import JSONDecodeError, dumps, loads
+from re import search
+from threading import Event, Thread
+from typing import Any, Callable, Optional
+from deduplication import group_tags_by_digest
+from docker_registry_client import MANIFEST_MEDIA_TYPES
+from scan_queue import PRIORITY_PUSH, PRIORITY_RESCAN, QueuedScan, ScanQueue
+from scanner import ScanPool, ScanTask
+from sweep import Sweep
+from logger import logger
+
+
+def parse_notification(
+    body: bytes, images_filter: str = r".*", tags_filter: str = r".*"
+) -> list[tuple[str, str]]:
+    """Parse Docker Registry Notification Function
+
+    Returns the pushed image references ('image:tag', or 'image@digest'
+    for untagged pushes) with their manifest digest. Blob pushes, pulls
+    and deletions are ignored.
+    """
+
+    pushes: list[tuple[str, str]] = []
+    for event in dict(loads(body)).get("events") or []:
+        target: dict[str, Any] = event.get("target") or {}
+        repository: Optional[str] = target.get("repository")
+        digest: Optional[str] = target.get("digest")
+        tag: Optional[str] = target.get("tag")
+        if (
+            event.get("action") != "push"
+            or target.get("mediaType") not in MANIFEST_MEDIA_TYPES
+            or not repository
+            or not digest
+        ):
+            continue
+        if not search(pattern=images_filter, string=repository) or (
+            tag and not search(pattern=tags_filter, string=tag)
+        ):
+            continue
+        pushes.append(
+            (f"{repository}:{tag}" if tag else f"{repository}@{digest}", digest)
+        )
+    return pushes
+
+
+class NotificationHandler(BaseHTTPRequestHandler):
+    """Docker Registry Notification Endpoint Handler Class
+
+    `POST /notifications` queues pushed images, `GET /healthz` reports
+    the queue length.
+    """
+
+    server: "NotificationServer"
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=W0622
+        """Log Requests At Debug Level"""
+
+        logger.debug(msg=f"💡 Notification endpoint: {format % args}")
+
+    def __send(self, status: int, body: dict[str, Any]) -> None:
+        payload: bytes = dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Handle GET Requests"""
+
+        if self.path != "/healthz":
+            self.__send(status=404, body={"error": "not found"})
+            return
+        self.__send(status=200, body={"queued": len(self.server.queue)})
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Handle POST Requests"""
+
+        if self.path != "/notifications":
+            self.__send(status=404, body={"error": "not found"})
+            return
+        if self.server.token and self.headers.get("Authorization") != (
+            f"Bearer {self.server.token}"
+        ):
+            self.__send(status=401, body={"error": "unauthorized"})
+            return
+        try:
+            pushes: list[tuple[str, str]] = parse_notification(
+                body=self.rfile.read(int(self.headers.get("Content-Length") or 0)),
+                images_filter=self.server.images_filter,
+                tags_filter=self.server.tags_filter,
+            )
+        except (JSONDecodeError, AttributeError, TypeError, ValueError):
+            self.__send(status=400, body={"error": "invalid notification"})
+            return
+        for image_tag, digest in pushes:
+            if self.server.queue.put(
+                image_tag=image_tag, digest=digest, priority=PRIORITY_PUSH
+            ):
+                logger.info(msg=f"📬 Push of '{image_tag}' ({digest}) queued")
+        self.__send(status=200, body={"queued": len(pushes)})
+
+
+class NotificationServer(ThreadingHTTPServer):
+    """Docker Registry Notification Server Class"""
+
+    daemon_threads: bool = True
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        listen: str,
+        queue: ScanQueue,
+        token: Optional[str] = None,
+        images_filter: str = r".*",
+        tags_filter: str = r".*",
+    ) -> None:
+        host, _, port = listen.rpartition(":")
+        super().__init__((host, int(port)), NotificationHandler)
+        self.queue = queue
+        self.token = token
+        self.images_filter = images_filter
+        self.tags_filter = tags_filter
+
+
+class Daemon:  # pylint: disable=too-many-instance-attributes
+    """Daemon Class
+
+    Scans images queued by registry push notifications as soon as a worker
+    is free. At start and then every `rescan_interval` seconds (after
+    `before_rescan`, e.g. a database update), the whole registry is queued
+    again at a lower priority, so pushes are always scanned first. Results
+    are appended to the report of `sweep` as they come.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        sweep: Sweep,
+        queue: ScanQueue,
+        *,
+        listen: str = "0.0.0.0:8000",  # nosec B104
+        token: Optional[str] = None,
+        images_filter: str = r".*",
+        rescan_interval: float = 86400.0,
+        before_rescan: Optional[Callable[[], None]] = None,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.sweep = sweep
+        self.queue = queue
+        self.images_filter = images_filter
+        self.rescan_interval = rescan_interval
+        self.before_rescan = before_rescan
+        self.poll_interval = poll_interval
+        self.stopping: Event = Event()
+        self.running: dict[tuple[str, Optional[str]], int] = {}
+        self.server: NotificationServer = NotificationServer(
+            listen=listen,
+            queue=queue,
+            token=token,
+            images_filter=images_filter,
+            tags_filter=sweep.tags_filter,
+        )
+
+    def stop(self, *_) -> None:
+        """Stop Daemon Method (usable as a signal handler)"""
+
+        logger.info(msg="🛑 Stopping daemon, waiting for running scans...")
+        self.stopping.set()
+
+    def rescan(self) -> int:
+        """Queue Every Docker Image Tag Of The Registry Method"""
+
+        queued: int = 0
+        for image in self.sweep.client.iter_images(
+            page_size=self.sweep.page_size, pattern=self.images_filter
+        ):
+            if self.stopping.is_set():
+                break
+            digests: dict[str, Optional[str]] = self.sweep.fetch_image_digests(
+                image=image
+            )
+            for image_tag, aliases in group_tags_by_digest(digests=digests).items():
+                queued += self.queue.put(
+                    image_tag=image_tag,
+                    digest=digests.get(image_tag),
+                    aliases=tuple(aliases),
+                    priority=PRIORITY_RESCAN,
+                )
+        logger.info(msg=f"🔁 Full rescan queued {queued} Docker image tags")
+        return queued
+
+    def __rescan_loop(self) -> None:
+        rescans: int = 0
+        while not self.stopping.is_set():
+            try:
+                if rescans and self.before_rescan:
+                    self.before_rescan()
+                self.rescan()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.error(msg=f"🔥 Full rescan failed: {exc}")
+            rescans += 1
+            self.stopping.wait(timeout=self.rescan_interval)
+
+    def __dispatch(self, scan_pool: ScanPool) -> int:
+        dispatched: int = 0
+        while scan_pool.available > 0 and not self.stopping.is_set():
+            queued: Optional[QueuedScan] = self.queue.get()
+            if queued is None:
+                break
+            dispatched += 1
+            tasks: list[ScanTask] = list(
+                self.sweep.image_tasks(
+                    digests=dict.fromkeys(
+                        (queued.image_tag, *queued.aliases), queued.digest
+                    )
+                )
+            )
+            if not tasks:
+                # Answered from the scan cache
+                self.queue.done(scan_id=queued.id)
+            for task in tasks:
+                self.running.update({(task.image_tag, task.digest): queued.id})
+                scan_pool.submit(task=task)
+        return dispatched
+
+    def __collect(self, scan_pool: ScanPool, wait: bool = False) -> None:
+        for task, results in scan_pool.results(wait=wait):
+            self.sweep.on_scan_results(task=task, results=results)
+            self.queue.done(scan_id=self.running.pop((task.image_tag, task.digest)))
+
+    def run(self) -> None:
+        """Run Daemon Method (until `stop` is called)"""
+
+        requeued: int = self.queue.requeue_running()
+        if requeued:
+            logger.info(msg=f"♻️ {requeued} interrupted scans queued again")
+        server_thread: Thread = Thread(target=self.server.serve_forever, daemon=True)
+        server_thread.start()
+        logger.info(
+            msg="📬 Listening for registry notifications on"
+            f" {self.server.server_address[0]}:{self.server.server_address[1]}"
+        )
+        if self.rescan_interval > 0:
+            Thread(target=self.__rescan_loop, daemon=True).start()
+
+        try:
+            with ScanPool(options=self.sweep.options) as scan_pool:
+                while not self.stopping.is_set():
+                    dispatched: int = self.__dispatch(scan_pool=scan_pool)
+                    self.__collect(scan_pool=scan_pool)
+                    if not dispatched:
+                        self.stopping.wait(timeout=self.poll_interval)
+                self.__collect(scan_pool=scan_pool, wait=True)
+        finally:
+            self.sweep.status_log.flush()
+            self.server.shutdown()
+            self.server.server_close()
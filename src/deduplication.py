@@ -0,0 +1,50 @@
+"""Scan Deduplication (one scan per manifest digest)"""
+
+from typing import Any, Optional
+
+
+def group_tags_by_digest(digests: dict[str, Optional[str]]) -> dict[str, list[str]]:
+    """Group Docker Image Tags By Manifest Digest Function
+
+    Keys are the representative tag of each group (first tag seen for a
+    digest) and values every tag sharing that digest, representative
+    included. Tags without a known digest are never grouped.
+    """
+
+    groups: dict[str, list[str]] = {}
+    representatives: dict[str, str] = {}
+
+    for image_tag, digest in digests.items():
+        if digest is None:
+            groups.update({image_tag: [image_tag]})
+            continue
+        representative: str = representatives.setdefault(digest, image_tag)
+        groups.setdefault(representative, []).append(image_tag)
+    return groups
+
+
+def fan_out_results(
+    results: dict[str, Any],
+    docker_registry: str,
+    groups: dict[str, list[str]],
+    digests: dict[str, Optional[str]],
+) -> dict[str, Any]:
+    """Copy Representative Tags Scan Results To Every Alias Function"""
+
+    fanned_out_results: dict[str, Any] = {}
+
+    for docker_image_tag, result in results.items():
+        image_tag: str = docker_image_tag.removeprefix(f"{docker_registry}/")
+        for alias in groups.get(image_tag, [image_tag]):
+            alias_result: dict[str, Any] = dict(result)
+            if alias_result:
+                alias_result.update(
+                    {
+                        "digest": digests.get(alias),
+                        "deduplicated": alias != image_tag,
+                    }
+                )
+                if alias != image_tag:
+                    alias_result.update({"scanned_as": docker_image_tag})
+            fanned_out_results.update({f"{docker_registry}/{alias}": alias_result})
+    return fanned_out_results
@@ -0,0 +1,124 @@
+"""Delta Report (changes since the previous scan results report)"""
+
+from array import array
+from json import dumps
+from sys import intern
+from typing import Any, Optional
+from report import SCANNED_STATUSES, iter_report_entries
+from result_model import FindingTable, SymbolTable
+from results_store import iter_findings
+from logger import logger
+
+
+def finding_refs(result: dict[str, Any], findings: FindingTable) -> set[int]:
+    """Get Finding References Of A Scan Result Function (every target)"""
+
+    return {
+        findings.ref(finding=f"{vuln_id} ({severity})")
+        for _, _, vuln_id, severity in iter_findings(result=result)
+    }
+
+
+def read_report_index(
+    report_file: str, findings: FindingTable
+) -> dict[str, tuple[str, array]]:
+    """Read Report Index Function (status and finding references per tag)
+
+    The report is streamed, one tag result at a time, and only kept as
+    interned statuses and arrays of finding references.
+    """
+
+    index: dict[str, tuple[str, array]] = {}
+    for image, result in iter_report_entries(report_file=report_file):
+        result = dict(result or {})
+        index.update(
+            {
+                image: (
+                    intern(str(result.get("status") or "FAILED")),
+                    array("I", sorted(finding_refs(result=result, findings=findings))),
+                )
+            }
+        )
+    return index
+
+
+class ReportDelta:
+    """Report Delta Class (changes of tag results since a previous report)
+
+    Lists Docker image tags added and removed since the previous report,
+    tags newly vulnerable (NOK, and not NOK before), new findings by
+    manifest digest and fixed findings by tag. Findings are only compared
+    when both results are scanned (e.g. not for a scan that timed out).
+    """
+
+    def __init__(self, previous_report_file: str) -> None:
+        self.findings: FindingTable = FindingTable(symbols=SymbolTable())
+        self.previous: dict[str, tuple[str, array]] = read_report_index(
+            report_file=previous_report_file, findings=self.findings
+        )
+        self.added_tags: list[str] = []
+        self.newly_vulnerable_tags: list[str] = []
+        self.new_findings: dict[str, set[int]] = {}
+        self.fixed_findings: dict[str, set[int]] = {}
+
+    def add(self, image: str, result: dict[str, Any]) -> None:
+        """Compare A Tag Result With The Previous Report Method"""
+
+        status: str = str(result.get("status") or "FAILED")
+        previous_status: Optional[str] = None
+        previous_refs: set[int] = set()
+        if image in self.previous:
+            previous_status, refs = self.previous.pop(image)
+            previous_refs = set(refs)
+        else:
+            self.added_tags.append(image)
+        if status == "NOK" and previous_status != "NOK":
+            self.newly_vulnerable_tags.append(image)
+        if status not in SCANNED_STATUSES or previous_status not in (
+            None,
+            *SCANNED_STATUSES,
+        ):
+            return
+        current_refs: set[int] = finding_refs(result=result, findings=self.findings)
+        if current_refs - previous_refs:
+            self.new_findings.setdefault(result.get("digest") or image, set()).update(
+                current_refs - previous_refs
+            )
+        if previous_refs - current_refs:
+            self.fixed_findings.update({image: previous_refs - current_refs})
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get Delta Report Method (previous tags not seen since are removed)"""
+
+        return {
+            "added_tags": self.added_tags,
+            "removed_tags": sorted(self.previous),
+            "newly_vulnerable_tags": self.newly_vulnerable_tags,
+            "new_findings": {
+                digest: sorted(self.findings.text(ref=ref) for ref in refs)
+                for digest, refs in self.new_findings.items()
+            },
+            "fixed_findings": {
+                image: sorted(self.findings.text(ref=ref) for ref in refs)
+                for image, refs in self.fixed_findings.items()
+            },
+        }
+
+
+def write_delta_report(
+    previous_report_file: str, report_file: str, output_file: str
+) -> dict[str, int]:
+    """Write Delta Report Function (returns the number of changes by kind)
+
+    Both reports are streamed: only an index of the previous one is kept.
+    """
+
+    report_delta: ReportDelta = ReportDelta(previous_report_file=previous_report_file)
+    for image, result in iter_report_entries(report_file=report_file):
+        report_delta.add(image=image, result=dict(result or {}))
+    delta: dict[str, Any] = report_delta.to_dict()
+    with open(file=output_file, mode="w", encoding="UTF-8") as file:
+        file.write(dumps(delta, indent=2))
+    changes: dict[str, int] = {kind: len(values) for kind, values in delta.items()}
+    logger.info(msg=f"✨ Delta report exported on {output_file} ({changes})")
+    return changes
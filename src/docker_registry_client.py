@@ -1,22 +1,66 @@
 """Docker Registry Client"""
 
+from concurrent.futures import ThreadPoolExecutor
 from http.client import HTTPSConnection, HTTPResponse, HTTPException
-from urllib.parse import urlparse, ParseResult
+from queue import Empty, LifoQueue
+from urllib.parse import urljoin, urlparse, ParseResult
 from json import loads
-from re import search
+from re import Match, Pattern, compile as re_compile, search
 from ssl import SSLContext, PROTOCOL_TLS_CLIENT, CERT_REQUIRED
-from typing import Optional
+from threading import BoundedSemaphore
+from time import perf_counter, sleep
+from typing import Any, Iterable, Iterator, Optional
 from logger import logger
+from metrics import METRICS
+from rate_limiter import RateLimiter, retry_delay
+from registry_auth import RegistryAuth
 
+MANIFEST_MEDIA_TYPES: list[str] = [
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.oci.image.index.v1+json",
+]
+RETRY_STATUSES: list[int] = [429, 500, 502, 503, 504]
+MAX_REDIRECTS: int = 5
 
-class DockerRegistryClient:
-    """DockerRegistryClient Class"""
 
-    def __init__(
+def request_endpoint(url: str) -> str:
+    """Get Docker Registry API Endpoint Name Of A URL Function (metrics label)"""
+
+    for pattern, endpoint in [
+        (r"/v2/_catalog", "catalog"),
+        (r"/tags/list", "tags"),
+        (r"/manifests/", "manifest"),
+        (r"/blobs/", "blob"),
+    ]:
+        if search(pattern=pattern, string=url):
+            return endpoint
+    return "other"
+
+
+class DockerRegistryClient:  # pylint: disable=too-many-instance-attributes
+    """DockerRegistryClient Class
+
+    Requests go through a pool of at most `max_connections` keep-alive
+    HTTPS connections, so the client can be shared by several threads.
+    Requests are paced by `rate_limiter`, and throttled (429) or failed
+    (5xx) requests are retried up to `max_retries` times with backoff.
+    Basic and Bearer token challenges are answered with the optional
+    `username` and `password`.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         registry_url: str,
         ca_file: Optional[str] = None,
         timeout: int = 3,
+        max_connections: int = 4,
+        *,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 5,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
     ) -> None:
         if not registry_url.startswith("https://"):
             raise ValueError("Docker registry URL must start with 'https://'")
@@ -26,52 +70,360 @@ class DockerRegistryClient:
         self.registry_host: str = str(parse_result.hostname)
         self.registry_port: int = parse_result.port if parse_result.port else 443
         self.registry_path = parse_result.path
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.rate_limiter: RateLimiter = (
+            RateLimiter() if rate_limiter is None else rate_limiter
+        )
+        self.max_retries = max_retries
 
-        ssl_context: SSLContext = SSLContext(
+        self.ssl_context: SSLContext = SSLContext(
             protocol=PROTOCOL_TLS_CLIENT, verify_mode=CERT_REQUIRED
         )
         if ca_file:
-            ssl_context.load_verify_locations(cafile=ca_file)
+            self.ssl_context.load_verify_locations(cafile=ca_file)
         else:
-            ssl_context.load_default_certs()
-        self.https_connection = HTTPSConnection(  # nosemgrep: bandit.B309
-            host=self.registry_host,
-            port=self.registry_port,
+            self.ssl_context.load_default_certs()
+        # Redirections may leave the registry (e.g. blobs on a storage service)
+        self.redirect_ssl_context: SSLContext = SSLContext(
+            protocol=PROTOCOL_TLS_CLIENT, verify_mode=CERT_REQUIRED
+        )
+        self.redirect_ssl_context.load_default_certs()
+        if ca_file:
+            self.redirect_ssl_context.load_verify_locations(cafile=ca_file)
+        self.auth: RegistryAuth = RegistryAuth(
+            username=username,
+            password=password,
+            ssl_context=self.ssl_context,
             timeout=timeout,
-            context=ssl_context,
         )
+        self.connections: LifoQueue[HTTPSConnection] = LifoQueue()
+        self.slots: BoundedSemaphore = BoundedSemaphore(value=max_connections)
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_connections, thread_name_prefix="registry"
+        )
+
+    def __enter__(self) -> "DockerRegistryClient":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __request(
+        self, url: str, method: str, headers: dict[str, str]
+    ) -> tuple[HTTPResponse, bytes]:
+        self.rate_limiter.acquire()
+        with self.slots:
+            try:
+                connection: HTTPSConnection = self.connections.get_nowait()
+            except Empty:
+                connection = HTTPSConnection(  # nosemgrep: bandit.B309
+                    host=self.registry_host,
+                    port=self.registry_port,
+                    timeout=self.timeout,
+                    context=self.ssl_context,
+                )
+            try:
+                connection.request(method=method, url=url, headers=headers)
+                response: HTTPResponse = connection.getresponse()
+            except ConnectionError:
+                # Keep-alive connection closed by the server: requests are
+                # idempotent (GET/HEAD), so send it again on a new socket.
+                logger.debug(msg=f"💡 Registry connection closed, reconnecting: {url}")
+                connection.close()
+                connection.request(method=method, url=url, headers=headers)
+                response = connection.getresponse()
+            body: bytes = response.read()
+            self.connections.put(connection)
+        return response, body
+
+    def __send(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[dict[str, str]] = None,
+        redirects: int = 0,
+    ) -> tuple[HTTPResponse, bytes]:
+        endpoint: str = request_endpoint(url=url)
+        authenticated: bool = False
+        attempt: int = 0
+        while True:
+            request_headers: dict[str, str] = {
+                **(headers or {}),
+                **self.auth.headers(url=url),
+            }
+            start: float = perf_counter()
+            response, body = self.__request(
+                url=url, method=method, headers=request_headers
+            )
+            METRICS.observe(
+                "registry_request_duration_seconds",
+                perf_counter() - start,
+                method=method,
+                endpoint=endpoint,
+            )
+            METRICS.inc(
+                "registry_requests",
+                method=method,
+                endpoint=endpoint,
+                status=str(response.status),
+            )
+            if response.status == 401 and not authenticated:
+                authenticated = True
+                if self.auth.authenticate(
+                    url=url,
+                    challenge=response.getheader(name="www-authenticate"),
+                    sent_headers=request_headers,
+                ):
+                    continue
+            if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                break
+            delay: float = retry_delay(
+                attempt=attempt, retry_after=response.getheader(name="retry-after")
+            )
+            logger.warning(
+                msg=f"🐢 Received HTTP code {response.status} for {url},"
+                f" retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})"
+            )
+            if response.status == 429 and self.rate_limiter.rate > 0:
+                # Throttled: slow down every request sharing the rate limiter
+                self.rate_limiter.pause(seconds=delay)
+            else:
+                sleep(delay)
+            attempt += 1
 
-    def __request(self, url: str, method: str = "GET") -> bytes:
-        self.https_connection.request(method=method, url=url)
-        response: HTTPResponse = self.https_connection.getresponse()
         if response.status != 200:
             location_header: Optional[str] = response.getheader(name="location")
             if location_header:
+                if redirects >= MAX_REDIRECTS:
+                    raise HTTPException(f"Too many URL redirections: {url}")
                 logger.info(
                     msg=f"💡 URL redirection detected: {url} -> {location_header}"
                 )
-                _ = response.read()
-                return self.__request(url=location_header)
+                location: ParseResult = urlparse(url=location_header)
+                if location.hostname and (
+                    location.hostname,
+                    location.port or 443,
+                ) != (self.registry_host, self.registry_port):
+                    return self.__send_external(
+                        url=location_header,
+                        method=method,
+                        headers=headers,
+                        redirects=redirects + 1,
+                    )
+                return self.__send(
+                    url=location._replace(scheme="", netloc="").geturl(),
+                    method=method,
+                    headers=headers,
+                    redirects=redirects + 1,
+                )
             raise HTTPException(
                 f"Received HTTP code != 200: {response.status} -> {response.reason}"
             )
-        return loads(response.read())
+        return response, body
+
+    def __send_external(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[dict[str, str]] = None,
+        redirects: int = 0,
+    ) -> tuple[HTTPResponse, bytes]:
+        # Redirected to another host (e.g. a blob storage pre-signed URL): a
+        # one-off connection, without the registry Authorization header
+        location: ParseResult = urlparse(url=url)
+        if location.scheme != "https":
+            raise HTTPException(f"URL redirection to a non HTTPS URL: {url}")
+        connection: HTTPSConnection = HTTPSConnection(  # nosemgrep: bandit.B309
+            host=str(location.hostname),
+            port=location.port or 443,
+            timeout=self.timeout,
+            context=self.redirect_ssl_context,
+        )
+        try:
+            connection.request(
+                method=method,
+                url=location._replace(scheme="", netloc="").geturl() or "/",
+                headers=headers or {},
+            )
+            response: HTTPResponse = connection.getresponse()
+            body: bytes = response.read()
+        finally:
+            connection.close()
+
+        if response.status != 200:
+            location_header: Optional[str] = response.getheader(name="location")
+            if location_header:
+                if redirects >= MAX_REDIRECTS:
+                    raise HTTPException(f"Too many URL redirections: {url}")
+                return self.__send_external(
+                    url=urljoin(url, location_header),
+                    method=method,
+                    headers=headers,
+                    redirects=redirects + 1,
+                )
+            raise HTTPException(
+                f"Received HTTP code != 200: {response.status} -> {response.reason}"
+            )
+        return response, body
+
+    def __iter_pages(self, url: str) -> Iterator[dict[str, Any]]:
+        next_url: Optional[str] = url
+        while next_url:
+            response, body = self.__send(url=next_url)
+            page: dict[str, Any] = dict(loads(body))
+            next_url = self.__next_page_url(link_header=response.getheader(name="link"))
+            yield page
+
+    def __next_page_url(self, link_header: Optional[str]) -> Optional[str]:
+        if not link_header:
+            return None
+        link_match: Optional[Match[str]] = search(
+            pattern=r'<([^>]+)>\s*;\s*rel="?next"?', string=link_header
+        )
+        if not link_match:
+            return None
+        link_url: ParseResult = urlparse(url=link_match.group(1))
+        next_url: str = f"{link_url.path}?{link_url.query}"
+        if self.registry_path and not next_url.startswith(self.registry_path):
+            next_url = f"{self.registry_path.rstrip('/')}{next_url}"
+        return next_url
+
+    def iter_images(self, page_size: int = 100, pattern: str = r".*") -> Iterator[str]:
+        """DockerClient Iterate Images Method (follows catalog pagination)"""
+
+        images_filter: Pattern[str] = re_compile(pattern)
+        for page in self.__iter_pages(
+            url=f"{self.registry_path}/v2/_catalog?n={page_size}"
+        ):
+            for image in page.get("repositories") or []:
+                if images_filter.search(image):
+                    yield image
+
+    def iter_image_tags(
+        self, image: str, page_size: int = 100, pattern: str = r".*"
+    ) -> Iterator[str]:
+        """DockerClient Iterate Image Tags Method (follows tags pagination)"""
+
+        tags_filter: Pattern[str] = re_compile(pattern)
+        for page in self.__iter_pages(
+            url=f"{self.registry_path}/v2/{image}/tags/list?n={page_size}"
+        ):
+            for tag in page.get("tags") or []:
+                if tags_filter.search(tag):
+                    yield f"{image}:{tag}"
 
     def get_images(self, number_max: int = 500, pattern: str = r".*") -> list[str]:
         """DockerClient Get Images Method"""
 
-        images: list[str] = dict(
-            self.__request(url=f"{self.registry_path}/v2/_catalog?n={number_max}")
-        ).get("repositories")
-
-        return [image for image in images if search(pattern=pattern, string=image)]
+        return list(self.iter_images(page_size=number_max, pattern=pattern))
 
     def get_image_tags(self, image: str, pattern: str = r".*") -> list[str]:
         """DockerClient Get Image Tags Method"""
 
-        tags: list[str] = dict(
-            self.__request(url=f"{self.registry_path}/v2/{image}/tags/list")
-        ).get("tags")
-        if not tags:
-            return []
-        return [f"{image}:{tag}" for tag in tags if search(pattern=pattern, string=tag)]
+        return list(self.iter_image_tags(image=image, pattern=pattern))
+
+    def get_image_digest(self, image_tag: str) -> Optional[str]:
+        """DockerClient Get Image Manifest Digest Method"""
+
+        image, _, tag = image_tag.rpartition(":")
+        response, _ = self.__send(
+            url=f"{self.registry_path}/v2/{image}/manifests/{tag}",
+            method="HEAD",
+            headers={"Accept": ", ".join(MANIFEST_MEDIA_TYPES)},
+        )
+        return response.getheader(name="Docker-Content-Digest")
+
+    def get_image_digests(self, image_tags: Iterable[str]) -> dict[str, Optional[str]]:
+        """DockerClient Get Image Manifest Digests Method (concurrent requests)"""
+
+        image_tags = list(image_tags)
+        return dict(
+            zip(image_tags, self.executor.map(self.get_image_digest, image_tags))
+        )
+
+    def get_image_manifest(self, image: str, reference: str) -> dict[str, Any]:
+        """DockerClient Get Image Manifest Method (tag or digest reference)"""
+
+        _, body = self.__send(
+            url=f"{self.registry_path}/v2/{image}/manifests/{reference}",
+            headers={"Accept": ", ".join(MANIFEST_MEDIA_TYPES)},
+        )
+        return dict(loads(body))
+
+    def get_image_config(self, image: str, digest: str) -> dict[str, Any]:
+        """DockerClient Get Image Config Blob Method"""
+
+        _, body = self.__send(url=f"{self.registry_path}/v2/{image}/blobs/{digest}")
+        return dict(loads(body))
+
+    def get_platform_manifest(self, image_tag: str) -> dict[str, Any]:
+        """DockerClient Get Image Platform Manifest Method
+
+        For multi-platform images, the manifest of the linux/amd64 image (or
+        else the first one) of the manifest list is returned.
+        """
+
+        image, _, tag = image_tag.rpartition(":")
+        manifest: dict[str, Any] = self.get_image_manifest(image=image, reference=tag)
+        platforms: list[dict[str, Any]] = manifest.get("manifests") or []
+        if not platforms:
+            return manifest
+        platform: dict[str, Any] = next(
+            (
+                platform
+                for platform in platforms
+                if (platform.get("platform") or {}).get("os") == "linux"
+                and (platform.get("platform") or {}).get("architecture") == "amd64"
+            ),
+            platforms[0],
+        )
+        return self.get_image_manifest(image=image, reference=platform["digest"])
+
+    def get_image_created(self, image_tag: str) -> Optional[str]:
+        """DockerClient Get Image Creation Date Method (from its config blob)"""
+
+        manifest: dict[str, Any] = self.get_platform_manifest(image_tag=image_tag)
+        config_digest: Optional[str] = (manifest.get("config") or {}).get("digest")
+        if not config_digest:
+            return None
+        return self.get_image_config(
+            image=image_tag.rpartition(":")[0], digest=config_digest
+        ).get("created")
+
+    def get_image_created_dates(
+        self, image_tags: Iterable[str]
+    ) -> dict[str, Optional[str]]:
+        """DockerClient Get Image Creation Dates Method (concurrent requests)"""
+
+        image_tags = list(image_tags)
+        return dict(
+            zip(image_tags, self.executor.map(self.get_image_created, image_tags))
+        )
+
+    def get_image_layers(self, image_tag: str) -> list[tuple[str, int]]:
+        """DockerClient Get Image Layers Method (digests and sizes, base first)"""
+
+        manifest: dict[str, Any] = self.get_platform_manifest(image_tag=image_tag)
+        return [
+            (layer.get("digest"), int(layer.get("size") or 0))
+            for layer in manifest.get("layers") or []
+            if layer.get("digest")
+        ]
+
+    def get_image_tags_layers(
+        self, image_tags: Iterable[str]
+    ) -> dict[str, list[tuple[str, int]]]:
+        """DockerClient Get Image Tags Layers Method (concurrent requests)"""
+
+        image_tags = list(image_tags)
+        return dict(
+            zip(image_tags, self.executor.map(self.get_image_layers, image_tags))
+        )
+
+    def close(self) -> None:
+        """DockerClient Close Method (stops threads, closes pooled connections)"""
+
+        self.executor.shutdown()
+        while not self.connections.empty():
+            self.connections.get_nowait().close()
@@ -0,0 +1,181 @@
+"""Layer Cache (accounting of the Trivy scan cache shared by every scan)"""
+
+from collections import OrderedDict
+from fcntl import LOCK_EX, LOCK_NB, LOCK_SH, LOCK_UN, flock
+from json import dumps, loads
+from os import makedirs, path, replace, walk
+from re import Match, fullmatch
+from shutil import rmtree
+from threading import Lock
+from typing import Optional, TextIO
+from logger import logger
+from metrics import METRICS
+
+SIZE_UNITS: dict[str, int] = {
+    "": 1,
+    "K": 1024,
+    "M": 1024**2,
+    "G": 1024**3,
+    "T": 1024**4,
+}
+
+
+def parse_size(value: Optional[str]) -> int:
+    """Parse Size Function ('1073741824', '512M', '10G' or '1T' bytes)"""
+
+    if not value:
+        return 0
+    size_match: Optional[Match[str]] = fullmatch(
+        pattern=r"(\d+(?:\.\d+)?)\s*([KMGT]?)I?B?", string=value.strip().upper()
+    )
+    if not size_match:
+        raise ValueError(f"Invalid size: '{value}'")
+    return int(float(size_match.group(1)) * SIZE_UNITS[size_match.group(2)])
+
+
+def directory_size(directory: str) -> int:
+    """Get Directory Size Function (bytes of every file below it)"""
+
+    return sum(
+        path.getsize(path.join(root, name))
+        for root, _, names in walk(directory)
+        for name in names
+        if path.isfile(path.join(root, name))
+    )
+
+
+class LayerCache:  # pylint: disable=too-many-instance-attributes
+    """Layer Cache Class
+
+    Every scan runs with `cache_dir` as Trivy '--cache-dir', so a layer
+    analyzed once (e.g. a shared base layer) is not pulled and analyzed
+    again. Layers handed to scans are tracked in a least recently used
+    index (persisted in the cache directory) to report cache hits and
+    misses, and to account the cache size against `max_size`.
+
+    The index only sees layers of this scanner: hits and misses are
+    estimated, e.g. layers analyzed by another scanner sharing the cache
+    directory count as misses. Trivy keeps analyzed layers in one BoltDB
+    file that cannot be evicted entry by entry: least recently used layers
+    only leave the index (and count as misses again), and a cache grown
+    over `max_size` is dropped as a whole by `prune`, before scans start.
+    Scanners sharing the cache directory hold a shared lock on it (see
+    `acquire`), so it is never dropped under another one's scans.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = 0) -> None:
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.index_file: str = path.join(cache_dir, "layers.json")
+        self.scan_cache_dir: str = path.join(cache_dir, "fanal")
+        self.lock_file: str = f"{self.scan_cache_dir}.lock"
+        self.shared_lock: Optional[TextIO] = None
+        self.lock: Lock = Lock()
+        self.layers: OrderedDict[str, int] = OrderedDict()
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        makedirs(name=cache_dir, exist_ok=True)
+        try:
+            with open(file=self.index_file, encoding="UTF-8") as file:
+                self.layers.update(loads(file.read()))
+        except (OSError, ValueError):
+            pass
+        self.size = sum(self.layers.values())
+
+    @property
+    def hit_ratio(self) -> float:
+        """Get estimated layer cache hit ratio (1.0 before any lookup)"""
+
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 1.0
+
+    def record(self, layers: list[tuple[str, int]]) -> tuple[int, int]:
+        """Record Layers Of A Scan Method (returns its estimated hits and misses)"""
+
+        hits: int = 0
+        misses: int = 0
+        with self.lock:
+            for digest, size in layers:
+                if digest in self.layers:
+                    hits += 1
+                    self.layers.move_to_end(digest)
+                    METRICS.inc("layer_cache_estimated_hit_bytes", size)
+                    continue
+                misses += 1
+                self.layers.update({digest: size})
+                self.size += size
+                METRICS.inc("layer_cache_estimated_miss_bytes", size)
+            while self.max_size and self.size > self.max_size and self.layers:
+                _, evicted_size = self.layers.popitem(last=False)
+                self.size -= evicted_size
+                METRICS.inc("layer_cache_evictions")
+            self.hits += hits
+            self.misses += misses
+        METRICS.inc("layer_cache_estimated_lookups", hits, result="hit")
+        METRICS.inc("layer_cache_estimated_lookups", misses, result="miss")
+        METRICS.set("layer_cache_size_bytes", self.size)
+        return hits, misses
+
+    def prune(self) -> bool:
+        """Drop The Trivy Scan Cache When Over `max_size` Method
+
+        Must be called before `acquire`. The cache is kept while another
+        scanner holds its shared lock, and the vulnerability database of
+        the cache directory is always kept.
+        """
+
+        if not self.max_size or not path.isdir(self.scan_cache_dir):
+            return False
+        disk_size: int = directory_size(directory=self.scan_cache_dir)
+        if disk_size <= self.max_size:
+            return False
+        with open(file=self.lock_file, mode="a", encoding="UTF-8") as file:
+            try:
+                flock(file, LOCK_EX | LOCK_NB)
+            except BlockingIOError:
+                logger.warning(
+                    msg=f"🧹 Trivy scan cache is {disk_size} bytes"
+                    f" (max. {self.max_size}), but in use by another scanner"
+                )
+                return False
+            try:
+                logger.warning(
+                    msg=f"🧹 Trivy scan cache is {disk_size} bytes"
+                    f" (max. {self.max_size}), dropping it"
+                )
+                rmtree(path=self.scan_cache_dir, ignore_errors=True)
+            finally:
+                flock(file, LOCK_UN)
+        with self.lock:
+            self.layers.clear()
+            self.size = 0
+        self.save()
+        return True
+
+    def acquire(self) -> None:
+        """Hold A Shared Lock On The Trivy Scan Cache Method (until `close`)"""
+
+        if self.shared_lock is None:
+            self.shared_lock = open(  # pylint: disable=consider-using-with
+                file=self.lock_file, mode="a", encoding="UTF-8"
+            )
+            flock(self.shared_lock, LOCK_SH)
+
+    def close(self) -> None:
+        """Save Layer Index And Release The Shared Lock Method"""
+
+        self.save()
+        if self.shared_lock is not None:
+            flock(self.shared_lock, LOCK_UN)
+            self.shared_lock.close()
+            self.shared_lock = None
+
+    def save(self) -> None:
+        """Save Layer Index Method (written atomically)"""
+
+        with self.lock:
+            index: str = dumps(dict(self.layers))
+        with open(file=f"{self.index_file}.tmp", mode="w", encoding="UTF-8") as file:
+            file.write(index)
+        replace(src=f"{self.index_file}.tmp", dst=self.index_file)
@@ -1,12 +1,63 @@
-"""Logging Configuration"""
+"""Logging Configuration
 
-from logging import getLogger, basicConfig
-from config import LOGGING_LEVEL
+Records are handed to a queue and written by a background listener
+thread, so logging never blocks on console I/O. Scan pool workers log
+through the same (multiprocessing) queue.
+"""
 
-basicConfig(
-    format="%(asctime)s %(message)s",
-    encoding="utf-8",
-    datefmt="%Y-%m-%dT%H:%M:%S%z",  # 1996-12-19T16:39:57-08:00
-    level=LOGGING_LEVEL,
+from atexit import register
+from json import dumps
+from logging import Formatter, LogRecord, StreamHandler, basicConfig, getLogger
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing import Queue, current_process
+from typing import Any
+from config import LOGGING_FORMAT, LOGGING_LEVEL
+
+DATE_FORMAT: str = "%Y-%m-%dT%H:%M:%S%z"  # 1996-12-19T16:39:57-08:00
+
+
+class JSONFormatter(Formatter):
+    """JSON Lines Formatter Class (one JSON object per record)"""
+
+    def format(self, record: LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": self.formatTime(record=record, datefmt=DATE_FORMAT),
+            "level": record.levelname,
+            "process": record.processName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry.update({"exception": self.formatException(ei=record.exc_info)})
+        return dumps(entry, ensure_ascii=False)
+
+
+def queue_handler(log_queue: Any) -> QueueHandler:
+    """Get Queue Handler Function (records are formatted by the listener)"""
+
+    handler: QueueHandler = QueueHandler(queue=log_queue)
+    handler.setFormatter(Formatter(fmt="%(message)s"))
+    return handler
+
+
+def use_log_queue(log_queue: Any) -> None:
+    """Log Through A Queue Function (e.g. in scan pool workers)"""
+
+    root_logger = getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(queue_handler(log_queue=log_queue))
+
+
+LOG_QUEUE: Any = Queue()
+stream_handler: StreamHandler = StreamHandler()
+stream_handler.setFormatter(
+    JSONFormatter()
+    if LOGGING_FORMAT == "json"
+    else Formatter(fmt="%(asctime)s %(message)s", datefmt=DATE_FORMAT)
 )
+basicConfig(handlers=[queue_handler(log_queue=LOG_QUEUE)], level=LOGGING_LEVEL)
+if current_process().name == "MainProcess":
+    listener: QueueListener = QueueListener(LOG_QUEUE, stream_handler)
+    listener.start()
+    register(listener.stop)
 logger = getLogger(__name__)
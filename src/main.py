@@ -1,107 +1,525 @@
 """Main"""
 
-from typing import Any, Literal, Optional
-from json import dumps
+from argparse import ArgumentParser, Namespace
+from os import path, replace
+from signal import SIGINT, SIGTERM, signal
+from time import perf_counter
+from typing import Any, Optional
+from daemon import Daemon
+from delta_report import write_delta_report
 from docker_registry_client import DockerRegistryClient
-from scanner import Scanner, download_database
-from scanner_options import ScannerOptions
+from report import (
+    ReportWriter,
+    StatusLog,
+    export_scan_results,
+    finalize_report,
+    is_empty_report,
+    merge_reports,
+    read_scanned_tags,
+)
+from layer_cache import LayerCache, parse_size
+from rate_limiter import RateLimiter
+from registries import RegistryConfig, load_registries
+from result_model import CompactResults
+from results_store import ResultsQuery, ResultsStore
+from retention import TagRetention
+from scanner import ScanPool, get_database_version, update_databases
+from scan_cache import ScanCache
+from scan_queue import ScanQueue
+from scheduler import ScanScheduler, parse_duration
+from sharding import iter_shard
+from sweep import Sweep
+from trivy_server import TrivyServer
+from scanner_options import RegistryAccess, ScannerOptions
+from metrics import METRICS
 from logger import logger
 import config
 
 
-def display_results(results: dict[str, Any]) -> None:
-    """Display Scanner Results To Standard Output"""
+def open_scan_cache(options: ScannerOptions) -> Optional[ScanCache]:
+    """Open Scan Cache Function (when 'SCAN_CACHE_FILE' is defined)"""
 
-    for image, result in dict(results).items():
-        text: str = ""
+    if not config.SCAN_CACHE_FILE:
+        return None
 
-        if result:
-            status: Optional[str] = dict(result).get("status")
-            status_emoji: Literal["🟢", "🔴"] = "🟢" if status == "OK" else "🔴"
-            text = f"{status_emoji} {status}\t{image}"
+    db_version: Optional[str] = get_database_version(cache_dir=config.TRIVY_CACHE_DIR)
+    if not db_version:
+        logger.warning(msg="🤡 Unknown Trivy database version, scan cache disabled")
+        return None
+    return ScanCache(
+        cache_file=config.SCAN_CACHE_FILE, db_version=db_version, options=options
+    )
 
-            if status != "OK":
-                summary: Optional[dict[str, int]] = dict(
-                    dict(result).get("vulnerabilities")
-                ).get("summary")
-                text = f"{text} ({summary})"
-        else:
-            text = f"🔥 FAILED '{image}'"
-        logger.info(text)
 
+def open_layer_cache() -> Optional[LayerCache]:
+    """Open Layer Cache Function (when 'TRIVY_CACHE_DIR' is defined)"""
 
-def export_scan_results(scan_results: dict[str, Any], output_file: str) -> None:
-    """Export Scan Results Function"""
+    if not config.TRIVY_CACHE_DIR:
+        return None
 
-    if scan_results:
-        with open(file=output_file, mode="w", encoding="UTF-8") as file:
-            file.write(dumps(scan_results, indent=2))
-        logger.info(msg=f"✨ Scan results exported on {output_file}")
+    layer_cache: LayerCache = LayerCache(
+        cache_dir=config.TRIVY_CACHE_DIR,
+        max_size=parse_size(value=config.TRIVY_CACHE_MAX_SIZE),
+    )
+    layer_cache.prune()
+    layer_cache.acquire()
+    return layer_cache
 
 
-def main():  # pragma: no cover
-    """Main Function"""
+def open_trivy_server() -> Optional[TrivyServer]:
+    """Open Trivy Server Function (when 'TRIVY_SERVER_MODE', not started yet)"""
 
-    if config.DOCKER_REGISTRY_URL is None:
-        raise ValueError(
-            "Docker registry needs to be defined using "
-            "'DOCKER_REGISTRY_URL' environment variable!"
+    if not config.TRIVY_SERVER_MODE:
+        return None
+    return TrivyServer(
+        listen=config.TRIVY_SERVER_LISTEN, cache_dir=config.TRIVY_CACHE_DIR
+    )
+
+
+def open_report_writer(resume: bool) -> Optional[ReportWriter]:
+    """Open Report Writer Function (when 'SCAN_RESULTS_STREAM_FILE' is defined)"""
+
+    if not config.SCAN_RESULTS_STREAM_FILE:
+        return None
+
+    if not resume:
+        open(  # pylint: disable=consider-using-with
+            file=config.SCAN_RESULTS_STREAM_FILE, mode="w", encoding="UTF-8"
+        ).close()
+    return ReportWriter(
+        report_file=config.SCAN_RESULTS_STREAM_FILE,
+        fsync_every=config.SCAN_RESULTS_FSYNC_EVERY,
+    )
+
+
+def export_report(
+    report_writer: Optional[ReportWriter], scan_results: CompactResults
+) -> None:
+    """Export Scan Results Report Function (streamed or in-memory results)
+
+    With 'SCAN_RESULTS_DELTA_FILE', the previous report is kept next to
+    the new one ('.previous' suffix) and the changes since are exported,
+    unless either report is empty. A run without any scan result keeps the
+    previous report.
+    """
+
+    previous_report_file: str = f"{config.SCAN_RESULTS_REPORT_FILE}.previous"
+    keep_previous: bool = bool(config.SCAN_RESULTS_DELTA_FILE) and not is_empty_report(
+        report_file=config.SCAN_RESULTS_REPORT_FILE
+    )
+    if keep_previous:
+        replace(src=config.SCAN_RESULTS_REPORT_FILE, dst=previous_report_file)
+
+    if report_writer:
+        report_writer.close()
+        finalize_report(
+            report_file=config.SCAN_RESULTS_STREAM_FILE,
+            output_file=config.SCAN_RESULTS_REPORT_FILE,
+        )
+    else:
+        export_scan_results(
+            scan_results=scan_results, output_file=config.SCAN_RESULTS_REPORT_FILE
         )
 
-    total_tags_scanned: int = 0
-    scan_results: dict[str, Any] = {}
-    client: DockerRegistryClient = DockerRegistryClient(
-        registry_url=config.DOCKER_REGISTRY_URL,
-        timeout=config.HTTPS_CONNECTION_TIMEOUT,
+    if not keep_previous:
+        return
+    if not path.exists(config.SCAN_RESULTS_REPORT_FILE):
+        # No scan result: the previous report stays the latest one
+        replace(src=previous_report_file, dst=config.SCAN_RESULTS_REPORT_FILE)
+        return
+    with METRICS.time("phase_duration_seconds", phase="delta"):
+        write_delta_report(
+            previous_report_file=previous_report_file,
+            report_file=config.SCAN_RESULTS_REPORT_FILE,
+            output_file=config.SCAN_RESULTS_DELTA_FILE,
+        )
+
+
+def load_registries_config() -> list[RegistryConfig]:
+    """Load Registries Configuration Function ('DOCKER_REGISTRIES_FILE')
+
+    Without 'DOCKER_REGISTRIES_FILE', the single registry is configured by
+    'DOCKER_REGISTRY_*' environment variables, also defaults of every
+    registry of the file (but its CA file and credentials).
+    """
+
+    defaults: RegistryConfig = RegistryConfig(
+        url=str(config.DOCKER_REGISTRY_URL),
         ca_file=config.DOCKER_REGISTRY_CA_FILE,
+        username=config.DOCKER_REGISTRY_USERNAME,
+        password=config.DOCKER_REGISTRY_PASSWORD,
+        images_filter=config.DOCKER_IMAGES_FILTER,
+        tags_filter=config.DOCKER_TAGS_FILTER,
+        rate_limit=config.REGISTRY_RATE_LIMIT,
+        rate_burst=config.REGISTRY_RATE_BURST,
+        concurrency=config.REGISTRY_CONCURRENCY,
     )
-    images: list[str] = client.get_images(
-        number_max=config.IMAGE_LIST_NBR_MAX, pattern=config.DOCKER_IMAGES_FILTER
+    if not config.DOCKER_REGISTRIES_FILE:
+        return [defaults]
+    return load_registries(
+        registries_file=config.DOCKER_REGISTRIES_FILE,
+        defaults=defaults,
+        max_concurrency=config.REGISTRY_CONCURRENCY,
     )
-    scanner_options: ScannerOptions = ScannerOptions(
-        severity=config.SCAN_SEVERITY,
-        scanners=config.SCAN_SCANNERS,
-        processes=config.MULTIPROCESSING_PROCESSES,
-        min_severity=config.SCAN_MIN_SEVERITY,
+
+
+def open_clients(registries: list[RegistryConfig]) -> list[DockerRegistryClient]:
+    """Open Docker Registry Clients Function (one per registry)"""
+
+    return [
+        DockerRegistryClient(
+            registry_url=registry.url,
+            timeout=config.HTTPS_CONNECTION_TIMEOUT,
+            ca_file=registry.ca_file,
+            max_connections=registry.concurrency,
+            rate_limiter=RateLimiter(
+                rate=registry.rate_limit, burst=registry.rate_burst
+            ),
+            max_retries=config.REGISTRY_MAX_RETRIES,
+            username=registry.username,
+            password=registry.password,
+        )
+        for registry in registries
+    ]
+
+
+def open_sweeps(
+    registries: list[RegistryConfig],
+    clients: list[DockerRegistryClient],
+    options: ScannerOptions,
+    **shared: Any,
+) -> list[Sweep]:
+    """Open Sweeps Function (one per registry)
+
+    Sweeps share their scheduler (and its time budget), retention, status
+    log and the `shared` scan cache, reports and results.
+    """
+
+    scheduler: ScanScheduler = ScanScheduler(
+        critical_tags=config.SCAN_CRITICAL_TAGS,
+        time_budget=parse_duration(value=config.SCAN_TIME_BUDGET),
+        cache=shared.get("cache"),
     )
+    retention: TagRetention = TagRetention(
+        keep_semver=config.DOCKER_TAGS_KEEP_SEMVER,
+        keep_recent=config.DOCKER_TAGS_KEEP_RECENT,
+        max_age=parse_duration(value=config.DOCKER_TAGS_MAX_AGE),
+    )
+    status_log: StatusLog = StatusLog(
+        interval=config.LOGGING_STATUS_INTERVAL,
+        max_lines=config.LOGGING_STATUS_LINES,
+    )
+    return [
+        Sweep(
+            client=client,
+            options=options,
+            tags_filter=registry.tags_filter,
+            page_size=config.REGISTRY_PAGE_SIZE,
+            progress_interval=config.PROGRESS_INTERVAL,
+            registry_concurrency=registry.concurrency,
+            scheduler=scheduler,
+            retention=retention,
+            status_log=status_log,
+            metric_labels=(
+                {"registry": registry.docker_registry} if len(registries) > 1 else None
+            ),
+            **shared,
+        )
+        for registry, client in zip(registries, clients)
+    ]
 
-    logger.info(msg=f"💡 Number of Docker images: {len(images)}")
 
-    download_database()
-    # download_database(database="java")
+def run_sweeps(
+    registries: list[RegistryConfig], sweeps: list[Sweep], options: ScannerOptions
+) -> None:
+    """Run Sweeps Function (every registry through one scan pool)
 
-    for image in images:
-        image_tags: list[str] = client.get_image_tags(
-            image=image, pattern=config.DOCKER_TAGS_FILTER
+    Registries are swept one after the other, so the scan pool workers and
+    'REGISTRY_CONCURRENCY' cap every registry together.
+    """
+
+    with ScanPool(options=options) as scan_pool:
+        for registry, sweep in zip(registries, sweeps):
+            sweep.run(
+                images=iter_shard(
+                    keys=sweep.client.iter_images(
+                        page_size=config.REGISTRY_PAGE_SIZE,
+                        pattern=registry.images_filter,
+                    ),
+                    shard_index=config.SHARD_INDEX,
+                    shard_count=config.SHARD_COUNT,
+                ),
+                scan_pool=scan_pool,
+            )
+
+
+def run_query(args: Namespace) -> None:
+    """Query 'RESULTS_DB_FILE' Function (prints tab separated rows)"""
+
+    with ResultsQuery(results_file=config.RESULTS_DB_FILE) as query:
+        if args.query_cve:
+            for row in query.cve(vuln_id=args.query_cve):
+                print("\t".join(map(str, row)))
+        if args.query_rollup is not None:
+            print("SEVERITY\tFINDINGS\tVULNERABILITIES\tDIGESTS\tTAGS")
+            for row in query.rollup(run_id=args.query_rollup or None):
+                print("\t".join(map(str, row)))
+        if args.query_diff is not None:
+            old_run_id, new_run_id = [*args.query_diff, None, None][:2]
+            for change, rows in query.diff(
+                old_run_id=old_run_id, new_run_id=new_run_id
+            ).items():
+                for row in rows:
+                    print("\t".join([change, *map(str, row)]))
+
+
+def is_query(args: Namespace) -> bool:
+    """Get whether a '--query-*' option is given"""
+
+    return bool(
+        args.query_cve or args.query_diff is not None or args.query_rollup is not None
+    )
+
+
+def run_command(args: Namespace) -> bool:
+    """Run Query, Merge Or Finalize Command Function (False without any)"""
+
+    if is_query(args=args):
+        run_query(args=args)
+    elif args.merge:
+        merge_reports(
+            report_files=args.merge, output_file=config.SCAN_RESULTS_REPORT_FILE
+        )
+    elif args.finalize:
+        finalize_report(
+            report_file=config.SCAN_RESULTS_STREAM_FILE,
+            output_file=config.SCAN_RESULTS_REPORT_FILE,
         )
+    else:
+        return False
+    return True
 
-        if not image_tags:
-            logger.warning(msg=f"🤡 No Docker tags found for '{image}'")
-            continue
 
-        logger.info(msg=f"💡 Number of Docker tags for '{image}': {len(image_tags)}")
+def run_daemon(sweep: Sweep, trivy_server: Optional[TrivyServer] = None) -> None:
+    """Run Daemon Mode Function (until SIGTERM or SIGINT)
 
-        scanner: Scanner = Scanner(
-            docker_registry=f"{client.registry_host}:{client.registry_port}",
-            image_tags=image_tags,
-            options=scanner_options,
+    The Trivy server runs with '--skip-db-update': it is restarted when a
+    rescan updated the database.
+    """
+
+    server_db_version: Optional[str] = get_database_version(
+        cache_dir=config.TRIVY_CACHE_DIR
+    )
+
+    def before_rescan() -> None:
+        nonlocal server_db_version
+        update_databases(cache_dir=config.TRIVY_CACHE_DIR)
+        db_version: Optional[str] = get_database_version(
+            cache_dir=config.TRIVY_CACHE_DIR
         )
+        if sweep.cache and db_version:
+            sweep.cache.db_version = db_version
+        if trivy_server and db_version != server_db_version:
+            logger.info(msg=f"🔁 Restarting Trivy server with database {db_version}")
+            trivy_server.restart()
+            server_db_version = db_version
+
+    queue: ScanQueue = ScanQueue(queue_file=config.SCAN_QUEUE_FILE)
+    daemon: Daemon = Daemon(
+        sweep=sweep,
+        queue=queue,
+        listen=config.DAEMON_LISTEN,
+        token=config.NOTIFICATIONS_TOKEN,
+        images_filter=config.DOCKER_IMAGES_FILTER,
+        rescan_interval=config.RESCAN_INTERVAL,
+        before_rescan=before_rescan,
+    )
+    signal(SIGTERM, daemon.stop)
+    signal(SIGINT, daemon.stop)
+    try:
+        daemon.run()
+    finally:
+        queue.close()
+
+
+def parse_args(args: Optional[list[str]] = None) -> Namespace:
+    """Parse Command Line Arguments Function"""
 
-        try:
-            for results in scanner.scan():
-                scan_results.update(results)
-                display_results(results=results)
-            total_tags_scanned += len(image_tags)
-            logger.info(msg=f"💡 Total Docker tags scanned: {total_tags_scanned}")
-        except RuntimeError as exc:
-            logger.critical(exc)
-            export_scan_results(
-                scan_results=scan_results, output_file=config.SCAN_RESULTS_REPORT_FILE
+    parser: ArgumentParser = ArgumentParser(description="Docker Registry Scanner")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip Docker image tags already in 'SCAN_RESULTS_STREAM_FILE'",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="scan images pushed to the registry (notifications) until stopped",
+    )
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        metavar="REPORT_FILE",
+        help="only merge reports (e.g. of every shard) into 'SCAN_RESULTS_REPORT_FILE'",
+    )
+    parser.add_argument(
+        "--query-cve",
+        metavar="VULN_ID",
+        help="only list Docker image tags affected by VULN_ID in 'RESULTS_DB_FILE'",
+    )
+    parser.add_argument(
+        "--query-diff",
+        nargs="*",
+        type=int,
+        metavar="RUN_ID",
+        help="only list changes between two runs (default: latest two)",
+    )
+    parser.add_argument(
+        "--query-rollup",
+        nargs="?",
+        type=int,
+        const=0,
+        metavar="RUN_ID",
+        help="only count findings by severity of a run (default: latest)",
+    )
+    parser.add_argument(
+        "--finalize",
+        action="store_true",
+        help="only export 'SCAN_RESULTS_STREAM_FILE' to 'SCAN_RESULTS_REPORT_FILE'",
+    )
+    return parser.parse_args(args=args)
+
+
+def validate_config(args: Namespace) -> None:
+    """Validate Configuration Function (raises ValueError)"""
+
+    if (
+        args.resume or args.finalize or args.daemon
+    ) and not config.SCAN_RESULTS_STREAM_FILE:
+        raise ValueError(
+            "'--resume', '--finalize' and '--daemon' need 'SCAN_RESULTS_STREAM_FILE'"
+            " environment variable!"
+        )
+
+    if is_query(args=args):
+        if not config.RESULTS_DB_FILE:
+            raise ValueError(
+                "'--query-*' options need 'RESULTS_DB_FILE' environment variable!"
             )
-    export_scan_results(
-        scan_results=scan_results, output_file=config.SCAN_RESULTS_REPORT_FILE
+        return
+
+    if args.merge or args.finalize:
+        return
+
+    if config.DOCKER_REGISTRY_URL is None and not config.DOCKER_REGISTRIES_FILE:
+        raise ValueError(
+            "Docker registry needs to be defined using "
+            "'DOCKER_REGISTRY_URL' or 'DOCKER_REGISTRIES_FILE' environment variable!"
+        )
+
+    if args.daemon and config.DOCKER_REGISTRIES_FILE:
+        raise ValueError("'--daemon' only serves 'DOCKER_REGISTRY_URL' registry!")
+
+    if not 0 <= config.SHARD_INDEX < config.SHARD_COUNT:
+        raise ValueError(
+            "'SHARD_INDEX' must be between 0 and 'SHARD_COUNT' - 1"
+            f" ({config.SHARD_INDEX}/{config.SHARD_COUNT})!"
+        )
+
+
+def main():  # pragma: no cover
+    """Main Function"""
+
+    args: Namespace = parse_args()
+    validate_config(args=args)
+
+    if run_command(args=args):
+        return
+
+    registries: list[RegistryConfig] = load_registries_config()
+    clients: list[DockerRegistryClient] = open_clients(registries=registries)
+
+    layer_cache: Optional[LayerCache] = open_layer_cache()
+
+    run_start: float = perf_counter()
+    with METRICS.time("phase_duration_seconds", phase="database_download"):
+        update_databases(cache_dir=config.TRIVY_CACHE_DIR)
+
+    trivy_server: Optional[TrivyServer] = open_trivy_server()
+
+    scanner_options: ScannerOptions = ScannerOptions(
+        severity=config.SCAN_SEVERITY,
+        scanners=config.SCAN_SCANNERS,
+        processes=config.MULTIPROCESSING_PROCESSES,
+        min_severity=config.SCAN_MIN_SEVERITY,
+        server_url=trivy_server.url if trivy_server else None,
+        sbom_cache_dir=config.SBOM_CACHE_DIR,
+        cache_dir=config.TRIVY_CACHE_DIR,
+        scan_timeout=parse_duration(value=config.SCAN_TIMEOUT),
+        scan_retries=config.SCAN_RETRIES,
+        registries={
+            registry.docker_registry: RegistryAccess(
+                rate_limiter=client.rate_limiter,
+                username=registry.username,
+                password=registry.password,
+            )
+            for registry, client in zip(registries, clients)
+        },
     )
 
+    cache: Optional[ScanCache] = open_scan_cache(options=scanner_options)
+    report_writer: Optional[ReportWriter] = open_report_writer(
+        resume=args.resume or args.daemon
+    )
+    results_store: Optional[ResultsStore] = (
+        ResultsStore(results_file=config.RESULTS_DB_FILE)
+        if config.RESULTS_DB_FILE
+        else None
+    )
+    scan_results: CompactResults = CompactResults()
+    sweeps: list[Sweep] = open_sweeps(
+        registries=registries,
+        clients=clients,
+        options=scanner_options,
+        cache=cache,
+        report_writer=report_writer,
+        layer_cache=layer_cache,
+        results_store=results_store,
+        scan_results=scan_results,
+        skip_tags=(
+            read_scanned_tags(report_file=config.SCAN_RESULTS_STREAM_FILE)
+            if args.resume
+            else None
+        ),
+    )
+
+    # Started last, right before the try block that stops it
+    if trivy_server:
+        trivy_server.start()
+
+    try:
+        if args.daemon:
+            run_daemon(sweep=sweeps[0], trivy_server=trivy_server)
+        else:
+            run_sweeps(registries=registries, sweeps=sweeps, options=scanner_options)
+    except RuntimeError as exc:
+        logger.critical(exc)
+    finally:
+        export_report(report_writer=report_writer, scan_results=scan_results)
+        for client in clients:
+            client.close()
+        if cache:
+            cache.close()
+        if layer_cache:
+            layer_cache.close()
+        if results_store:
+            results_store.close()
+        if trivy_server:
+            trivy_server.stop()
+        METRICS.set("run_duration_seconds", perf_counter() - run_start)
+        if config.METRICS_FILE:
+            METRICS.export(output_file=config.METRICS_FILE)
+
 
 if __name__ == "__main__":  # pragma: no cover
     main()
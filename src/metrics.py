@@ -0,0 +1,181 @@
+"""Metrics (timing histograms, counters and OpenMetrics textfile export)"""
+
+from contextlib import contextmanager
+from os import replace
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Iterator, Optional
+from logger import logger
+
+Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+)
+
+
+def format_labels(labels: Labels, **extra_labels: str) -> str:
+    """Format OpenMetrics Labels Function"""
+
+    all_labels: Labels = labels + tuple(extra_labels.items())
+    if not all_labels:
+        return ""
+    escaped_labels: list[str] = []
+    for name, value in all_labels:
+        escaped_value: str = (
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        escaped_labels.append(f'{name}="{escaped_value}"')
+    return "{" + ",".join(escaped_labels) + "}"
+
+
+class Metrics:
+    """Metrics Class (thread-safe registry of histograms, counters and gauges)"""
+
+    def __init__(
+        self,
+        prefix: str = "registry_scanner",
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.prefix = prefix
+        self.buckets = buckets
+        self.lock: Lock = Lock()
+        self.histograms: dict[str, dict[Labels, list[float]]] = {}
+        self.counters: dict[str, dict[Labels, float]] = {}
+        self.gauges: dict[str, dict[Labels, float]] = {}
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Observe Histogram Value Method"""
+
+        key: Labels = tuple(sorted(labels.items()))
+        with self.lock:
+            # Bucket counts, then count and sum
+            series: list[float] = self.histograms.setdefault(name, {}).setdefault(
+                key, [0] * (len(self.buckets) + 2)
+            )
+            for index, bucket in enumerate(self.buckets):
+                if value <= bucket:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Increment Counter Method"""
+
+        key: Labels = tuple(sorted(labels.items()))
+        with self.lock:
+            series: dict[Labels, float] = self.counters.setdefault(name, {})
+            series.update({key: series.get(key, 0.0) + value})
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """Set Gauge Method"""
+
+        with self.lock:
+            self.gauges.setdefault(name, {}).update(
+                {tuple(sorted(labels.items())): value}
+            )
+
+    @contextmanager
+    def time(self, name: str, **labels: str) -> Iterator[None]:
+        """Observe Duration Of A Block Context Manager"""
+
+        start: float = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - start, **labels)
+
+    def to_openmetrics(self) -> str:
+        """Render Metrics As OpenMetrics Text Method"""
+
+        lines: list[str] = []
+        with self.lock:
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {self.prefix}_{name} histogram")
+                for labels, values in series.items():
+                    for bucket, count in zip(
+                        [*map(str, self.buckets), "+Inf"],
+                        [*values[: len(self.buckets)], values[-2]],
+                    ):
+                        lines.append(
+                            f"{self.prefix}_{name}_bucket"
+                            f"{format_labels(labels, le=bucket)} {count:g}"
+                        )
+                    lines.append(
+                        f"{self.prefix}_{name}_count{format_labels(labels)}"
+                        f" {values[-2]:g}"
+                    )
+                    lines.append(
+                        f"{self.prefix}_{name}_sum{format_labels(labels)}"
+                        f" {values[-1]:g}"
+                    )
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {self.prefix}_{name} counter")
+                for labels, value in series.items():
+                    lines.append(
+                        f"{self.prefix}_{name}_total{format_labels(labels)} {value:g}"
+                    )
+            for name, series in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {self.prefix}_{name} gauge")
+                for labels, value in series.items():
+                    lines.append(
+                        f"{self.prefix}_{name}{format_labels(labels)} {value:g}"
+                    )
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def export(self, output_file: str) -> None:
+        """Export Metrics As OpenMetrics Textfile Method (written atomically)"""
+
+        with open(file=f"{output_file}.tmp", mode="w", encoding="UTF-8") as file:
+            file.write(self.to_openmetrics())
+        replace(f"{output_file}.tmp", output_file)
+        logger.info(msg=f"✨ Metrics exported on {output_file}")
+
+
+class Progress:  # pylint: disable=too-few-public-methods
+    """Progress Class (periodic tags/sec and ETA line)"""
+
+    def __init__(self, interval: float = 60.0) -> None:
+        self.interval = interval
+        self.start: float = monotonic()
+        self.last_report: float = self.start
+
+    def update(self, done: int, discovered: int, force: bool = False) -> Optional[str]:
+        """Log Progress Line Method (at most once per interval)"""
+
+        now: float = monotonic()
+        if not force and (self.interval <= 0 or now - self.last_report < self.interval):
+            return None
+        self.last_report = now
+        elapsed: float = max(now - self.start, 1e-9)
+        rate: float = done / elapsed
+        eta: str = (
+            f"{(discovered - done) / rate:.0f}s"
+            if rate > 0 and discovered > done
+            else "-"
+        )
+        text: str = (
+            f"⏱️ {done}/{discovered} tags done in {elapsed:.0f}s"
+            f" ({rate:.2f} tags/s, ETA for discovered tags: {eta})"
+        )
+        logger.info(msg=text)
+        return text
+
+
+METRICS: Metrics = Metrics()
@@ -0,0 +1,84 @@
+"""Rate Limiter (token bucket shared by threads and scan worker processes)"""
+
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from multiprocessing import Lock, Value
+from random import uniform
+from time import monotonic, sleep
+from typing import Optional
+
+
+def retry_delay(
+    attempt: int,
+    retry_after: Optional[str] = None,
+    base: float = 0.5,
+    cap: float = 60.0,
+) -> float:
+    """Get Retry Delay Function
+
+    Honors a `Retry-After` header (seconds or HTTP date), otherwise uses
+    exponential backoff with full jitter. Always capped to `cap` seconds.
+    """
+
+    if retry_after:
+        try:
+            delay: float = float(retry_after)
+        except ValueError:
+            try:
+                delay = (
+                    parsedate_to_datetime(retry_after) - datetime.now(tz=timezone.utc)
+                ).total_seconds()
+            except (TypeError, ValueError):
+                delay = base * 2**attempt
+        return min(max(delay, 0.0), cap)
+    return uniform(0.0, min(base * 2**attempt, cap))  # nosec B311
+
+
+class RateLimiter:
+    """Rate Limiter Class
+
+    Token bucket refilled at `rate` tokens per second up to `burst` tokens.
+    Its state lives in shared memory, so one instance passed to the scan
+    pool workers limits registry API calls and image pulls together. A
+    `rate` of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.lock = Lock()
+        self.tokens = Value("d", float(self.burst), lock=False)
+        self.updated = Value("d", monotonic(), lock=False)
+
+    def __refill(self) -> float:
+        """Refill the bucket (lock held) and get the available tokens"""
+        now: float = monotonic()
+        self.tokens.value = min(
+            self.tokens.value + (now - self.updated.value) * self.rate,
+            float(self.burst),
+        )
+        self.updated.value = now
+        return self.tokens.value
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Acquire Tokens Method (blocks until available, returns the wait)"""
+
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            # Tokens are taken even when missing (debt), so later callers
+            # queue behind this one instead of racing for the refill
+            available: float = self.__refill()
+            self.tokens.value = available - tokens
+        wait: float = max(tokens - available, 0.0) / self.rate
+        if wait:
+            sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Pause Method (every caller waits at least `seconds`, e.g. on 429)"""
+
+        if self.rate <= 0 or seconds <= 0:
+            return
+        with self.lock:
+            self.tokens.value = min(self.__refill(), -seconds * self.rate)
@@ -0,0 +1,70 @@
+"""Registries (configuration of every Docker registry scanned in one run)"""
+
+from json import loads
+from typing import Any, NamedTuple, Optional
+from urllib.parse import urlparse
+
+# Fields bound to one registry, never taken from the defaults
+REGISTRY_ACCESS_FIELDS: tuple[str, ...] = ("ca_file", "username", "password")
+
+
+class RegistryConfig(NamedTuple):
+    """Registry Configuration (one Docker registry of a run)"""
+
+    url: str
+    ca_file: Optional[str] = None
+    username: Optional[str] = None
+    password: Optional[str] = None
+    images_filter: str = r".*"
+    tags_filter: str = r".*"
+    rate_limit: float = 0.0
+    rate_burst: int = 1
+    concurrency: int = 4
+
+    @property
+    def docker_registry(self) -> str:
+        """Get registry 'host:port' (namespace of its Docker image tags)"""
+
+        parse_result = urlparse(url=self.url)
+        return f"{parse_result.hostname}:{parse_result.port or 443}"
+
+
+def load_registries(
+    registries_file: str, defaults: RegistryConfig, max_concurrency: int = 0
+) -> list[RegistryConfig]:
+    """Load Registries Configuration Function (JSON list of registries)
+
+    Each registry is an object of `RegistryConfig` fields, `url` required.
+    Missing fields get their value from `defaults` (e.g. the single
+    registry configuration), except the CA file and credentials of the
+    registry, and registry concurrencies are capped to `max_concurrency`.
+    """
+
+    with open(file=registries_file, encoding="UTF-8") as file:
+        entries: Any = loads(file.read())
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"'{registries_file}' must be a non-empty list of registries")
+
+    registries: list[RegistryConfig] = []
+    for entry in entries:
+        if not isinstance(entry, dict) or "url" not in entry:
+            raise ValueError(f"Registry without 'url' in '{registries_file}': {entry}")
+        unknown_fields: set[str] = set(entry).difference(RegistryConfig._fields)
+        if unknown_fields:
+            raise ValueError(
+                f"Unknown registry fields in '{registries_file}':"
+                f" {', '.join(sorted(unknown_fields))}"
+            )
+        registry: RegistryConfig = defaults._replace(
+            **{**dict.fromkeys(REGISTRY_ACCESS_FIELDS), **entry}
+        )
+        if max_concurrency > 0:
+            registry = registry._replace(
+                concurrency=min(registry.concurrency, max_concurrency)
+            )
+        registries.append(registry)
+
+    docker_registries: list[str] = [registry.docker_registry for registry in registries]
+    if len(set(docker_registries)) != len(docker_registries):
+        raise ValueError(f"Duplicate registries in '{registries_file}'")
+    return registries
@@ -0,0 +1,152 @@
+"""Docker Registry Authentication (Basic and Bearer token flows)"""
+
+from base64 import b64encode
+from http.client import HTTPSConnection, HTTPResponse, HTTPException
+from json import loads
+from re import Match, findall, search
+from ssl import SSLContext
+from threading import Lock
+from time import monotonic
+from typing import Any, Optional
+from urllib.parse import ParseResult, urlencode, urlparse
+from logger import logger
+
+# Tokens are renewed this many seconds before they expire
+TOKEN_EXPIRY_MARGIN: float = 10.0
+
+
+def parse_challenge(header: str) -> tuple[str, dict[str, str]]:
+    """Parse 'WWW-Authenticate' Header Function (scheme and parameters)"""
+
+    scheme, _, params = header.strip().partition(" ")
+    return scheme.lower(), dict(findall(pattern=r'(\w+)="([^"]*)"', string=params))
+
+
+def request_scope(url: str) -> Optional[str]:
+    """Get Token Scope Needed By A Docker Registry API URL Function"""
+
+    if search(pattern=r"/v2/_catalog", string=url):
+        return "registry:catalog:*"
+    repository_match: Optional[Match[str]] = search(
+        pattern=r"/v2/(.+?)/(?:tags/list|manifests/|blobs/)", string=url
+    )
+    if repository_match:
+        return f"repository:{repository_match.group(1)}:pull"
+    return None
+
+
+class RegistryAuth:
+    """Registry Authentication Class
+
+    Answers `WWW-Authenticate` challenges: Basic challenges with the
+    credentials, Bearer challenges with a token fetched from the challenge
+    realm. Tokens are cached by scope until they expire, so one token is
+    reused by every request of the same scope (catalog, or tags and
+    manifests of one repository).
+    """
+
+    def __init__(
+        self,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        ssl_context: Optional[SSLContext] = None,
+        timeout: int = 3,
+    ) -> None:
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self.basic: Optional[str] = (
+            b64encode(f"{username}:{password}".encode()).decode()
+            if username is not None
+            else None
+        )
+        self.use_basic: bool = False
+        self.lock: Lock = Lock()
+        self.tokens: dict[str, tuple[str, float]] = {}
+
+    def __cached_token(self, scope: Optional[str]) -> Optional[str]:
+        token, expires_at = self.tokens.get(str(scope), ("", 0.0))
+        return token if token and monotonic() < expires_at else None
+
+    def headers(self, url: str) -> dict[str, str]:
+        """Get Authorization Headers Of A Request Method"""
+
+        token: Optional[str] = self.__cached_token(scope=request_scope(url=url))
+        if token:
+            return {"Authorization": f"Bearer {token}"}
+        if self.use_basic and self.basic:
+            return {"Authorization": f"Basic {self.basic}"}
+        return {}
+
+    def authenticate(
+        self, url: str, challenge: Optional[str], sent_headers: dict[str, str]
+    ) -> bool:
+        """Answer An Authentication Challenge Method
+
+        Returns whether the request should be sent again.
+        """
+
+        if not challenge:
+            return False
+        scheme, params = parse_challenge(header=challenge)
+        if scheme == "basic":
+            retry: bool = bool(self.basic) and not self.use_basic
+            self.use_basic = bool(self.basic)
+            return retry
+        if scheme != "bearer" or "realm" not in params:
+            return False
+
+        scope: str = request_scope(url=url) or params.get("scope", "")
+        with self.lock:
+            cached_token: Optional[str] = self.__cached_token(scope=scope)
+            if cached_token and sent_headers.get("Authorization") != (
+                f"Bearer {cached_token}"
+            ):
+                # Another thread fetched a token meanwhile
+                return True
+            token, expires_in = self.__fetch_token(params=params)
+            self.tokens.update(
+                {
+                    scope: (
+                        token,
+                        monotonic()
+                        + expires_in
+                        - min(TOKEN_EXPIRY_MARGIN, expires_in / 2),
+                    )
+                }
+            )
+        return True
+
+    def __fetch_token(self, params: dict[str, str]) -> tuple[str, float]:
+        realm: ParseResult = urlparse(url=params.get("realm"))
+        if realm.scheme != "https":
+            raise HTTPException(f"Refusing non HTTPS token realm: {realm.geturl()}")
+        query: dict[str, str] = {
+            key: value for key, value in params.items() if key in ["service", "scope"]
+        }
+        connection: HTTPSConnection = HTTPSConnection(  # nosemgrep: bandit.B309
+            host=str(realm.hostname),
+            port=realm.port if realm.port else 443,
+            timeout=self.timeout,
+            context=self.ssl_context,
+        )
+        try:
+            connection.request(
+                method="GET",
+                url=f"{realm.path}?{realm.query + '&' if realm.query else ''}"
+                f"{urlencode(query=query)}",
+                headers=(
+                    {"Authorization": f"Basic {self.basic}"} if self.basic else {}
+                ),
+            )
+            response: HTTPResponse = connection.getresponse()
+            body: dict[str, Any] = dict(loads(response.read() or b"{}"))
+        finally:
+            connection.close()
+
+        token: Optional[str] = body.get("token") or body.get("access_token")
+        if response.status != 200 or not token:
+            raise HTTPException(
+                f"Token request failed: {response.status} -> {response.reason}"
+            )
+        logger.debug(msg=f"🔑 New registry token for scope '{query.get('scope')}'")
+        return token, float(body.get("expires_in") or 60)
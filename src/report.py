@@ -0,0 +1,302 @@
+"""Scan Results Report"""
+
+from collections import Counter
+from contextlib import closing
+from itertools import chain
+from os import SEEK_END, fsync, path
+from time import monotonic
+from typing import Any, Iterable, Iterator, Literal, Mapping, Optional, TextIO
+from json import JSONDecodeError, dumps, loads
+from trivy_report import JSONStream
+from logger import logger
+
+# Statuses of results whose findings are known
+SCANNED_STATUSES: tuple[str, ...] = ("OK", "NOK")
+
+
+def status_line(image: str, result: Any) -> str:
+    """Get Scan Result Status Line Function"""
+
+    if not result:
+        return f"🔥 FAILED '{image}'"
+    status: Optional[str] = dict(result).get("status")
+    status_emoji: Literal["🟢", "🔴"] = "🟢" if status == "OK" else "🔴"
+    text: str = f"{status_emoji} {status}\t{image}"
+
+    if status == "SKIPPED":
+        text = f"⏭️ {status}\t{image}"
+    elif status == "TIMEOUT":
+        text = f"⌛ {status}\t{image} ({dict(result).get('timeout')}s)"
+    elif status == "FAILED":
+        text = (
+            f"🔥 {status}\t{image}"
+            f" ({dict(result).get('exit_code', dict(result).get('error'))})"
+        )
+    elif status != "OK":
+        summary: Optional[dict[str, int]] = dict(
+            dict(result).get("vulnerabilities")
+        ).get("summary")
+        text = f"{text} ({summary})"
+    return text
+
+
+def display_results(results: dict[str, Any]) -> None:
+    """Display Scanner Results To Standard Output"""
+
+    for image, result in dict(results).items():
+        logger.info(status_line(image=image, result=result))
+
+
+class StatusLog:
+    """Status Log Class (per-tag status lines, rate-limited and summarized)
+
+    At most `max_lines` status lines are logged every `interval` seconds.
+    Tags over the limit are only counted by status, and summarized in one
+    line when the interval is over (or on `flush`), so logging costs stay
+    the same whatever the sweep size. An `interval` of 0 logs every line.
+    """
+
+    def __init__(self, interval: float = 0.0, max_lines: int = 10) -> None:
+        self.interval = interval
+        self.max_lines = max_lines
+        self.window_start: float = monotonic()
+        self.lines: int = 0
+        self.suppressed: Counter[str] = Counter()
+
+    def log(self, results: dict[str, Any]) -> None:
+        """Log Scan Results Status Lines Method"""
+
+        if self.interval <= 0:
+            display_results(results=results)
+            return
+        if monotonic() - self.window_start >= self.interval:
+            self.flush()
+        for image, result in dict(results).items():
+            if self.lines < self.max_lines:
+                logger.info(status_line(image=image, result=result))
+                self.lines += 1
+            else:
+                self.suppressed.update([dict(result or {}).get("status", "FAILED")])
+
+    def flush(self) -> None:
+        """Log Summary Of Suppressed Status Lines Method (starts a new interval)"""
+
+        if self.suppressed:
+            logger.info(
+                msg=f"📋 {sum(self.suppressed.values())} more Docker tags in"
+                f" {monotonic() - self.window_start:.0f}s:"
+                f" {dict(sorted(self.suppressed.items()))}"
+            )
+        self.window_start = monotonic()
+        self.lines = 0
+        self.suppressed.clear()
+
+
+def export_scan_results(scan_results: Mapping[str, Any], output_file: str) -> None:
+    """Export Scan Results Function (e.g. compact results, one tag at a time)"""
+
+    if scan_results:
+        write_report(entries=scan_results.items(), output_file=output_file)
+        logger.info(msg=f"✨ Scan results exported on {output_file}")
+
+
+def truncate_torn_line(report_file: str, chunk_size: int = 4096) -> None:
+    """Truncate A Torn Last Line Function (e.g. written during a crash)
+
+    The report file is cut back after its last newline, so that appended
+    lines are never glued to a partial one.
+    """
+
+    if not path.exists(report_file):
+        return
+    with open(file=report_file, mode="rb+") as file:
+        end: int = file.seek(0, SEEK_END)
+        position: int = end
+        while position > 0:
+            start: int = max(position - chunk_size, 0)
+            file.seek(start)
+            newline: int = file.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            logger.warning(msg=f"🤡 Truncating torn last line of {report_file}")
+            file.truncate(position)
+
+
+class ReportWriter:
+    """Report Writer Class (appends one JSON line per Docker image tag)
+
+    Lines are flushed as soon as they are written and fsync'ed every
+    `fsync_every` lines, so at most one batch is lost on a crash. A torn
+    last line left by a crash is truncated before appending.
+    """
+
+    def __init__(self, report_file: str, fsync_every: int = 100) -> None:
+        self.report_file = report_file
+        self.fsync_every = fsync_every
+        self.unsynced_lines: int = 0
+        truncate_torn_line(report_file=report_file)
+        self.file: TextIO = open(  # pylint: disable=consider-using-with
+            file=report_file, mode="a", encoding="UTF-8"
+        )
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def sync(self) -> None:
+        """Flush And Sync Report File Method"""
+
+        self.file.flush()
+        fsync(self.file.fileno())
+        self.unsynced_lines = 0
+
+    def write(self, results: dict[str, Any]) -> None:
+        """Append Scan Results Method"""
+
+        for image, result in results.items():
+            self.file.write(f"{dumps({image: result})}\n")
+            self.unsynced_lines += 1
+        self.file.flush()
+        if self.unsynced_lines >= self.fsync_every:
+            self.sync()
+
+    def close(self) -> None:
+        """Close Report Writer Method"""
+
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+
+
+def iter_report_lines(report_file: str) -> Iterator[tuple[str, Any]]:
+    """Iterate JSON Lines Report Function (skips a truncated last line)"""
+
+    with open(file=report_file, encoding="UTF-8") as file:
+        for line in file:
+            try:
+                entry: dict[str, Any] = loads(line)
+            except JSONDecodeError:
+                logger.warning(msg=f"🤡 Skipping truncated line in {report_file}")
+                continue
+            yield from entry.items()
+
+
+def read_scanned_tags(report_file: str) -> set[str]:
+    """Read Docker Image Tags Already Scanned In A JSON Lines Report Function
+
+    Only tags whose last result is scanned (OK or NOK) are returned, so
+    that skipped, failed and timed out tags are scanned again.
+    """
+
+    statuses: dict[str, str] = {}
+    try:
+        for image, result in iter_report_lines(report_file=report_file):
+            statuses.update({image: str(dict(result or {}).get("status"))})
+    except FileNotFoundError:
+        return set()
+    return {image for image, status in statuses.items() if status in SCANNED_STATUSES}
+
+
+def iter_report_entries(report_file: str) -> Iterator[tuple[str, Any]]:
+    """Iterate Report Entries Function (streamed, one tag result at a time)
+
+    Reads aggregated JSON reports as well as JSON lines reports.
+    """
+
+    with open(file=report_file, encoding="UTF-8") as file:
+        stream: JSONStream = JSONStream(file=file)
+        while stream.peek() == "{":
+            for image in stream.iter_object():
+                yield image, stream.read_value()
+
+
+def is_empty_report(report_file: str) -> bool:
+    """Check Report Is Missing Or Without Any Entry Function"""
+
+    if not path.exists(report_file):
+        return True
+    with closing(iter_report_entries(report_file=report_file)) as entries:
+        return next(entries, None) is None
+
+
+def write_report(entries: Iterable[tuple[str, Any]], output_file: str) -> int:
+    """Write Aggregated JSON Report Function (streamed)
+
+    Output is identical to `dumps(dict(entries), indent=2)`. Returns the
+    number of entries written. Without any entry, `output_file` is left
+    untouched (e.g. the report of a previous run is kept).
+    """
+
+    iterator: Iterator[tuple[str, Any]] = iter(entries)
+    first_entry: Optional[tuple[str, Any]] = next(iterator, None)
+    if first_entry is None:
+        return 0
+    written: int = 0
+    with open(file=output_file, mode="w", encoding="UTF-8") as file:
+        for image, result in chain([first_entry], iterator):
+            file.write(",\n" if written else "{\n")
+            result_json: str = dumps(result, indent=2).replace("\n", "\n  ")
+            file.write(f"  {dumps(image)}: {result_json}")
+            written += 1
+        file.write("\n}")
+    return written
+
+
+def finalize_report(report_file: str, output_file: str) -> None:
+    """Finalize JSON Lines Report Function
+
+    Streams a JSON lines report into the aggregated JSON report (same
+    output as `export_scan_results`). The last result of a tag wins, so
+    rescans (e.g. in daemon mode) supersede older results. Without any
+    result, `output_file` is left untouched.
+    """
+
+    last_results: dict[str, int] = {}
+    for index, (image, _) in enumerate(iter_report_lines(report_file=report_file)):
+        last_results.update({image: index})
+    if not last_results:
+        logger.warning(msg=f"🤡 No scan result in {report_file}, nothing exported")
+        return
+
+    write_report(
+        entries=(
+            (image, result)
+            for index, (image, result) in enumerate(
+                iter_report_lines(report_file=report_file)
+            )
+            if last_results.get(image) == index
+        ),
+        output_file=output_file,
+    )
+    logger.info(msg=f"✨ Scan results exported on {output_file}")
+
+
+def merge_reports(report_files: list[str], output_file: str) -> None:
+    """Merge Reports Function (e.g. reports of every shard, streamed)
+
+    The first result of a tag wins. Missing reports (shards without any
+    scan result) are skipped.
+    """
+
+    images: set[str] = set()
+
+    def unique_entries() -> Iterator[tuple[str, Any]]:
+        for report_file in report_files:
+            if not path.exists(report_file):
+                logger.warning(msg=f"🤡 Skipping missing report {report_file}")
+                continue
+            for image, result in iter_report_entries(report_file=report_file):
+                if image not in images:
+                    images.add(image)
+                    yield image, result
+
+    written: int = write_report(entries=unique_entries(), output_file=output_file)
+    logger.info(
+        msg=f"✨ {len(report_files)} reports merged on {output_file}"
+        f" ({written} Docker image tags)"
+    )
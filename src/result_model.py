@@ -0,0 +1,184 @@
+"""Result Model (compact in-memory scan results)"""
+
+from array import array
+from collections.abc import Mapping
+from re import Match
+from sys import intern
+from typing import Any, Iterator, Optional
+from results_store import FINDING_PATTERN
+
+
+class SymbolTable:
+    """Symbol Table Class (strings stored once, referenced by integers)"""
+
+    __slots__ = ("symbols", "refs")
+
+    def __init__(self) -> None:
+        self.symbols: list[str] = []
+        self.refs: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, ref: int) -> str:
+        return self.symbols[ref]
+
+    def ref(self, symbol: str) -> int:
+        """Get Symbol Reference Method (interns new symbols)"""
+
+        ref: Optional[int] = self.refs.get(symbol)
+        if ref is None:
+            ref = len(self.symbols)
+            symbol = intern(symbol)
+            self.symbols.append(symbol)
+            self.refs.update({symbol: ref})
+        return ref
+
+
+class FindingTable:
+    """Finding Table Class ('CVE-2023-1234 (HIGH)' findings stored once)
+
+    Findings are (vulnerability id, severity) pairs of symbol references,
+    referenced by integers: the table grows with distinct findings only.
+    """
+
+    __slots__ = ("symbols", "vuln_ids", "severities", "refs")
+
+    def __init__(self, symbols: SymbolTable) -> None:
+        self.symbols = symbols
+        self.vuln_ids: array = array("I")
+        self.severities: array = array("I")
+        self.refs: dict[tuple[int, int], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.vuln_ids)
+
+    def ref(self, finding: str) -> int:
+        """Get Finding Reference Method (interns new findings)"""
+
+        finding_match: Optional[Match[str]] = FINDING_PATTERN.match(finding)
+        key: tuple[int, int] = (
+            (
+                self.symbols.ref(symbol=finding_match.group(1)),
+                self.symbols.ref(symbol=finding_match.group(2)),
+            )
+            if finding_match
+            else (self.symbols.ref(symbol=finding), self.symbols.ref(symbol=""))
+        )
+        ref: Optional[int] = self.refs.get(key)
+        if ref is None:
+            ref = len(self.vuln_ids)
+            self.vuln_ids.append(key[0])
+            self.severities.append(key[1])
+            self.refs.update({key: ref})
+        return ref
+
+    def text(self, ref: int) -> str:
+        """Get Finding Text Method ('CVE-2023-1234 (HIGH)')"""
+
+        vuln_id: str = self.symbols[self.vuln_ids[ref]]
+        severity: str = self.symbols[self.severities[ref]]
+        return f"{vuln_id} ({severity})" if severity else vuln_id
+
+
+class CompactVulnerabilities:  # pylint: disable=too-few-public-methods
+    """Compact Vulnerabilities Class ('vulnerabilities' of a scan result)
+
+    Entries are (symbol reference of the key, value) pairs: findings lists
+    are arrays of finding references, the severity summary a tuple of
+    (symbol reference, count) pairs.
+    """
+
+    __slots__ = ("entries",)
+
+    def __init__(self, entries: tuple[tuple[int, Any], ...]) -> None:
+        self.entries = entries
+
+
+class CompactResult:  # pylint: disable=too-few-public-methods
+    """Compact Result Class (fields of a scan result, in report order)"""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: tuple[tuple[str, Any], ...]) -> None:
+        self.fields = fields
+
+
+class CompactResults(Mapping):
+    """Compact Results Class (Docker image tag scan results)
+
+    Results are packed as they are added and unpacked to the report format
+    (plain dicts) only when read, e.g. at export. Vulnerability ids,
+    severities and report keys are interned in shared tables, so memory
+    grows with distinct findings rather than with images times findings.
+    Aliases added together share their packed vulnerabilities.
+    """
+
+    def __init__(self) -> None:
+        self.symbols: SymbolTable = SymbolTable()
+        self.findings: FindingTable = FindingTable(symbols=self.symbols)
+        self.results: dict[str, Optional[CompactResult]] = {}
+
+    def __getitem__(self, docker_image_tag: str) -> Any:
+        result: Optional[CompactResult] = self.results[docker_image_tag]
+        if result is None:
+            return None
+        return {
+            name: (
+                self.__unpack(vulnerabilities=value)
+                if isinstance(value, CompactVulnerabilities)
+                else value
+            )
+            for name, value in result.fields
+        }
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __pack(self, vulnerabilities: dict[str, Any]) -> CompactVulnerabilities:
+        entries: list[tuple[int, Any]] = []
+        for key, value in vulnerabilities.items():
+            if isinstance(value, list) and all(isinstance(item, str) for item in value):
+                value = array("I", (self.findings.ref(finding=item) for item in value))
+            elif isinstance(value, dict) and all(
+                isinstance(count, int) for count in value.values()
+            ):
+                value = tuple(
+                    (self.symbols.ref(symbol=severity), count)
+                    for severity, count in value.items()
+                )
+            entries.append((self.symbols.ref(symbol=key), value))
+        return CompactVulnerabilities(entries=tuple(entries))
+
+    def __unpack(self, vulnerabilities: CompactVulnerabilities) -> dict[str, Any]:
+        unpacked: dict[str, Any] = {}
+        for key, value in vulnerabilities.entries:
+            if isinstance(value, array):
+                value = [self.findings.text(ref=ref) for ref in value]
+            elif isinstance(value, tuple):
+                value = {self.symbols[ref]: count for ref, count in value}
+            unpacked.update({self.symbols[key]: value})
+        return unpacked
+
+    def update(self, results: dict[str, Any]) -> None:
+        """Add Scan Results Method (the last result of a tag wins)"""
+
+        packed: dict[int, CompactVulnerabilities] = {}
+        for docker_image_tag, result in results.items():
+            if result is None:
+                self.results.update({docker_image_tag: None})
+                continue
+            fields: list[tuple[str, Any]] = []
+            for name, value in dict(result).items():
+                if isinstance(value, dict) and name == "vulnerabilities":
+                    # Aliases share the vulnerabilities of their scan
+                    if id(value) not in packed:
+                        packed.update({id(value): self.__pack(vulnerabilities=value)})
+                    value = packed[id(value)]
+                elif isinstance(value, str):
+                    value = intern(value)
+                fields.append((intern(name), value))
+            self.results.update({docker_image_tag: CompactResult(fields=tuple(fields))})
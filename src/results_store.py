@@ -0,0 +1,264 @@
+"""Results Store (indexed SQLite history of scan results)"""
+
+from sqlite3 import Connection, connect
+from datetime import datetime, timezone
+from hashlib import sha256
+from json import dumps
+from re import Match, Pattern, compile as re_compile
+from typing import Any, Iterator, Optional
+
+# 'CVE-2023-1234 (HIGH)' findings of 'class (target)' result keys
+FINDING_PATTERN: Pattern[str] = re_compile(r"^(.*) \((\w+)\)$")
+RESULT_KEY_PATTERN: Pattern[str] = re_compile(r"^(\S+) \((.*)\)$")
+# Fields of a report entry specific to one Docker image tag
+TAG_FIELDS: list[str] = ["deduplicated", "scanned_as"]
+
+SCHEMA: list[str] = [
+    "CREATE TABLE IF NOT EXISTS runs ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " started_at TEXT NOT NULL,"
+    " finished_at TEXT)",
+    "CREATE TABLE IF NOT EXISTS digests ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " digest TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE IF NOT EXISTS results ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " digest_id INTEGER NOT NULL REFERENCES digests (id),"
+    " fingerprint TEXT NOT NULL UNIQUE,"
+    " status TEXT NOT NULL,"
+    " created TEXT,"
+    " image_id TEXT)",
+    "CREATE TABLE IF NOT EXISTS tags ("
+    " run_id INTEGER NOT NULL REFERENCES runs (id),"
+    " name TEXT NOT NULL,"
+    " result_id INTEGER NOT NULL REFERENCES results (id),"
+    " deduplicated INTEGER NOT NULL DEFAULT 0,"
+    " PRIMARY KEY (run_id, name))",
+    "CREATE TABLE IF NOT EXISTS findings ("
+    " result_id INTEGER NOT NULL REFERENCES results (id),"
+    " class TEXT NOT NULL,"
+    " target TEXT NOT NULL,"
+    " vuln_id TEXT NOT NULL,"
+    " severity TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS tags_result ON tags (result_id, run_id)",
+    "CREATE INDEX IF NOT EXISTS findings_result ON findings (result_id)",
+    "CREATE INDEX IF NOT EXISTS findings_vuln_id ON findings (vuln_id, result_id)",
+    "CREATE INDEX IF NOT EXISTS findings_severity ON findings (severity, result_id)",
+]
+
+
+def iter_findings(result: dict[str, Any]) -> Iterator[tuple[str, str, str, str]]:
+    """Iterate Findings Of A Scan Result Function (class, target, id, severity)"""
+
+    vulnerabilities: Any = result.get("vulnerabilities")
+    if not isinstance(vulnerabilities, dict):
+        return
+    for key, findings in vulnerabilities.items():
+        key_match: Optional[Match[str]] = RESULT_KEY_PATTERN.match(key)
+        if not key_match or not isinstance(findings, list):
+            continue
+        for finding in findings:
+            finding_match: Optional[Match[str]] = FINDING_PATTERN.match(str(finding))
+            if finding_match:
+                yield (
+                    key_match.group(1),
+                    key_match.group(2),
+                    finding_match.group(1),
+                    finding_match.group(2),
+                )
+
+
+class ResultsStore:
+    """Results Store Class (one run per instance)
+
+    Every Docker image tag result of the run is recorded in `tags`. Scan
+    results are stored once per distinct content in `results` (and their
+    findings in `findings`), so unchanged images add a single row per run:
+    a year of daily runs stays small and its indexes fast.
+    """
+
+    def __init__(self, results_file: str, commit_every: int = 100) -> None:
+        self.commit_every = commit_every
+        self.uncommitted: int = 0
+        self.connection: Connection = connect(database=results_file)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        for statement in SCHEMA:
+            self.connection.execute(statement)
+        self.run_id: int = int(
+            self.connection.execute(
+                "INSERT INTO runs (started_at) VALUES (?)",
+                (datetime.now(tz=timezone.utc).isoformat(),),
+            ).lastrowid
+        )
+        self.connection.commit()
+
+    def __id(self, query: str, insert: str, params: tuple[Any, ...]) -> int:
+        row: Optional[tuple[int]] = self.connection.execute(query, params).fetchone()
+        if row:
+            return row[0]
+        return int(self.connection.execute(insert, params).lastrowid)
+
+    def __result_id(self, docker_image_tag: str, result: dict[str, Any]) -> int:
+        digest: str = result.get("digest") or f"unknown:{docker_image_tag}"
+        content: dict[str, Any] = {
+            key: value for key, value in result.items() if key not in TAG_FIELDS
+        }
+        fingerprint: str = sha256(
+            dumps({"digest": digest, **content}, sort_keys=True).encode()
+        ).hexdigest()
+        row: Optional[tuple[int]] = self.connection.execute(
+            "SELECT id FROM results WHERE fingerprint = ?", (fingerprint,)
+        ).fetchone()
+        if row:
+            return row[0]
+
+        digest_id: int = self.__id(
+            query="SELECT id FROM digests WHERE digest = ?",
+            insert="INSERT INTO digests (digest) VALUES (?)",
+            params=(digest,),
+        )
+        result_id: int = int(
+            self.connection.execute(
+                "INSERT INTO results"
+                " (digest_id, fingerprint, status, created, image_id)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    digest_id,
+                    fingerprint,
+                    result.get("status") or "FAILED",
+                    result.get("created"),
+                    result.get("id"),
+                ),
+            ).lastrowid
+        )
+        self.connection.executemany(
+            "INSERT INTO findings (result_id, class, target, vuln_id, severity)"
+            " VALUES (?, ?, ?, ?, ?)",
+            ((result_id, *finding) for finding in set(iter_findings(result=result))),
+        )
+        return result_id
+
+    def write(self, results: dict[str, Any]) -> None:
+        """Store Scan Results Method (keyed by Docker image tag)"""
+
+        for docker_image_tag, result in results.items():
+            self.connection.execute(
+                "INSERT OR REPLACE INTO tags (run_id, name, result_id, deduplicated)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    self.run_id,
+                    docker_image_tag,
+                    self.__result_id(
+                        docker_image_tag=docker_image_tag, result=dict(result or {})
+                    ),
+                    bool(dict(result or {}).get("deduplicated")),
+                ),
+            )
+            self.uncommitted += 1
+        if self.uncommitted >= self.commit_every:
+            self.connection.commit()
+            self.uncommitted = 0
+
+    def close(self) -> None:
+        """Close Results Store Method (marks the run finished)"""
+
+        self.connection.execute(
+            "UPDATE runs SET finished_at = ? WHERE id = ?",
+            (datetime.now(tz=timezone.utc).isoformat(), self.run_id),
+        )
+        self.connection.commit()
+        self.connection.close()
+
+
+class ResultsQuery:
+    """Results Query Class (read-only queries of a results store)"""
+
+    def __init__(self, results_file: str) -> None:
+        self.connection: Connection = connect(
+            database=f"file:{results_file}?mode=ro", uri=True
+        )
+
+    def __enter__(self) -> "ResultsQuery":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.connection.close()
+
+    def runs(self, limit: int = 2) -> list[int]:
+        """Get Latest Finished Run Identifiers Method (latest first)"""
+
+        return [
+            row[0]
+            for row in self.connection.execute(
+                "SELECT id FROM runs WHERE finished_at IS NOT NULL"
+                " ORDER BY id DESC LIMIT ?",
+                (limit,),
+            )
+        ]
+
+    def cve(self, vuln_id: str, run_id: Optional[int] = None) -> list[tuple[str, ...]]:
+        """Get Docker Image Tags Affected By A Vulnerability Method
+
+        Returns (tag, digest, severity, class, target) rows of `run_id`
+        (default: latest finished run).
+        """
+
+        return self.connection.execute(
+            "SELECT DISTINCT tags.name, digests.digest, findings.severity,"
+            " findings.class, findings.target"
+            " FROM findings"
+            " JOIN tags ON tags.result_id = findings.result_id AND tags.run_id = ?"
+            " JOIN results ON results.id = findings.result_id"
+            " JOIN digests ON digests.id = results.digest_id"
+            " WHERE findings.vuln_id = ?"
+            " ORDER BY tags.name, findings.target",
+            (run_id or next(iter(self.runs(limit=1)), 0), vuln_id),
+        ).fetchall()
+
+    def diff(
+        self, old_run_id: Optional[int] = None, new_run_id: Optional[int] = None
+    ) -> dict[str, list[tuple[str, ...]]]:
+        """Get Differences Between Two Runs Method (default: latest two)
+
+        Returns added and removed Docker image tags, and new and fixed
+        (tag, vulnerability, severity) findings.
+        """
+
+        latest: list[int] = self.runs(limit=2)
+        new_run: int = new_run_id or next(iter(latest), 0)
+        old_run: int = old_run_id or next((run for run in latest if run != new_run), 0)
+        tags_query: str = "SELECT name FROM tags WHERE run_id = ?"
+        findings_query: str = (
+            "SELECT tags.name, findings.vuln_id, findings.severity FROM tags"
+            " JOIN findings ON findings.result_id = tags.result_id"
+            " WHERE tags.run_id = ?"
+        )
+        return {
+            name: self.connection.execute(
+                f"{query} EXCEPT {query} ORDER BY 1", (first_run, second_run)
+            ).fetchall()
+            for name, query, first_run, second_run in [
+                ("added_tags", tags_query, new_run, old_run),
+                ("removed_tags", tags_query, old_run, new_run),
+                ("new_findings", findings_query, new_run, old_run),
+                ("fixed_findings", findings_query, old_run, new_run),
+            ]
+        }
+
+    def rollup(self, run_id: Optional[int] = None) -> list[tuple[Any, ...]]:
+        """Get Severity Rollup Of A Run Method (default: latest finished run)
+
+        Returns (severity, findings of every tag, distinct vulnerabilities,
+        affected digests, affected tags) rows.
+        """
+
+        return self.connection.execute(
+            "SELECT findings.severity, COUNT(*), COUNT(DISTINCT findings.vuln_id),"
+            " COUNT(DISTINCT results.digest_id), COUNT(DISTINCT tags.name)"
+            " FROM tags"
+            " JOIN findings ON findings.result_id = tags.result_id"
+            " JOIN results ON results.id = tags.result_id"
+            " WHERE tags.run_id = ?"
+            " GROUP BY findings.severity ORDER BY 2 DESC",
+            (run_id or next(iter(self.runs(limit=1)), 0),),
+        ).fetchall()
@@ -0,0 +1,109 @@
+"""Tag Retention (selects the Docker image tags worth scanning)"""
+
+from re import Match, Pattern, compile as re_compile
+from time import time
+from typing import Optional
+from scheduler import parse_created
+
+SEMVER_PATTERN: Pattern[str] = re_compile(
+    r"^v?(\d+)\.(\d+)(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$"
+)
+
+SemverKey = tuple[int, int, int, int, tuple[tuple[int, int, str], ...]]
+
+
+def parse_semver(tag: str) -> Optional[SemverKey]:
+    """Parse Semantic Version Tag Function (sort key, None when not a version)
+
+    'v' prefixes and missing patch numbers are accepted ('v1.2' is 1.2.0),
+    build metadata is ignored, and pre-releases sort before their release.
+    """
+
+    semver_match: Optional[Match[str]] = SEMVER_PATTERN.match(tag)
+    if not semver_match:
+        return None
+    major, minor, patch, prerelease = semver_match.groups()
+    return (
+        int(major),
+        int(minor),
+        int(patch or 0),
+        0 if prerelease else 1,
+        tuple(
+            (1, int(identifier), "") if identifier.isdigit() else (2, 0, identifier)
+            for identifier in (prerelease or "").split(".")
+            if identifier
+        ),
+    )
+
+
+class TagRetention:
+    """Tag Retention Class
+
+    Keeps the `keep_semver` latest tags by semantic version and the
+    `keep_recent` latest tags by image creation date (a tag kept by either
+    policy is scanned), then drops tags of images created more than
+    `max_age` seconds ago. Tags of unknown (or reproducible build epoch)
+    creation date are never dropped by age. Without any policy, every tag
+    is kept.
+    """
+
+    def __init__(
+        self, keep_semver: int = 0, keep_recent: int = 0, max_age: float = 0.0
+    ) -> None:
+        self.keep_semver = keep_semver
+        self.keep_recent = keep_recent
+        self.max_age = max_age
+
+    def __bool__(self) -> bool:
+        return bool(self.keep_semver or self.keep_recent or self.max_age)
+
+    @property
+    def needs_created(self) -> bool:
+        """Get whether image creation dates (config blobs) are needed"""
+
+        return bool(self.keep_recent or self.max_age)
+
+    def select(
+        self, image_tags: list[str], created: Optional[dict[str, Optional[str]]] = None
+    ) -> list[str]:
+        """Select Docker Image Tags Method (keeps `image_tags` order)
+
+        `created` maps image tags to their image creation date (ISO 8601).
+        """
+
+        timestamps: dict[str, float] = {
+            image_tag: parse_created(value=(created or {}).get(image_tag))
+            for image_tag in image_tags
+        }
+        kept: set[str] = set(image_tags)
+        if self.keep_semver or self.keep_recent:
+            kept = set()
+        if self.keep_semver:
+            versions: dict[str, SemverKey] = {}
+            for image_tag in image_tags:
+                version: Optional[SemverKey] = parse_semver(
+                    tag=image_tag.rpartition(":")[2]
+                )
+                if version is not None:
+                    versions.update({image_tag: version})
+            kept.update(
+                sorted(versions, key=versions.__getitem__, reverse=True)[
+                    : self.keep_semver
+                ]
+            )
+        if self.keep_recent:
+            kept.update(
+                sorted(
+                    (image_tag for image_tag in image_tags if timestamps[image_tag]),
+                    key=timestamps.__getitem__,
+                    reverse=True,
+                )[: self.keep_recent]
+            )
+        if self.max_age:
+            oldest: float = time() - self.max_age
+            kept = {
+                image_tag
+                for image_tag in kept
+                if not timestamps[image_tag] or timestamps[image_tag] >= oldest
+            }
+        return [image_tag for image_tag in image_tags if image_tag in kept]
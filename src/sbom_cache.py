@@ -0,0 +1,50 @@
+"""SBOM Cache"""
+
+from os import makedirs, path, replace
+from json import dumps, loads
+from typing import Any, Optional
+
+
+class SBOMCache:
+    """SBOM Cache Class (CycloneDX SBOM and image metadata per manifest digest)"""
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        makedirs(name=cache_dir, exist_ok=True)
+
+    def __file(self, digest: str, extension: str) -> str:
+        return path.join(self.cache_dir, f"{digest.replace(':', '_')}.{extension}")
+
+    def sbom_file(self, digest: str) -> str:
+        """Get CycloneDX SBOM File Path Method"""
+
+        return self.__file(digest=digest, extension="cdx.json")
+
+    def metadata_file(self, digest: str) -> str:
+        """Get Image Metadata File Path Method"""
+
+        return self.__file(digest=digest, extension="meta.json")
+
+    def get(
+        self, digest: Optional[str], severity: str, scanners: str
+    ) -> Optional[dict[str, Any]]:
+        """Get Cached Image Metadata Method (None when SBOM is not usable)"""
+
+        if not digest or not path.isfile(self.sbom_file(digest=digest)):
+            return None
+        try:
+            with open(file=self.metadata_file(digest=digest), encoding="UTF-8") as file:
+                metadata: dict[str, Any] = loads(file.read())
+        except (OSError, ValueError):
+            return None
+        if metadata.get("severity") != severity or metadata.get("scanners") != scanners:
+            return None
+        return metadata
+
+    def set(self, digest: str, metadata: dict[str, Any]) -> None:
+        """Store Image Metadata Method (written atomically, after the SBOM)"""
+
+        metadata_file: str = self.metadata_file(digest=digest)
+        with open(file=f"{metadata_file}.tmp", mode="w", encoding="UTF-8") as file:
+            file.write(dumps(metadata))
+        replace(f"{metadata_file}.tmp", metadata_file)
@@ -0,0 +1,77 @@
+"""Scan Cache"""
+
+from sqlite3 import Connection, connect
+from datetime import datetime, timezone
+from json import dumps, loads
+from typing import Any, Optional
+from scanner_options import ScannerOptions
+
+
+class ScanCache:
+    """Scan Cache Class (scan results keyed by manifest digest)"""
+
+    def __init__(
+        self, cache_file: str, db_version: str, options: ScannerOptions
+    ) -> None:
+        self.db_version = db_version
+        self.severity = options.severity
+        self.scanners = options.scanners
+        self.connection: Connection = connect(database=cache_file)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS scan_results ("
+            " digest TEXT NOT NULL,"
+            " db_version TEXT NOT NULL,"
+            " severity TEXT NOT NULL,"
+            " scanners TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " scanned_at TEXT NOT NULL,"
+            " PRIMARY KEY (digest, db_version, severity, scanners))"
+        )
+        self.connection.commit()
+
+    def get(self, digest: Optional[str]) -> Optional[dict[str, Any]]:
+        """Get Cached Scan Result Method"""
+
+        if not digest:
+            return None
+        row: Optional[tuple[str]] = self.connection.execute(
+            "SELECT result FROM scan_results"
+            " WHERE digest = ? AND db_version = ? AND severity = ? AND scanners = ?",
+            (digest, self.db_version, self.severity, self.scanners),
+        ).fetchone()
+        return loads(row[0]) if row else None
+
+    def last_result(self, digest: Optional[str]) -> Optional[dict[str, Any]]:
+        """Get Last Scan Result Of A Digest Method (any database or options)"""
+
+        if not digest:
+            return None
+        row: Optional[tuple[str]] = self.connection.execute(
+            "SELECT result FROM scan_results WHERE digest = ?"
+            " ORDER BY scanned_at DESC LIMIT 1",
+            (digest,),
+        ).fetchone()
+        return loads(row[0]) if row else None
+
+    def set(self, digest: Optional[str], result: dict[str, Any]) -> None:
+        """Store Scan Result Method (failed scans are never cached)"""
+
+        if not digest or not result or result.get("status") not in ["OK", "NOK"]:
+            return
+        self.connection.execute(
+            "INSERT OR REPLACE INTO scan_results VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                digest,
+                self.db_version,
+                self.severity,
+                self.scanners,
+                dumps(result),
+                datetime.now(tz=timezone.utc).isoformat(),
+            ),
+        )
+        self.connection.commit()
+
+    def close(self) -> None:
+        """Close Scan Cache Method"""
+
+        self.connection.close()
@@ -0,0 +1,138 @@
+"""Scan Queue (persistent queue of Docker image tags waiting for a scan)"""
+
+from sqlite3 import Connection, connect
+from datetime import datetime, timezone
+from json import dumps, loads
+from threading import Lock
+from typing import NamedTuple, Optional
+
+# Lower values are dispatched first
+PRIORITY_PUSH: int = 0
+PRIORITY_RESCAN: int = 10
+
+
+class QueuedScan(NamedTuple):
+    """Queued Scan Class"""
+
+    id: int
+    image_tag: str
+    digest: Optional[str]
+    aliases: tuple[str, ...]
+    priority: int
+
+
+class ScanQueue:
+    """Scan Queue Class (SQLite backed, shared by threads)
+
+    A Docker image tag is queued at most once per manifest digest. Taken
+    scans stay in the queue until `done`, so scans interrupted by a crash
+    or a restart are queued again by `requeue_running`.
+    """
+
+    def __init__(self, queue_file: str) -> None:
+        self.lock: Lock = Lock()
+        self.connection: Connection = connect(
+            database=queue_file, check_same_thread=False
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS scan_queue ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " image_tag TEXT NOT NULL,"
+            " digest TEXT NOT NULL DEFAULT '',"
+            " aliases TEXT NOT NULL,"
+            " priority INTEGER NOT NULL,"
+            " running INTEGER NOT NULL DEFAULT 0,"
+            " queued_at TEXT NOT NULL,"
+            " UNIQUE (image_tag, digest))"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS scan_queue_priority"
+            " ON scan_queue (running, priority, id)"
+        )
+        self.connection.commit()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return int(
+                self.connection.execute("SELECT COUNT(*) FROM scan_queue").fetchone()[0]
+            )
+
+    def put(
+        self,
+        image_tag: str,
+        digest: Optional[str] = None,
+        aliases: tuple[str, ...] = (),
+        priority: int = PRIORITY_PUSH,
+    ) -> bool:
+        """Queue Scan Method (returns False when already queued)
+
+        Queuing again an already queued scan only raises its priority.
+        """
+
+        with self.lock:
+            inserted: int = self.connection.execute(
+                "INSERT OR IGNORE INTO scan_queue"
+                " (image_tag, digest, aliases, priority, queued_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    image_tag,
+                    digest or "",
+                    dumps(list(aliases)),
+                    priority,
+                    datetime.now(tz=timezone.utc).isoformat(),
+                ),
+            ).rowcount
+            if not inserted:
+                self.connection.execute(
+                    "UPDATE scan_queue SET priority = MIN(priority, ?)"
+                    " WHERE image_tag = ? AND digest = ?",
+                    (priority, image_tag, digest or ""),
+                )
+            self.connection.commit()
+        return bool(inserted)
+
+    def get(self) -> Optional[QueuedScan]:
+        """Take Next Scan Method (highest priority first, then oldest)"""
+
+        with self.lock:
+            row: Optional[tuple[int, str, str, str, int]] = self.connection.execute(
+                "SELECT id, image_tag, digest, aliases, priority FROM scan_queue"
+                " WHERE running = 0 ORDER BY priority, id LIMIT 1"
+            ).fetchone()
+            if not row:
+                return None
+            self.connection.execute(
+                "UPDATE scan_queue SET running = 1 WHERE id = ?", (row[0],)
+            )
+            self.connection.commit()
+        scan_id, image_tag, digest, aliases, priority = row
+        return QueuedScan(
+            id=scan_id,
+            image_tag=image_tag,
+            digest=digest or None,
+            aliases=tuple(loads(aliases)),
+            priority=priority,
+        )
+
+    def done(self, scan_id: int) -> None:
+        """Remove Finished Scan Method"""
+
+        with self.lock:
+            self.connection.execute("DELETE FROM scan_queue WHERE id = ?", (scan_id,))
+            self.connection.commit()
+
+    def requeue_running(self) -> int:
+        """Queue Again Interrupted Scans Method (returns their number)"""
+
+        with self.lock:
+            requeued: int = self.connection.execute(
+                "UPDATE scan_queue SET running = 0 WHERE running = 1"
+            ).rowcount
+            self.connection.commit()
+        return requeued
+
+    def close(self) -> None:
+        """Close Scan Queue Method"""
+
+        with self.lock:
+            self.connection.close()
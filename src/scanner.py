@@ -1,39 +1,202 @@
 """Scanner"""
 
-from subprocess import run, DEVNULL  # nosemgrep: bandit.B404
-from typing import Any, Optional
+from subprocess import (  # nosemgrep: bandit.B404
+    run,
+    CompletedProcess,
+    Popen,
+    TimeoutExpired,
+    DEVNULL,
+    PIPE,
+)
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from fcntl import LOCK_EX, LOCK_UN, flock
+from os import environ, killpg, makedirs, path
+from signal import SIGKILL
+from tempfile import TemporaryDirectory
+from typing import Any, Iterator, NamedTuple, Optional
 from multiprocessing import Pool
+from queue import SimpleQueue
+from threading import BoundedSemaphore
 from json import loads
-from logger import logger
+from time import perf_counter, sleep, time
+from logger import LOG_QUEUE, logger, use_log_queue
+from metrics import METRICS
+from rate_limiter import RateLimiter, retry_delay
+from sbom_cache import SBOMCache
 from scanner_options import ScannerOptions
+from trivy_report import read_trivy_report
 
+# Trivy error of scans needing a Java DB not downloaded yet
+JAVA_DB_ERROR: bytes = b"Java DB"
 
-def download_database(database: Optional[str] = None):
-    """Download Scanner Database Function"""
+
+def run_process(
+    args: list[str], timeout: Optional[float] = None, **kwargs: Any
+) -> CompletedProcess:
+    """Run Process Function (kills its whole process group on timeout)
+
+    The process runs in a new session, so that on timeout the process and
+    every child it spawned are killed and reaped before `TimeoutExpired`
+    is raised.
+    """
+
+    with Popen(args=args, start_new_session=True, **kwargs) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except TimeoutExpired:
+            killpg(process.pid, SIGKILL)
+            process.communicate()
+            raise
+    return CompletedProcess(
+        args=args, returncode=process.returncode, stdout=stdout, stderr=stderr
+    )
+
+
+def cache_dir_args(cache_dir: Optional[str]) -> list[str]:
+    """Get Trivy Cache Directory Arguments Function"""
+
+    return ["--cache-dir", cache_dir] if cache_dir else []
+
+
+def is_java_database(database: Optional[str]) -> bool:
+    """Check Java Index Database Name Function"""
+
+    return database is not None and database.lower() == "java"
+
+
+def database_dir(
+    database: Optional[str] = None, cache_dir: Optional[str] = None
+) -> str:
+    """Get Scanner Database Directory Function (in the Trivy cache directory)"""
+
+    trivy_cache_dir: str = (
+        cache_dir
+        or environ.get("TRIVY_CACHE_DIR")
+        or path.join(
+            environ.get("XDG_CACHE_HOME") or path.expanduser("~/.cache"), "trivy"
+        )
+    )
+    return path.join(trivy_cache_dir, "java-db" if is_java_database(database) else "db")
+
+
+def database_metadata(
+    database: Optional[str] = None, cache_dir: Optional[str] = None
+) -> dict[str, Any]:
+    """Get Scanner Database Metadata Function (empty when not downloaded)"""
+
+    try:
+        with open(
+            file=path.join(
+                database_dir(database=database, cache_dir=cache_dir), "metadata.json"
+            ),
+            encoding="UTF-8",
+        ) as file:
+            return dict(loads(file.read()))
+    except (OSError, ValueError):
+        return {}
+
+
+def database_is_fresh(
+    database: Optional[str] = None, cache_dir: Optional[str] = None
+) -> bool:
+    """Check Scanner Database Freshness Function (before its 'NextUpdate')"""
+
+    next_update: Optional[str] = database_metadata(
+        database=database, cache_dir=cache_dir
+    ).get("NextUpdate")
+    try:
+        return datetime.fromisoformat(str(next_update)) > datetime.now(tz=timezone.utc)
+    except (TypeError, ValueError):
+        return False
+
+
+@contextmanager
+def database_lock(
+    database: Optional[str] = None, cache_dir: Optional[str] = None
+) -> Iterator[None]:
+    """Lock Scanner Database Context Manager (shared by processes and hosts)"""
+
+    lock_file: str = f"{database_dir(database=database, cache_dir=cache_dir)}.lock"
+    makedirs(name=path.dirname(lock_file), exist_ok=True)
+    with open(file=lock_file, mode="a", encoding="UTF-8") as file:
+        flock(file, LOCK_EX)
+        try:
+            yield
+        finally:
+            flock(file, LOCK_UN)
+
+
+def download_database(
+    database: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    force: bool = False,
+) -> bool:
+    """Download Scanner Database Function
+
+    The download is skipped while the local database is fresh (before its
+    'NextUpdate'), unless `force`. Returns whether it was downloaded.
+    """
 
     db_str: str = "Vulnerability"
     download_db_param: str = "--download-db-only"
 
-    if database is not None and database.lower() == "java":
+    if is_java_database(database):
         db_str = "Java Index"
         download_db_param = "--download-java-db-only"
 
-    logger.info(msg=f"Downloading Trivy {db_str} database...")
-    process = run(
-        args=["trivy", "image", download_db_param],
-        check=False,
-        stdout=DEVNULL,
-        stderr=DEVNULL,
-    )
+    with database_lock(database=database, cache_dir=cache_dir):
+        # Checked under the lock: another process may just have downloaded it
+        if not force and database_is_fresh(database=database, cache_dir=cache_dir):
+            logger.info(msg=f"💡 Trivy {db_str} database is up to date")
+            return False
+
+        logger.info(msg=f"Downloading Trivy {db_str} database...")
+        process = run(
+            args=["trivy", "image", download_db_param, *cache_dir_args(cache_dir)],
+            check=False,
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+        )
 
     if process.returncode != 0:
         raise SystemExit(
             f"Failed to download Trivy {db_str} database"
             f" (exit code: {process.returncode})"
         )
+    return True
 
 
-class Scanner:
+def update_databases(cache_dir: Optional[str] = None) -> None:
+    """Update Scanner Databases Function
+
+    The Java index database is only kept up to date once a scan needed it.
+    """
+
+    download_database(cache_dir=cache_dir)
+    if database_metadata(database="java", cache_dir=cache_dir):
+        download_database(database="java", cache_dir=cache_dir)
+
+
+def get_database_version(cache_dir: Optional[str] = None) -> Optional[str]:
+    """Get Scanner Vulnerability Database Version Function"""
+
+    process = run(
+        args=["trivy", "version", "--format", "json", *cache_dir_args(cache_dir)],
+        capture_output=True,
+        check=False,
+    )
+
+    if process.returncode != 0:
+        return None
+
+    database: dict[str, Any] = dict(loads(process.stdout)).get("VulnerabilityDB", {})
+    if not database.get("UpdatedAt"):
+        return None
+    return f"{database.get('Version')}:{database.get('UpdatedAt')}"
+
+
+class Scanner:  # pylint: disable=too-many-instance-attributes
     """Scanner Class"""
 
     docker_registry: str
@@ -41,6 +204,15 @@ class Scanner:
     severity: str
     scanners: str
     processes: int
+    server_url: Optional[str]
+    sbom_cache: Optional[SBOMCache]
+    rate_limiter: Optional[RateLimiter]
+    credentials: dict[str, str]
+    cache_dir: Optional[str]
+    timeout: float
+    retries: int
+    stderr: bytes
+    timings: dict[str, float]
 
     def __init__(
         self, docker_registry: str, image_tags: list[str], options: ScannerOptions
@@ -50,6 +222,19 @@ class Scanner:
         self.severity = options.severity
         self.processes = options.processes
         self.scanners = options.scanners
+        self.server_url = options.server_url
+        self.rate_limiter = options.rate_limiter
+        self.credentials = options.registry_credentials
+        self.cache_dir = options.cache_dir
+        self.timeout = options.scan_timeout
+        self.retries = options.scan_retries
+        self.stderr = b""
+        self.timings = {}
+        self.sbom_cache = (
+            SBOMCache(cache_dir=options.sbom_cache_dir)
+            if options.sbom_cache_dir
+            else None
+        )
 
     def __parse_results(
         self, results: list[dict[str, Any]]
@@ -59,24 +244,23 @@ class Scanner:
         summary: dict[str, int] = {severity: 0 for severity in self.severity.split(",")}
 
         for result in results:
+            findings: Optional[list[list[str]]] = result.get("Findings")
+            if findings is None:
+                continue
             vulns: list[str] = []
             result_class: str = result.get("Class")
             result_target: str = result.get("Target")
             if result_class == "secret":
-                for vuln in result.get("Secrets"):
-                    sev: str = dict(vuln).get("Severity")
-                    rule_id: str = dict(vuln).get("RuleID")
+                for rule_id, sev in findings:
                     vulns.append(f"{rule_id} ({sev})")
                     summary.update({sev: summary.get(sev) + 1})
             else:
-                if "Vulnerabilities" not in result:
-                    continue
-                for vuln in result.get("Vulnerabilities"):
-                    sev: str = dict(vuln).get("Severity")
-                    vuln_id: str = dict(vuln).get("VulnerabilityID")
-
-                    if f"{vuln_id} ({sev})" not in vulns:
-                        vulns.append(f"{vuln_id} ({sev})")
+                seen_vulns: set[str] = set()
+                for vuln_id, sev in findings:
+                    vuln: str = f"{vuln_id} ({sev})"
+                    if vuln not in seen_vulns:
+                        seen_vulns.add(vuln)
+                        vulns.append(vuln)
                         summary.update({sev: summary.get(sev) + 1})
 
             parsed_results.update({f"{result_class} ({result_target})": sorted(vulns)})
@@ -84,40 +268,232 @@ class Scanner:
 
         return parsed_results
 
-    def run_scan(self, image_tag: str) -> dict[str, Any]:
-        """Run Scanner Method"""
-        status: str = "OK"
-        vulnerabilities: list[Any] = []
-        docker_image_tag: str = f"{self.docker_registry}/{image_tag}"
+    def __trivy_args(self, command: str, *args: str) -> list[str]:
+        # Databases are updated once, before scans start
         process_args: list[str] = [
             "trivy",
-            "image",
+            command,
+            *cache_dir_args(self.cache_dir),
+            "--skip-db-update",
+            "--skip-java-db-update",
+            *args,
+        ]
+        if self.server_url:
+            process_args[2:2] = ["--server", self.server_url]
+        return process_args
+
+    def __run_trivy(
+        self, command: str, *args: str
+    ) -> tuple[int, dict[str, Any], list[dict[str, Any]]]:
+        """Run Trivy private method (JSON report read from a temporary file)"""
+        with TemporaryDirectory(prefix="trivy-") as tmp_dir:
+            output_file: str = path.join(tmp_dir, "report.json")
+            start: float = perf_counter()
+            try:
+                process = run_process(
+                    args=self.__trivy_args(
+                        command, "--format", "json", "--output", output_file, *args
+                    ),
+                    timeout=self.timeout or None,
+                    stdout=DEVNULL,
+                    stderr=PIPE,
+                    env={**environ, **self.credentials} if self.credentials else None,
+                )
+            except TimeoutExpired:
+                self.timings.update(
+                    {"trivy": perf_counter() - start, "exit_code": -SIGKILL}
+                )
+                raise
+            self.timings.update(
+                {"trivy": perf_counter() - start, "exit_code": process.returncode}
+            )
+
+            if process.returncode not in [111, 0]:
+                self.stderr = process.stderr[-4096:]
+                logger.debug(msg=self.stderr.decode(errors="replace"))
+                return process.returncode, {}, []
+
+            start = perf_counter()
+            with open(file=output_file, encoding="UTF-8") as file:
+                metadata, results = read_trivy_report(file=file)
+            self.timings.update({"parse": perf_counter() - start})
+        return process.returncode, metadata, results
+
+    def __run_sbom_scan(
+        self, docker_image_tag: str, digest: Optional[str]
+    ) -> Optional[dict[str, Any]]:
+        """Scan cached SBOM private method (None when no SBOM is cached)"""
+        metadata: Optional[dict[str, Any]] = (
+            self.sbom_cache.get(
+                digest=digest, severity=self.severity, scanners=self.scanners
+            )
+            if self.sbom_cache
+            else None
+        )
+        if metadata is None:
+            return None
+
+        sbom_file: str = self.sbom_cache.sbom_file(digest=digest)
+
+        logger.debug(msg=f"💤 Scanning cached SBOM of '{docker_image_tag}'...")
+        returncode, _, sbom_results = self.__run_trivy(
+            "sbom",
             "--ignore-unfixed",
-            "--insecure",
-            "--format",
-            "json",
             "--severity",
             self.severity,
             "--exit-code",
             "111",
-            "--scanners",
-            self.scanners,
+            sbom_file,
+        )
+
+        if returncode not in [111, 0]:
+            # Fall back to a full scan of the image
+            logger.debug(msg=f"💡 Cached SBOM scan of '{docker_image_tag}' failed")
+            return None
+
+        for result in sbom_results:
+            result.update(
+                {
+                    "Target": str(result.get("Target")).replace(
+                        sbom_file, docker_image_tag, 1
+                    )
+                }
+            )
+        image_results: list[dict[str, Any]] = metadata.get("secrets") + sbom_results
+        nok: bool = returncode == 111 or bool(metadata.get("secrets"))
+
+        return {
+            "status": "NOK" if nok else "OK",
+            "created": metadata.get("created"),
+            "id": metadata.get("id"),
+            "labels": metadata.get("labels"),
+            "vulnerabilities": (
+                self.__parse_results(results=image_results) if nok else []
+            ),
+        }
+
+    def __acquire_pull_token(self) -> None:
+        """Wait for a registry rate limiter token private method"""
+        if self.rate_limiter:
+            # Trivy pulls the image from the registry: one token per pull
+            self.timings.update(
+                {
+                    "rate_limit": self.timings.get("rate_limit", 0.0)
+                    + self.rate_limiter.acquire()
+                }
+            )
+
+    def __generate_sbom(
+        self, docker_image_tag: str, digest: str, metadata: dict[str, Any]
+    ) -> None:
+        """Generate and cache CycloneDX SBOM private method"""
+        process_args: list[str] = self.__trivy_args(
+            "image",
+            "--insecure",
+            "--format",
+            "cyclonedx",
+            "--output",
+            self.sbom_cache.sbom_file(digest=digest),
             docker_image_tag,
-        ]
+        )
+
+        self.__acquire_pull_token()
+        logger.debug(msg=f"💤 Generating SBOM of '{docker_image_tag}'...")
+        start: float = perf_counter()
+        try:
+            process = run_process(
+                args=process_args,
+                timeout=self.timeout or None,
+                stdout=DEVNULL,
+                stderr=DEVNULL,
+                env={**environ, **self.credentials} if self.credentials else None,
+            )
+        except TimeoutExpired:
+            logger.debug(msg=f"⌛ SBOM generation of '{docker_image_tag}' timed out")
+            return
+        finally:
+            self.timings.update({"sbom": perf_counter() - start})
+
+        if process.returncode == 0:
+            self.sbom_cache.set(digest=digest, metadata=metadata)
+
+    def __download_java_database(self) -> bool:
+        """Download Java DB private method (once for every scan worker)"""
+        try:
+            download_database(database="java", cache_dir=self.cache_dir)
+        except SystemExit as exc:
+            logger.error(msg=f"🔥 {exc}")
+            return False
+        return True
+
+    def __run_image_scan(
+        self, docker_image_tag: str
+    ) -> tuple[int, dict[str, Any], list[dict[str, Any]]]:
+        """Run Trivy image scan private method (failed scans are retried)"""
+        attempt: int = 0
+        java_db_downloaded: bool = False
+        while True:
+            self.__acquire_pull_token()
+            logger.debug(msg=f"💤 Scanning Docker image '{docker_image_tag}'...")
+            returncode, image_metadata, image_results = self.__run_trivy(
+                "image",
+                "--ignore-unfixed",
+                "--insecure",
+                "--severity",
+                self.severity,
+                "--exit-code",
+                "111",
+                "--scanners",
+                self.scanners,
+                docker_image_tag,
+            )
+            if returncode in [111, 0]:
+                return returncode, image_metadata, image_results
+            if JAVA_DB_ERROR in self.stderr and not java_db_downloaded:
+                # Java artifacts found: the Java DB is only fetched now
+                java_db_downloaded = self.__download_java_database()
+                if java_db_downloaded:
+                    continue
+            if attempt >= self.retries:
+                return returncode, image_metadata, image_results
+            delay: float = retry_delay(attempt=attempt, base=2.0)
+            logger.warning(
+                msg=f"🐢 Scan of '{docker_image_tag}' failed (exit code: {returncode}),"
+                f" retrying in {delay:.1f}s ({attempt + 1}/{self.retries})"
+            )
+            sleep(delay)
+            attempt += 1
+            self.timings.update({"retries": attempt})
+
+    def run_scan(self, image_tag: str, digest: Optional[str] = None) -> dict[str, Any]:
+        """Run Scanner Method
+
+        Scans killed after the scan timeout get the 'TIMEOUT' status, and
+        scans still failing after their retries the 'FAILED' status.
+        """
+        status: str = "OK"
+        vulnerabilities: list[Any] = []
+        docker_image_tag: str = f"{self.docker_registry}/{image_tag}"
 
-        logger.debug(msg=f"💤 Scanning Docker image '{docker_image_tag}'...")
-        process = run(args=process_args, capture_output=True, check=False)
+        try:
+            sbom_result: Optional[dict[str, Any]] = self.__run_sbom_scan(
+                docker_image_tag=docker_image_tag, digest=digest
+            )
+            if sbom_result is not None:
+                return {docker_image_tag: sbom_result}
 
-        print(process.returncode, process.stdout)
+            returncode, image_metadata, image_results = self.__run_image_scan(
+                docker_image_tag=docker_image_tag
+            )
+        except TimeoutExpired:
+            logger.warning(
+                msg=f"⌛ Scan of '{docker_image_tag}' killed after {self.timeout:g}s"
+            )
+            return {docker_image_tag: {"status": "TIMEOUT", "timeout": self.timeout}}
 
-        if process.returncode not in [111, 0]:
-            return {docker_image_tag: {}}
+        if returncode not in [111, 0]:
+            return {docker_image_tag: {"status": "FAILED", "exit_code": returncode}}
 
-        proc_stdout: dict[str, Any] = dict(loads(process.stdout))
-        # .Results
-        image_results: list[dict[str, Any]] = proc_stdout.get("Results")
-        # .Metadata
-        image_metadata: dict[str, Any] = proc_stdout.get("Metadata")
         # .Metadata.ImageID
         image_id: str = image_metadata.get("ImageID")
         # .Metadata.ImageConfig
@@ -127,10 +503,28 @@ class Scanner:
         # .Metadata.ImageConfig.config.Labels
         image_labels: dict[str, str] = dict(image_config.get("config")).get("Labels")
 
-        if process.returncode == 111:
+        if returncode == 111:
             status = "NOK"
             vulnerabilities = self.__parse_results(results=image_results)
 
+        if self.sbom_cache and digest:
+            self.__generate_sbom(
+                docker_image_tag=docker_image_tag,
+                digest=digest,
+                metadata={
+                    "severity": self.severity,
+                    "scanners": self.scanners,
+                    "created": image_created,
+                    "id": image_id,
+                    "labels": image_labels,
+                    "secrets": [
+                        result
+                        for result in image_results or []
+                        if result.get("Class") == "secret"
+                    ],
+                },
+            )
+
         return {
             docker_image_tag: {
                 "status": status,
@@ -143,5 +537,177 @@ class Scanner:
 
     def scan(self) -> list[dict[str, dict[str, Any]]]:  # pragma: no cover
         """Scan Method (Multiprocessing)"""
-        with Pool(processes=self.processes) as pool:
-            return pool.map(func=self.run_scan, iterable=self.image_tags)
+        options: ScannerOptions = ScannerOptions(
+            severity=self.severity,
+            scanners=self.scanners,
+            processes=self.processes,
+            server_url=self.server_url,
+            sbom_cache_dir=self.sbom_cache.cache_dir if self.sbom_cache else None,
+            cache_dir=self.cache_dir,
+            scan_timeout=self.timeout,
+            scan_retries=self.retries,
+        )
+        with ScanPool(options=options) as scan_pool:
+            for image_tag in self.image_tags:
+                scan_pool.submit(
+                    task=ScanTask(
+                        docker_registry=self.docker_registry, image_tag=image_tag
+                    )
+                )
+            return [results for _, results in scan_pool.results(wait=True)]
+
+
+class ScanTask(NamedTuple):
+    """Scan Task Class (small picklable unit of work sent to pool workers)"""
+
+    docker_registry: str
+    image_tag: str
+    digest: Optional[str] = None
+    aliases: tuple[str, ...] = ()
+    submitted_at: float = 0.0
+
+    @property
+    def docker_image_tag(self) -> str:
+        """Get Docker image tag including registry"""
+
+        return f"{self.docker_registry}/{self.image_tag}"
+
+    @property
+    def image(self) -> str:
+        """Get Docker image name ('image:tag' or 'image@digest' reference)"""
+
+        if "@" in self.image_tag:
+            return self.image_tag.partition("@")[0]
+        return self.image_tag.rpartition(":")[0]
+
+
+WORKER_OPTIONS: ScannerOptions = ScannerOptions()
+
+
+def init_worker(options: ScannerOptions, log_queue: Any = None) -> None:
+    """Initialize Pool Worker Function (options are sent once per worker)"""
+
+    global WORKER_OPTIONS  # pylint: disable=global-statement
+    WORKER_OPTIONS = options
+    if log_queue is not None:
+        use_log_queue(log_queue=log_queue)
+
+
+def run_scan_task(
+    task: ScanTask,
+) -> tuple[ScanTask, dict[str, Any], dict[str, float]]:
+    """Run Scan Task Function (executed by pool workers)
+
+    Returns the task, its results and its timings (queue wait, Trivy run,
+    report parsing and SBOM generation durations plus Trivy exit code).
+    """
+
+    started_at: float = time()
+    scanner: Scanner = Scanner(
+        docker_registry=task.docker_registry,
+        image_tags=[task.image_tag],
+        options=WORKER_OPTIONS.for_registry(docker_registry=task.docker_registry),
+    )
+    results: dict[str, Any] = scanner.run_scan(
+        image_tag=task.image_tag, digest=task.digest
+    )
+    timings: dict[str, float] = {
+        "queue": max(started_at - task.submitted_at, 0.0),
+        "scan": time() - started_at,
+        **scanner.timings,
+    }
+    return task, results, timings
+
+
+class ScanPool:
+    """Scan Pool Class (one long-lived worker pool fed through a shared queue)
+
+    At most `max_pending` tasks are queued or running at once, so `submit`
+    blocks (instead of buffering the whole registry) until a worker frees
+    a slot. Finished results are collected with `results`.
+    """
+
+    def __init__(self, options: ScannerOptions, max_pending: int = 0) -> None:
+        self.processes: int = options.processes
+        self.pending: int = 0
+        self.max_pending: int = max_pending if max_pending > 0 else 2 * self.processes
+        self.slots: BoundedSemaphore = BoundedSemaphore(value=self.max_pending)
+        self.finished: SimpleQueue[tuple[ScanTask, dict[str, Any]]] = SimpleQueue()
+        self.pool = Pool(  # pylint: disable=consider-using-with
+            processes=self.processes,
+            initializer=init_worker,
+            initargs=(options, LOG_QUEUE),
+        )
+
+    def __enter__(self) -> "ScanPool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __on_success(
+        self, result: tuple[ScanTask, dict[str, Any], dict[str, float]]
+    ) -> None:
+        task, results, timings = result
+        for timing in ["queue", "rate_limit", "scan", "trivy", "parse", "sbom"]:
+            if timing in timings:
+                METRICS.observe(f"scan_{timing}_seconds", timings.get(timing))
+        if "retries" in timings:
+            METRICS.inc("scan_retries", timings.get("retries"))
+        if "exit_code" in timings:
+            METRICS.inc("trivy_exit_codes", code=str(timings.get("exit_code")))
+        # One series per image repository (not per tag): bounded by the catalog
+        METRICS.observe(
+            "image_scan_seconds", timings.get("scan", 0.0), image=task.image
+        )
+        self.finished.put((task, results))
+        self.slots.release()
+
+    @property
+    def available(self) -> int:
+        """Get number of tasks that can be submitted without blocking"""
+
+        return self.max_pending - self.pending
+
+    def submit(self, task: ScanTask) -> None:
+        """Submit Scan Task Method (blocks while every slot is busy)"""
+
+        def on_error(exc: BaseException) -> None:
+            logger.error(msg=f"🔥 Scan of '{task.docker_image_tag}' crashed: {exc}")
+            self.__on_success(
+                result=(
+                    task,
+                    {task.docker_image_tag: {"status": "FAILED", "error": str(exc)}},
+                    {},
+                )
+            )
+
+        self.slots.acquire()  # pylint: disable=consider-using-with
+        self.pending += 1
+        task = task._replace(submitted_at=time())
+        self.pool.apply_async(
+            func=run_scan_task,
+            args=(task,),
+            callback=self.__on_success,
+            error_callback=on_error,
+        )
+
+    def results(
+        self, wait: bool = False
+    ) -> Iterator[tuple[ScanTask, dict[str, dict[str, Any]]]]:
+        """Get Finished Scan Results Method
+
+        Without `wait`, only already finished results are yielded. With
+        `wait`, blocks until every submitted task is done.
+        """
+
+        while self.pending and (wait or not self.finished.empty()):
+            task, results = self.finished.get()
+            self.pending -= 1
+            yield task, results
+
+    def close(self) -> None:
+        """Close Scan Pool Method"""
+
+        self.pool.close()
+        self.pool.join()
@@ -1,24 +1,53 @@
 """Scanner Options"""
 
-from typing import Optional
+from copy import copy
+from typing import NamedTuple, Optional
+from rate_limiter import RateLimiter
 
 
-class ScannerOptions:
+class RegistryAccess(NamedTuple):
+    """Registry Access (rate limiter and credentials of a Docker registry)"""
+
+    rate_limiter: Optional[RateLimiter] = None
+    username: Optional[str] = None
+    password: Optional[str] = None
+
+
+class ScannerOptions:  # pylint: disable=too-many-instance-attributes
     """Scanner Options Class"""
 
     severities: list[str] = ["UNKNOWN", "LOW", "MEDIUM", "HIGH", "CRITICAL"]
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         severity: str = "UNKNOWN,LOW,MEDIUM,HIGH,CRITICAL",
         min_severity: Optional[str] = None,
         scanners: str = "vuln,secret",
         processes: int = 4,
+        *,
+        server_url: Optional[str] = None,
+        sbom_cache_dir: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        registry_username: Optional[str] = None,
+        registry_password: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        scan_timeout: float = 0.0,
+        scan_retries: int = 0,
+        registries: Optional[dict[str, RegistryAccess]] = None,
     ) -> None:
         self._severity = severity
         self._min_severity = min_severity
         self._scanners = scanners
         self._processes = processes
+        self._server_url = server_url
+        self._sbom_cache_dir = sbom_cache_dir
+        self._rate_limiter = rate_limiter
+        self._registry_username = registry_username
+        self._registry_password = registry_password
+        self._cache_dir = cache_dir
+        self._scan_timeout = scan_timeout
+        self._scan_retries = scan_retries
+        self._registries: dict[str, RegistryAccess] = registries or {}
 
     @property
     def scanners(self) -> str:
@@ -32,6 +61,70 @@ class ScannerOptions:
 
         return self._processes
 
+    @property
+    def server_url(self) -> Optional[str]:
+        """Get Trivy server URL (client/server mode)"""
+
+        return self._server_url
+
+    @property
+    def sbom_cache_dir(self) -> Optional[str]:
+        """Get SBOM cache directory"""
+
+        return self._sbom_cache_dir
+
+    @property
+    def cache_dir(self) -> Optional[str]:
+        """Get Trivy cache directory (shared by every scan)"""
+
+        return self._cache_dir
+
+    @property
+    def scan_timeout(self) -> float:
+        """Get scan timeout in seconds (0 for none)"""
+
+        return self._scan_timeout
+
+    @property
+    def scan_retries(self) -> int:
+        """Get number of retries of failed scans"""
+
+        return self._scan_retries
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """Get registry rate limiter (shared with scan workers)"""
+
+        return self._rate_limiter
+
+    @property
+    def registry_credentials(self) -> dict[str, str]:
+        """Get registry credentials as Trivy environment variables"""
+
+        if self._registry_username is None:
+            return {}
+        return {
+            "TRIVY_USERNAME": self._registry_username,
+            "TRIVY_PASSWORD": self._registry_password or "",
+        }
+
+    def for_registry(self, docker_registry: str) -> "ScannerOptions":
+        """Get Options Of A Docker Registry Method ('host:port')
+
+        Registries given in `registries` get their own rate limiter and
+        credentials, other ones the options' ones.
+        """
+
+        access: Optional[RegistryAccess] = self._registries.get(docker_registry)
+        if access is None:
+            return self
+        options: ScannerOptions = copy(self)
+        # pylint: disable=protected-access
+        options._rate_limiter = access.rate_limiter
+        options._registry_username = access.username
+        options._registry_password = access.password
+        return options
+
     @property
     def severity(self) -> str:
         """Get severity"""
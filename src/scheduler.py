@@ -0,0 +1,150 @@
+"""Scan Scheduler (priority ordered scan tasks within an optional time budget)"""
+
+from datetime import datetime
+from heapq import heappop, heappush
+from re import Pattern, compile as re_compile, findall, fullmatch
+from time import monotonic
+from typing import Any, Optional
+from scan_cache import ScanCache
+from scanner import ScanTask
+
+DURATION_UNITS: dict[str, int] = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Priority, push sequence and scan task
+Entry = tuple[tuple[int, int, float], int, ScanTask]
+
+
+def parse_duration(value: Optional[str]) -> float:
+    """Parse Duration Function ('90', '90s', '15m', '2h', '1d' or '1h30m')"""
+
+    if not value:
+        return 0.0
+    if not fullmatch(pattern=r"(\d+(\.\d+)?[smhd]?)+", string=value.strip()):
+        raise ValueError(f"Invalid duration: '{value}'")
+    return sum(
+        float(amount) * DURATION_UNITS.get(unit or "s", 1)
+        for amount, unit in findall(pattern=r"(\d+(?:\.\d+)?)([smhd]?)", string=value)
+    )
+
+
+def parse_created(value: Optional[str]) -> float:
+    """Parse Image Creation Date Function (POSIX timestamp, 0 when unknown)"""
+
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ScanScheduler:  # pylint: disable=too-many-instance-attributes
+    """Scan Scheduler Class
+
+    Scan tasks are taken by priority: tags matching `critical_tags` first,
+    then digests never scanned before (unknown to the scan cache), then
+    the most recently created images (creation date of their last scan).
+    Once `time_budget` seconds are spent, no more task is taken.
+
+    Tasks pushed with a `base_layer` are taken back to back with the other
+    tasks sharing it (unless a task of a higher priority class waits), so
+    the shared layers are still in the scan cache when they are scanned.
+    """
+
+    def __init__(
+        self,
+        critical_tags: Optional[str] = None,
+        time_budget: float = 0.0,
+        cache: Optional[ScanCache] = None,
+    ) -> None:
+        self.critical_tags: Optional[Pattern[str]] = (
+            re_compile(critical_tags) if critical_tags else None
+        )
+        self.time_budget = time_budget
+        self.cache = cache
+        self.deadline: Optional[float] = (
+            monotonic() + time_budget if time_budget > 0 else None
+        )
+        self.heap: list[Entry] = []
+        self.layer_heaps: dict[str, list[Entry]] = {}
+        self.base_layers: dict[int, str] = {}
+        self.taken: set[int] = set()
+        self.last_base_layer: Optional[str] = None
+        self.sequence: int = 0
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __clean(self, heap: list[Entry]) -> None:
+        # Entries are in the main heap and in one layer heap: entries taken
+        # from the other heap are dropped lazily
+        while heap and heap[0][1] in self.taken:
+            heappop(heap)
+
+    @property
+    def exhausted(self) -> bool:
+        """Get whether the time budget is spent"""
+
+        return self.deadline is not None and monotonic() >= self.deadline
+
+    def priority(self, task: ScanTask) -> tuple[int, int, float]:
+        """Get Scan Task Priority Method (lower values are taken first)"""
+
+        critical: bool = self.critical_tags is not None and any(
+            self.critical_tags.search(image_tag.rpartition(":")[2])
+            for image_tag in (task.image_tag, *task.aliases)
+        )
+        previous_result: Optional[dict[str, Any]] = (
+            self.cache.last_result(digest=task.digest) if self.cache else None
+        )
+        return (
+            0 if critical else 1,
+            0 if previous_result is None else 1,
+            -parse_created(value=(previous_result or {}).get("created")),
+        )
+
+    def push(self, task: ScanTask, base_layer: Optional[str] = None) -> None:
+        """Schedule Scan Task Method"""
+
+        entry: Entry = (self.priority(task=task), self.sequence, task)
+        heappush(self.heap, entry)
+        if base_layer:
+            heappush(self.layer_heaps.setdefault(base_layer, []), entry)
+            self.base_layers.update({self.sequence: base_layer})
+        self.sequence += 1
+        self.size += 1
+
+    def pop(self) -> Optional[ScanTask]:
+        """Take Next Scan Task Method (None when empty or out of time)"""
+
+        if not self.size or self.exhausted:
+            return None
+        siblings: list[Entry] = self.layer_heaps.get(self.last_base_layer or "", [])
+        self.__clean(heap=self.heap)
+        self.__clean(heap=siblings)
+        entry: Entry = (
+            heappop(siblings)
+            if siblings and siblings[0][0][:2] <= self.heap[0][0][:2]
+            else heappop(self.heap)
+        )
+        if not siblings:
+            self.layer_heaps.pop(self.last_base_layer or "", None)
+        self.taken.add(entry[1])
+        self.size -= 1
+        self.last_base_layer = self.base_layers.pop(entry[1], None)
+        return entry[2]
+
+    def drain(self) -> list[ScanTask]:
+        """Take Every Remaining Scan Task Method (e.g. skipped tasks)"""
+
+        tasks: list[ScanTask] = [
+            task
+            for _, sequence, task in sorted(self.heap)
+            if sequence not in self.taken
+        ]
+        self.heap.clear()
+        self.layer_heaps.clear()
+        self.base_layers.clear()
+        self.size = 0
+        return tasks
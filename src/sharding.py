@@ -0,0 +1,31 @@
+"""Sharding (stable assignment of Docker images to sweep nodes)"""
+
+from hashlib import sha256
+from typing import Iterable, Iterator
+
+
+def shard_of(key: str, shard_count: int) -> int:
+    """Get Shard Index Of A Key Function
+
+    Uses a cryptographic hash rather than `hash()` (salted per process), so
+    every node computes the same assignment.
+    """
+
+    return int.from_bytes(sha256(key.encode()).digest()[:8], "big") % shard_count
+
+
+def iter_shard(
+    keys: Iterable[str], shard_index: int, shard_count: int
+) -> Iterator[str]:
+    """Iterate Keys Of One Shard Function"""
+
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(
+            f"Shard index {shard_index} out of range for {shard_count} shards"
+        )
+    for key in keys:
+        if (
+            shard_count == 1
+            or shard_of(key=key, shard_count=shard_count) == shard_index
+        ):
+            yield key
@@ -0,0 +1,366 @@
+"""Docker Registry Sweep"""
+
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.client import HTTPException
+from time import perf_counter
+from typing import Any, Iterable, Iterator, Optional
+from docker_registry_client import DockerRegistryClient
+from deduplication import group_tags_by_digest, fan_out_results
+from layer_cache import LayerCache
+from report import ReportWriter, StatusLog
+from result_model import CompactResults
+from results_store import ResultsStore
+from retention import TagRetention
+from scan_cache import ScanCache
+from scheduler import ScanScheduler
+from scanner import ScanPool, ScanTask
+from scanner_options import ScannerOptions
+from metrics import METRICS, Progress
+from logger import logger
+
+
+class Sweep:  # pylint: disable=too-many-instance-attributes
+    """Sweep Class (scans tags of every image through one shared pool)
+
+    Image tags and manifest digests are fetched `registry_concurrency`
+    images ahead in threads, so scan workers never wait on the registry.
+    Scan tasks are dispatched in `scheduler` priority order; once its time
+    budget is spent, running scans are finished and the remaining tags are
+    reported as skipped. Only the tags kept by `retention` are scanned.
+    With a shared `layer_cache`, image layers are read from manifests (in
+    the same threads) so that tasks sharing a base layer are dispatched
+    back to back.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        client: DockerRegistryClient,
+        options: ScannerOptions,
+        *,
+        cache: Optional[ScanCache] = None,
+        tags_filter: str = r".*",
+        page_size: int = 100,
+        report_writer: Optional[ReportWriter] = None,
+        skip_tags: Optional[set[str]] = None,
+        progress_interval: float = 60.0,
+        registry_concurrency: int = 4,
+        scheduler: Optional[ScanScheduler] = None,
+        retention: Optional[TagRetention] = None,
+        layer_cache: Optional[LayerCache] = None,
+        results_store: Optional[ResultsStore] = None,
+        status_log: Optional[StatusLog] = None,
+        scan_results: Optional[CompactResults] = None,
+        metric_labels: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.client = client
+        self.options = options
+        self.cache = cache
+        self.tags_filter = tags_filter
+        self.page_size = page_size
+        self.registry_concurrency = registry_concurrency
+        self.scheduler: ScanScheduler = (
+            ScanScheduler(cache=cache) if scheduler is None else scheduler
+        )
+        self.retention: TagRetention = (
+            TagRetention() if retention is None else retention
+        )
+        self.layer_cache = layer_cache
+        self.task_layers: dict[str, list[tuple[str, int]]] = {}
+        self.report_writer = report_writer
+        self.results_store = results_store
+        self.status_log: StatusLog = StatusLog() if status_log is None else status_log
+        self.skip_tags: set[str] = set() if skip_tags is None else skip_tags
+        self.docker_registry: str = f"{client.registry_host}:{client.registry_port}"
+        self.scan_results: CompactResults = (
+            CompactResults() if scan_results is None else scan_results
+        )
+        self.metric_labels: dict[str, str] = metric_labels or {}
+        self.total_images: int = 0
+        self.total_tags: int = 0
+        self.total_tags_scanned: int = 0
+        self.total_tags_skipped: int = 0
+        self.progress: Progress = Progress(interval=progress_interval)
+
+    def add_results(self, results: dict[str, Any]) -> None:
+        """Add Scan Results Method (report, display, metrics and progress)"""
+
+        with METRICS.time("phase_duration_seconds", phase="report"):
+            if self.report_writer:
+                self.report_writer.write(results=results)
+            else:
+                self.scan_results.update(results)
+            if self.results_store:
+                self.results_store.write(results=results)
+        self.status_log.log(results=results)
+        for result in results.values():
+            status: str = dict(result).get("status", "FAILED")
+            METRICS.inc("tags", status=status)
+            if status == "SKIPPED":
+                self.total_tags_skipped += 1
+            else:
+                self.total_tags_scanned += 1
+        self.progress.update(done=self.total_tags_scanned, discovered=self.total_tags)
+
+    def on_scan_results(self, task: ScanTask, results: dict[str, Any]) -> None:
+        """Handle Finished Scan Method (caches and fans out to aliases)"""
+
+        if self.cache:
+            self.cache.set(
+                digest=task.digest, result=results.get(task.docker_image_tag)
+            )
+        self.add_results(
+            results=fan_out_results(
+                results=results,
+                docker_registry=self.docker_registry,
+                groups={task.image_tag: list(task.aliases)},
+                digests=dict.fromkeys(task.aliases, task.digest),
+            )
+        )
+
+    def list_image_tags(self, image: str) -> list[str]:
+        """List Image Tags To Scan Method (filtered, retained, not yet scanned)
+
+        Registry errors only affect their image: it is skipped when its tags
+        can't be listed or dated for retention.
+        """
+
+        try:
+            with METRICS.time("phase_duration_seconds", phase="tags"):
+                image_tags: list[str] = list(
+                    self.client.iter_image_tags(
+                        image=image, page_size=self.page_size, pattern=self.tags_filter
+                    )
+                )
+        except (HTTPException, OSError) as exc:
+            METRICS.inc("registry_errors", phase="tags")
+            logger.error(msg=f"🔥 Docker tags of '{image}' not listed: {exc}")
+            return []
+
+        if not image_tags:
+            logger.warning(msg=f"🤡 No Docker tags found for '{image}'")
+            return []
+
+        if self.retention:
+            try:
+                with METRICS.time("phase_duration_seconds", phase="retention"):
+                    retained_tags: list[str] = self.retention.select(
+                        image_tags=image_tags,
+                        created=(
+                            self.client.get_image_created_dates(image_tags=image_tags)
+                            if self.retention.needs_created
+                            else None
+                        ),
+                    )
+            except (HTTPException, OSError) as exc:
+                METRICS.inc("registry_errors", phase="retention")
+                logger.error(msg=f"🔥 Docker tags of '{image}' not retained: {exc}")
+                return []
+            METRICS.inc("tags_not_retained", len(image_tags) - len(retained_tags))
+            logger.info(
+                msg=f"💡 Docker tags of '{image}' retained:"
+                f" {len(retained_tags)}/{len(image_tags)}"
+            )
+            image_tags = retained_tags
+
+        if self.skip_tags:
+            image_tags = [
+                image_tag
+                for image_tag in image_tags
+                if f"{self.docker_registry}/{image_tag}" not in self.skip_tags
+            ]
+            if not image_tags:
+                logger.info(msg=f"💡 Docker tags of '{image}' already scanned")
+                return []
+
+        logger.info(msg=f"💡 Number of Docker tags for '{image}': {len(image_tags)}")
+        return image_tags
+
+    def fetch_image_digests(self, image: str) -> dict[str, Optional[str]]:
+        """Fetch Image Tags Manifest Digests Method (safe to run in a thread)
+
+        When digests can't be read, tags are scanned without them (one by
+        one, failed if their manifest is gone).
+        """
+
+        image_tags: list[str] = self.list_image_tags(image=image)
+        if not image_tags or self.scheduler.exhausted:
+            # Out of time: tags are only listed to be reported as skipped
+            return dict.fromkeys(image_tags)
+        try:
+            with METRICS.time("phase_duration_seconds", phase="digests"):
+                return self.client.get_image_digests(image_tags=image_tags)
+        except (HTTPException, OSError) as exc:
+            METRICS.inc("registry_errors", phase="digests")
+            logger.error(msg=f"🔥 Docker digests of '{image}' not read: {exc}")
+            return dict.fromkeys(image_tags)
+
+    def fetch_image_layers(self, digests: dict[str, Optional[str]]) -> None:
+        """Fetch Image Layers Method (of every manifest, safe to run in a thread)
+
+        Without layers (e.g. on registry errors), tasks are dispatched with
+        no base layer.
+        """
+
+        try:
+            with METRICS.time("phase_duration_seconds", phase="layers"):
+                self.task_layers.update(
+                    self.client.get_image_tags_layers(
+                        image_tags=list(group_tags_by_digest(digests=digests))
+                    )
+                )
+        except (HTTPException, OSError) as exc:
+            METRICS.inc("registry_errors", phase="layers")
+            logger.warning(msg=f"🤡 Docker image layers not read: {exc}")
+
+    def fetch_image_metadata(self, image: str) -> dict[str, Optional[str]]:
+        """Fetch Image Digests And Layers Method (safe to run in a thread)"""
+
+        digests: dict[str, Optional[str]] = self.fetch_image_digests(image=image)
+        if self.layer_cache and digests and not self.scheduler.exhausted:
+            self.fetch_image_layers(digests=digests)
+        return digests
+
+    def image_tasks(self, digests: dict[str, Optional[str]]) -> Iterator[ScanTask]:
+        """Get Image Scan Tasks Method (one task per uncached manifest digest)"""
+
+        self.total_images += 1
+        self.total_tags += len(digests)
+        groups: dict[str, list[str]] = group_tags_by_digest(digests=digests)
+
+        for image_tag, aliases in groups.items():
+            digest: Optional[str] = digests.get(image_tag)
+            cached_result: Optional[dict[str, Any]] = (
+                self.cache.get(digest=digest) if self.cache else None
+            )
+            if cached_result:
+                logger.debug(msg=f"♻️ Scan cache hit for '{image_tag}' ({digest})")
+                self.task_layers.pop(image_tag, None)
+                self.add_results(
+                    results=fan_out_results(
+                        results={f"{self.docker_registry}/{image_tag}": cached_result},
+                        docker_registry=self.docker_registry,
+                        groups=groups,
+                        digests=digests,
+                    )
+                )
+                continue
+            yield ScanTask(
+                docker_registry=self.docker_registry,
+                image_tag=image_tag,
+                digest=digest,
+                aliases=tuple(aliases),
+            )
+
+    def __iter_image_digests(
+        self, images: Iterable[str], executor: ThreadPoolExecutor
+    ) -> Iterator[dict[str, Optional[str]]]:
+        """Fetch image metadata ahead in threads, yielding it in catalog order"""
+        prefetched: deque[Future[dict[str, Optional[str]]]] = deque()
+        for image in self.__iter_images(images=images):
+            prefetched.append(executor.submit(self.fetch_image_metadata, image))
+            while prefetched and (
+                prefetched[0].done() or len(prefetched) > 2 * self.registry_concurrency
+            ):
+                yield prefetched.popleft().result()
+        while prefetched:
+            yield prefetched.popleft().result()
+
+    def __iter_images(self, images: Iterable[str]) -> Iterator[str]:
+        """Iterate images, timing the catalog enumeration"""
+        iterator: Iterator[str] = iter(images)
+        while True:
+            start: float = perf_counter()
+            image: Optional[str] = next(iterator, None)
+            METRICS.observe(
+                "phase_duration_seconds", perf_counter() - start, phase="catalog"
+            )
+            if image is None:
+                return
+            yield image
+
+    def __dispatch(self, scan_pool: ScanPool, wait: bool = False) -> None:
+        """Submit scheduled tasks (blocking on busy workers only with `wait`)"""
+        while wait or scan_pool.available > 0:
+            task: Optional[ScanTask] = self.scheduler.pop()
+            if task is None:
+                return
+            if self.layer_cache:
+                self.layer_cache.record(layers=self.task_layers.pop(task.image_tag, []))
+            scan_pool.submit(task=task)
+            for finished_task, results in scan_pool.results():
+                self.on_scan_results(task=finished_task, results=results)
+
+    def __schedule(self, tasks: list[ScanTask]) -> None:
+        """Push tasks to the scheduler, with their base layer (layer cache)"""
+        for task in tasks:
+            layers: list[tuple[str, int]] = self.task_layers.get(task.image_tag, [])
+            self.scheduler.push(task=task, base_layer=layers[0][0] if layers else None)
+
+    def __skip(self, tasks: list[ScanTask]) -> None:
+        for task in tasks:
+            self.add_results(
+                results=fan_out_results(
+                    results={task.docker_image_tag: {"status": "SKIPPED"}},
+                    docker_registry=self.docker_registry,
+                    groups={task.image_tag: list(task.aliases)},
+                    digests=dict.fromkeys(task.aliases, task.digest),
+                )
+            )
+
+    def run(
+        self, images: Iterable[str], scan_pool: Optional[ScanPool] = None
+    ) -> CompactResults:
+        """Run Sweep Method (results are kept only without a report writer)
+
+        A `scan_pool` shared by several sweeps (e.g. one per registry) is
+        left open, its tasks finished.
+        """
+
+        with (
+            ScanPool(options=self.options)
+            if scan_pool is None
+            else nullcontext(enter_result=scan_pool)
+        ) as pool, ThreadPoolExecutor(
+            max_workers=self.registry_concurrency, thread_name_prefix="metadata"
+        ) as executor:
+            for digests in self.__iter_image_digests(images=images, executor=executor):
+                self.__schedule(tasks=list(self.image_tasks(digests=digests)))
+                self.__dispatch(scan_pool=pool)
+                for finished_task, results in pool.results():
+                    self.on_scan_results(task=finished_task, results=results)
+            self.__dispatch(scan_pool=pool, wait=True)
+            for finished_task, results in pool.results(wait=True):
+                self.on_scan_results(task=finished_task, results=results)
+        self.__skip(tasks=self.scheduler.drain())
+
+        self.status_log.flush()
+        self.progress.update(
+            done=self.total_tags_scanned, discovered=self.total_tags, force=True
+        )
+        METRICS.set("images", self.total_images, **self.metric_labels)
+        METRICS.set("tags_discovered", self.total_tags, **self.metric_labels)
+        METRICS.set("tags_skipped", self.total_tags_skipped, **self.metric_labels)
+        METRICS.set(
+            "coverage_ratio",
+            self.total_tags_scanned / self.total_tags if self.total_tags else 1.0,
+            **self.metric_labels,
+        )
+        logger.info(msg=f"💡 Number of Docker images: {self.total_images}")
+        logger.info(msg=f"💡 Total Docker tags scanned: {self.total_tags_scanned}")
+        if self.layer_cache:
+            METRICS.set("layer_cache_estimated_hit_ratio", self.layer_cache.hit_ratio)
+            logger.info(
+                msg=f"💡 Layer cache (estimated): {self.layer_cache.hits} hits,"
+                f" {self.layer_cache.misses} misses"
+                f" ({100 * self.layer_cache.hit_ratio:.1f}% hit ratio)"
+            )
+        if self.total_tags_skipped:
+            logger.warning(
+                msg=f"⏳ Time budget exhausted: {self.total_tags_scanned}"
+                f"/{self.total_tags} Docker tags scanned"
+                f" ({100 * self.total_tags_scanned / self.total_tags:.1f}% coverage),"
+                f" {self.total_tags_skipped} skipped"
+            )
+        return self.scan_results
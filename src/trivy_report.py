@@ -0,0 +1,150 @@
+"""Trivy JSON Report Reader"""
+
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, Iterator, TextIO
+
+
+class JSONStream:
+    """JSON Stream Class (pull parser reading a JSON document by chunks)
+
+    Only the value being decoded is held in memory: containers are walked
+    with `iter_object`/`iter_array` and scalars or small sub-documents are
+    decoded with `read_value`. Every key yielded by `iter_object` and every
+    element yielded by `iter_array` must be consumed before iterating on.
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int = 65536) -> None:
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer: str = ""
+        self.position: int = 0
+        self.eof: bool = False
+        self.decoder: JSONDecoder = JSONDecoder()
+
+    def __fill(self) -> bool:
+        if self.eof:
+            return False
+        position: int = self.position
+        pending: str = self.buffer[position:]
+        # Growing reads keep re-decoding of a large value linear
+        chunk: str = self.file.read(max(self.chunk_size, len(pending)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = pending + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Get Next Non-Whitespace Character Method ('' at end of document)"""
+
+        while True:
+            while self.position < len(self.buffer):
+                if not self.buffer[self.position].isspace():
+                    return self.buffer[self.position]
+                self.position += 1
+            if not self.__fill():
+                return ""
+
+    def __expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise JSONDecodeError(
+                msg=f"Expecting '{char}'", doc=self.buffer, pos=self.position
+            )
+        self.position += 1
+
+    def read_value(self) -> Any:
+        """Decode Next Value Method"""
+
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except JSONDecodeError:
+                if not self.__fill():
+                    raise
+                continue
+            # A number may go on in the next chunk
+            if end == len(self.buffer) and self.__fill():
+                continue
+            self.position = end
+            return value
+
+    def iter_object(self) -> Iterator[str]:
+        """Iterate Object Keys Method"""
+
+        self.__expect(char="{")
+        if self.peek() == "}":
+            self.position += 1
+            return
+        while True:
+            key: str = self.read_value()
+            self.__expect(char=":")
+            yield key
+            if self.peek() == "}":
+                self.position += 1
+                return
+            self.__expect(char=",")
+
+    def iter_array(self) -> Iterator[int]:
+        """Iterate Array Elements Method (yields element indexes)"""
+
+        self.__expect(char="[")
+        if self.peek() == "]":
+            self.position += 1
+            return
+        index: int = 0
+        while True:
+            yield index
+            index += 1
+            if self.peek() == "]":
+                self.position += 1
+                return
+            self.__expect(char=",")
+
+
+FINDING_ID_KEYS: dict[str, str] = {
+    "Vulnerabilities": "VulnerabilityID",
+    "Secrets": "RuleID",
+}
+
+
+def _read_result(stream: JSONStream) -> dict[str, Any]:
+    result: dict[str, Any] = {"Findings": None}
+
+    for key in stream.iter_object():
+        if key in FINDING_ID_KEYS and stream.peek() == "[":
+            result.update({"Findings": []})
+            for _ in stream.iter_array():
+                finding: dict[str, Any] = stream.read_value()
+                result.get("Findings").append(
+                    [finding.get(FINDING_ID_KEYS.get(key)), finding.get("Severity")]
+                )
+        elif key in ["Target", "Class", "Type"]:
+            result.update({key: stream.read_value()})
+        else:
+            stream.read_value()
+    return result
+
+
+def read_trivy_report(file: TextIO) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Read Trivy JSON Report Function
+
+    Returns `.Metadata` and `.Results`, each result reduced to its
+    `Target`, `Class`, `Type` and `Findings`: `[id, severity]` pairs of
+    its vulnerabilities or secrets (None when it has none of them).
+    """
+
+    metadata: dict[str, Any] = {}
+    results: list[dict[str, Any]] = []
+    stream: JSONStream = JSONStream(file=file)
+
+    for key in stream.iter_object():
+        if key == "Results" and stream.peek() == "[":
+            for _ in stream.iter_array():
+                results.append(_read_result(stream=stream))
+        elif key == "Metadata":
+            metadata = stream.read_value() or {}
+        else:
+            stream.read_value()
+    return metadata, results
@@ -0,0 +1,96 @@
+"""Trivy Server"""
+
+from subprocess import Popen, DEVNULL, TimeoutExpired  # nosemgrep: bandit.B404
+from time import monotonic, sleep
+from typing import Optional
+from urllib.error import URLError
+from urllib.request import urlopen
+from logger import logger
+
+
+class TrivyServer:
+    """Trivy Server Class (one local server sharing the loaded database)"""
+
+    def __init__(
+        self,
+        listen: str = "127.0.0.1:4954",
+        startup_timeout: int = 60,
+        cache_dir: Optional[str] = None,
+    ):
+        self.listen = listen
+        self.cache_dir = cache_dir
+        self.startup_timeout = startup_timeout
+        self.process: Optional[Popen] = None
+
+    def __enter__(self) -> "TrivyServer":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Get Trivy server URL"""
+
+        return f"http://{self.listen}"
+
+    def healthy(self) -> bool:
+        """Trivy Server Health Check Method"""
+
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            with urlopen(url=f"{self.url}/healthz", timeout=1) as response:
+                return response.status == 200
+        except (URLError, OSError):
+            return False
+
+    def start(self) -> None:
+        """Start Trivy Server Method (waits until it is healthy)"""
+
+        logger.info(msg=f"Starting Trivy server on {self.url}...")
+        self.process = Popen(  # pylint: disable=consider-using-with
+            args=[
+                "trivy",
+                "server",
+                "--listen",
+                self.listen,
+                "--skip-db-update",
+                *(["--cache-dir", self.cache_dir] if self.cache_dir else []),
+            ],
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+        )
+        deadline: float = monotonic() + self.startup_timeout
+        while not self.healthy():
+            if self.process.poll() is not None or monotonic() > deadline:
+                self.stop()
+                raise SystemExit(f"Failed to start Trivy server on {self.url}")
+            sleep(0.5)
+        logger.info(msg=f"💡 Trivy server ready on {self.url}")
+
+    def restart(self) -> None:
+        """Restart Trivy Server Method (loads an updated database)
+
+        Raises RuntimeError when the server does not start again.
+        """
+
+        self.stop()
+        try:
+            self.start()
+        except SystemExit as exc:
+            raise RuntimeError(str(exc)) from exc
+
+    def stop(self) -> None:
+        """Stop Trivy Server Method"""
+
+        if self.process is None or self.process.poll() is not None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        logger.info(msg=f"💡 Trivy server on {self.url} stopped")
@@ -0,0 +1,327 @@
+"""Fake Docker Registry (local HTTPS registry used by tests and benchmarks)"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from base64 import b64encode
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from json import dumps
+from os import path
+from re import fullmatch
+from ssl import PROTOCOL_TLS_SERVER, SSLContext
+from threading import Lock, Thread
+from time import sleep
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+CERTS_DIR: str = path.join(path.dirname(path.abspath(__file__)), "certs")
+MANIFEST_MEDIA_TYPE: str = "application/vnd.docker.distribution.manifest.v2+json"
+
+
+def fake_digest(value: str) -> str:
+    """Get Fake Digest Function"""
+
+    return f"sha256:{sha256(value.encode()).hexdigest()}"
+
+
+class FakeRegistryHandler(BaseHTTPRequestHandler):
+    """Fake Registry Request Handler Class"""
+
+    protocol_version: str = "HTTP/1.1"
+    disable_nagle_algorithm: bool = True
+    server: "FakeRegistry"
+    served: int = 0
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.count_request(command="CONNECT")
+
+    def log_message(self, *_) -> None:  # pylint: disable=arguments-differ
+        """Silence Request Logging"""
+
+    def __send(
+        self,
+        status: int,
+        body: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        payload: bytes = dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+        self.served += 1
+        if self.server.keep_alive and self.served >= self.server.keep_alive:
+            # Close the connection without a "Connection: close" header,
+            # like a registry whose keep-alive timeout expired
+            self.close_connection = True
+
+    def __send_page(self, key: str, items: list[str], url_path: str) -> None:
+        query: dict[str, list[str]] = parse_qs(qs=urlparse(url=self.path).query)
+        page_size: int = min(
+            int(query.get("n", [str(self.server.page_size)])[0]), self.server.page_size
+        )
+        last: Optional[str] = query.get("last", [None])[0]
+        start: int = items.index(last) + 1 if last in items else 0
+        end: int = start + page_size
+        headers: dict[str, str] = {}
+        if end < len(items):
+            next_url: str = f"{url_path}?last={items[end - 1]}&n={page_size}"
+            headers.update({"Link": f'<{next_url}>; rel="next"'})
+        body: dict[str, Any] = {key: items[start:end]}
+        if key == "tags":
+            body.update({"name": url_path.split("/tags/list")[0].removeprefix("/v2/")})
+        self.__send(status=200, body=body, headers=headers)
+
+    def __handle(self) -> None:  # pylint: disable=too-many-return-statements
+        self.server.count_request(command=self.command)
+        if self.server.latency:
+            sleep(self.server.latency)
+
+        if self.headers.get("Authorization"):
+            self.server.count_request(command="AUTHORIZATION")
+
+        error: Optional[int] = self.server.next_error()
+        if error:
+            self.__send(
+                status=error,
+                body={"errors": [{"code": "TOOMANYREQUESTS"}]},
+                headers={"Retry-After": "0"},
+            )
+            return
+
+        url_path: str = urlparse(url=self.path).path
+        if self.server.credentials:
+            if url_path == "/token":
+                self.__send_token()
+                return
+            scope: Optional[str] = self.server.scope(url_path=url_path)
+            if not self.server.authorized(
+                header=self.headers.get("Authorization"), scope=scope
+            ):
+                self.__send(
+                    status=401,
+                    body={"errors": [{"code": "UNAUTHORIZED"}]},
+                    headers={
+                        "WWW-Authenticate": f'Bearer realm="{self.server.url}/token"'
+                        f',service="fake-registry",scope="{scope}"'
+                    },
+                )
+                return
+
+        if url_path == "/v2/_catalog":
+            self.__send_page(
+                key="repositories", items=self.server.repositories, url_path=url_path
+            )
+            return
+
+        tags_match = fullmatch(pattern=r"/v2/(.+)/tags/list", string=url_path)
+        if tags_match and tags_match.group(1) in self.server.repositories:
+            self.__send_page(key="tags", items=self.server.tags, url_path=url_path)
+            return
+
+        manifest_match = fullmatch(
+            pattern=r"/v2/(.+)/manifests/([^/]+)", string=url_path
+        )
+        if manifest_match and manifest_match.group(1) in self.server.repositories:
+            manifest: dict[str, Any] = self.server.manifest(
+                repository=manifest_match.group(1), tag=manifest_match.group(2)
+            )
+            self.__send(
+                status=200,
+                body=manifest,
+                headers={
+                    "Docker-Content-Digest": fake_digest(value=dumps(manifest)),
+                    "Content-Type": MANIFEST_MEDIA_TYPE,
+                },
+            )
+            return
+
+        blob_match = fullmatch(pattern=r"/v2/(.+)/blobs/([^/]+)", string=url_path)
+        if blob_match and blob_match.group(2) in self.server.configs:
+            if self.server.blob_storage:
+                self.server.blob_storage.configs.update(
+                    {blob_match.group(2): self.server.configs[blob_match.group(2)]}
+                )
+                self.__send(
+                    status=307,
+                    headers={"Location": f"{self.server.blob_storage.url}{url_path}"},
+                )
+                return
+            self.__send(status=200, body=self.server.configs[blob_match.group(2)])
+            return
+
+        self.__send(status=404, body={"errors": [{"code": "NAME_UNKNOWN"}]})
+
+    def __send_token(self) -> None:
+        self.server.count_request(command="TOKEN")
+        basic: str = b64encode(":".join(self.server.credentials).encode()).decode()
+        if self.headers.get("Authorization") != f"Basic {basic}":
+            self.__send(status=401, body={"errors": [{"code": "UNAUTHORIZED"}]})
+            return
+        scope: str = parse_qs(qs=urlparse(url=self.path).query).get("scope", [""])[0]
+        self.__send(
+            status=200,
+            body={"token": self.server.issue_token(scope=scope), "expires_in": 300},
+        )
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Handle GET Requests"""
+
+        self.__handle()
+
+    def do_HEAD(self) -> None:  # pylint: disable=invalid-name
+        """Handle HEAD Requests"""
+
+        self.__handle()
+
+
+class FakeRegistry(ThreadingHTTPServer):  # pylint: disable=R0902
+    """Fake Registry Class
+
+    Serves `repositories` repositories of `tags` tags each. Every `aliases`
+    consecutive tags of a repository share the same manifest, and every
+    manifest shares a base layer. Images of greater tags are created one
+    day later, starting from 2023-01-01. With `keep_alive`, connections are
+    closed after that many requests. The first requests are answered with
+    the `errors` HTTP status codes (e.g. 429 or 503). With `credentials`,
+    requests need a Bearer token of their scope, issued by `/token`. With
+    `blob_storage`, blob requests are redirected (307) to that other fake
+    registry, like registries storing blobs on S3.
+    """
+
+    daemon_threads: bool = True
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        repositories: int = 10,
+        tags: int = 10,
+        *,
+        aliases: int = 1,
+        latency: float = 0.0,
+        page_size: int = 100,
+        keep_alive: int = 0,
+        errors: Optional[list[int]] = None,
+        credentials: Optional[tuple[str, str]] = None,
+        blob_storage: Optional["FakeRegistry"] = None,
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), FakeRegistryHandler)
+        ssl_context: SSLContext = SSLContext(protocol=PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(
+            certfile=f"{CERTS_DIR}/localhost.crt", keyfile=f"{CERTS_DIR}/localhost.key"
+        )
+        self.socket = ssl_context.wrap_socket(sock=self.socket, server_side=True)
+        self.repositories: list[str] = [
+            f"repo-{index:05d}" for index in range(repositories)
+        ]
+        self.tags: list[str] = [f"{index}" for index in range(tags)]
+        self.aliases = aliases
+        self.latency = latency
+        self.page_size = page_size
+        self.keep_alive = keep_alive
+        self.errors: list[int] = list(errors or [])
+        self.credentials = credentials
+        self.blob_storage = blob_storage
+        self.tokens: dict[str, str] = {}
+        self.configs: dict[str, dict[str, Any]] = {}
+        self.requests: dict[str, int] = {}
+        self.requests_lock: Lock = Lock()
+        self.thread: Thread = Thread(target=self.serve_forever, daemon=True)
+
+    def __enter__(self) -> "FakeRegistry":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def url(self) -> str:
+        """Get Fake Registry URL"""
+
+        return f"https://localhost:{self.server_address[1]}"
+
+    @property
+    def ca_file(self) -> str:
+        """Get Fake Registry CA File"""
+
+        return f"{CERTS_DIR}/localhost.crt"
+
+    def count_request(self, command: str) -> None:
+        """Count Request Method ("CONNECT" counts new connections)"""
+
+        with self.requests_lock:
+            self.requests.update({command: self.requests.get(command, 0) + 1})
+
+    def next_error(self) -> Optional[int]:
+        """Get Next Injected Error Status Method"""
+
+        with self.requests_lock:
+            return self.errors.pop(0) if self.errors else None
+
+    def scope(self, url_path: str) -> str:
+        """Get Token Scope Of A Request Method"""
+
+        if url_path == "/v2/_catalog":
+            return "registry:catalog:*"
+        repository_match = fullmatch(
+            pattern=r"/v2/(.+)/(tags/list|manifests/[^/]+|blobs/[^/]+)", string=url_path
+        )
+        return (
+            f"repository:{repository_match.group(1)}:pull" if repository_match else ""
+        )
+
+    def issue_token(self, scope: str) -> str:
+        """Issue Bearer Token Method"""
+
+        with self.requests_lock:
+            token: str = f"token-{len(self.tokens)}"
+            self.tokens.update({token: scope})
+        return token
+
+    def authorized(self, header: Optional[str], scope: str) -> bool:
+        """Check Bearer Token Of A Request Method"""
+
+        token: str = (header or "").removeprefix("Bearer ")
+        return self.tokens.get(token) == scope
+
+    def manifest(self, repository: str, tag: str) -> dict[str, Any]:
+        """Get Image Manifest Method"""
+
+        group: int = int(tag) // self.aliases if tag.isdigit() else 0
+        image: str = f"{repository}:{group}"
+        config_digest: str = fake_digest(value=f"config {image}")
+        with self.requests_lock:
+            self.configs.update(
+                {
+                    config_digest: {
+                        "architecture": "amd64",
+                        "os": "linux",
+                        "created": (
+                            datetime(2023, 1, 1, tzinfo=timezone.utc)
+                            + timedelta(days=group)
+                        ).isoformat(),
+                    }
+                }
+            )
+        return {
+            "schemaVersion": 2,
+            "mediaType": MANIFEST_MEDIA_TYPE,
+            "config": {
+                "mediaType": "application/vnd.docker.container.image.v1+json",
+                "size": 1024,
+                "digest": config_digest,
+            },
+            "layers": [
+                {
+                    "mediaType": "application/vnd.docker.image.rootfs.diff.tar.gzip",
+                    "size": 1048576,
+                    "digest": fake_digest(value=layer),
+                }
+                for layer in ["base", f"repository {repository}", f"image {image}"]
+            ],
+        }
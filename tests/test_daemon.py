@@ -0,0 +1,203 @@
+"""Daemon Tests"""
+
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+from json import dumps, loads
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import monotonic, sleep
+from typing import Any
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from test_sweep import FakeDockerRegistryClient, FakeScanPool
+from daemon import Daemon, parse_notification
+from scan_queue import ScanQueue
+from scanner_options import ScannerOptions
+from sweep import Sweep
+
+MANIFEST_MEDIA_TYPE: str = "application/vnd.docker.distribution.manifest.v2+json"
+
+
+def notification(action: str = "push", **target: str) -> bytes:
+    """Get Docker Registry Notification Envelope Function"""
+
+    return dumps(
+        {
+            "events": [
+                {
+                    "action": action,
+                    "target": {"mediaType": MANIFEST_MEDIA_TYPE, **target},
+                }
+            ]
+        }
+    ).encode()
+
+
+class DaemonTests(TestCase):
+    """Daemon Tests Class"""
+
+    my_docker_registry: str = "docker-registry.example.com:12345"
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.queue: ScanQueue = ScanQueue(queue_file=f"{self.tmp_dir.name}/q.sqlite")
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmp_dir.cleanup()
+
+    def test_parse_notification(self):
+        """Test Registry Notification Parsing"""
+
+        self.assertEqual(
+            first=parse_notification(
+                body=notification(repository="alpine", tag="3.7", digest="sha256:1")
+            ),
+            second=[("alpine:3.7", "sha256:1")],
+        )
+        self.assertEqual(
+            first=parse_notification(
+                body=notification(repository="alpine", digest="sha256:1")
+            ),
+            second=[("alpine@sha256:1", "sha256:1")],
+        )
+        self.assertEqual(
+            first=parse_notification(
+                body=notification(action="pull", repository="alpine", digest="sha256:1")
+            ),
+            second=[],
+        )
+        self.assertEqual(
+            first=parse_notification(
+                body=notification(repository="alpine", tag="3.7", digest="sha256:1"),
+                tags_filter=r"^latest$",
+            ),
+            second=[],
+        )
+
+    @patch(target="daemon.ScanPool", new=FakeScanPool)
+    def test_run(self):
+        """Test Daemon Scanning Pushed Images"""
+
+        report_writer: MagicMock = MagicMock()
+        daemon: Daemon = Daemon(
+            sweep=Sweep(
+                FakeDockerRegistryClient(),
+                ScannerOptions(),
+                report_writer=report_writer,
+            ),
+            queue=self.queue,
+            listen="127.0.0.1:0",
+            token="s3cr3t",
+            rescan_interval=0,
+            poll_interval=0.01,
+        )
+        thread: Thread = Thread(target=daemon.run)
+        with self.assertLogs(level="INFO"):
+            thread.start()
+            url: str = f"http://127.0.0.1:{daemon.server.server_address[1]}"
+
+            with self.assertRaises(expected_exception=HTTPError):
+                urlopen(  # nosec B310 pylint: disable=consider-using-with
+                    Request(url=f"{url}/notifications", data=b"{}", method="POST")
+                )
+            with urlopen(  # nosec B310
+                Request(
+                    url=f"{url}/notifications",
+                    data=notification(
+                        repository="alpine", tag="3.7", digest="sha256:1234"
+                    ),
+                    headers={"Authorization": "Bearer s3cr3t"},
+                    method="POST",
+                )
+            ) as response:
+                self.assertEqual(first=loads(response.read()), second={"queued": 1})
+
+            deadline: float = monotonic() + 5
+            while (not report_writer.write.called or len(self.queue)) and (
+                monotonic() < deadline
+            ):
+                sleep(0.01)
+            with urlopen(url=f"{url}/healthz") as response:  # nosec B310
+                health: dict[str, Any] = loads(response.read())
+            daemon.stop()
+            thread.join()
+
+        report_writer.write.assert_called_once_with(
+            results={
+                f"{self.my_docker_registry}/alpine:3.7": {
+                    "status": "OK",
+                    "digest": "sha256:1234",
+                    "deduplicated": False,
+                }
+            }
+        )
+        self.assertEqual(first=health, second={"queued": 0})
+
+    def test_rescan(self):
+        """Test Full Rescan Queuing Every Tag Once Per Digest"""
+
+        daemon: Daemon = Daemon(
+            sweep=Sweep(client=FakeDockerRegistryClient(), options=ScannerOptions()),
+            queue=self.queue,
+            listen="127.0.0.1:0",
+        )
+        with self.assertLogs(level="INFO"):
+            self.assertEqual(first=daemon.rescan(), second=2)
+        daemon.server.server_close()
+        self.assertEqual(
+            first=self.queue.get().aliases, second=("alpine:latest", "alpine:3.7")
+        )
+
+    def test_endpoint_errors(self):
+        """Test Notification Endpoint Unknown Paths And Invalid Notifications"""
+
+        daemon: Daemon = Daemon(
+            sweep=Sweep(client=FakeDockerRegistryClient(), options=ScannerOptions()),
+            queue=self.queue,
+            listen="127.0.0.1:0",
+        )
+        thread: Thread = Thread(target=daemon.server.serve_forever)
+        thread.start()
+        url: str = f"http://127.0.0.1:{daemon.server.server_address[1]}"
+        try:
+            for request, code in [
+                (Request(url=f"{url}/unknown"), 404),
+                (Request(url=f"{url}/unknown", data=b"{}", method="POST"), 404),
+                (Request(url=f"{url}/notifications", data=b"{", method="POST"), 400),
+            ]:
+                with self.assertRaises(expected_exception=HTTPError) as context:
+                    urlopen(request)  # nosec B310 pylint: disable=consider-using-with
+                self.assertEqual(first=context.exception.code, second=code)
+                context.exception.close()
+        finally:
+            daemon.server.shutdown()
+            daemon.server.server_close()
+            thread.join()
+
+    @patch(target="daemon.ScanPool", new=FakeScanPool)
+    def test_run_rescans(self):
+        """Test Daemon Periodic Rescans (a failing rescan does not stop it)"""
+
+        before_rescan: MagicMock = MagicMock(side_effect=[RuntimeError("boom"), None])
+        daemon: Daemon = Daemon(
+            sweep=Sweep(client=FakeDockerRegistryClient(), options=ScannerOptions()),
+            queue=self.queue,
+            listen="127.0.0.1:0",
+            rescan_interval=0.01,
+            before_rescan=before_rescan,
+            poll_interval=0.01,
+        )
+        thread: Thread = Thread(target=daemon.run)
+        with self.assertLogs(level="INFO") as logs:
+            thread.start()
+            deadline: float = monotonic() + 5
+            while before_rescan.call_count < 2 and monotonic() < deadline:
+                sleep(0.01)
+            daemon.stop()
+            thread.join()
+
+        self.assertEqual(first=before_rescan.call_count, second=2)
+        self.assertIn(
+            member="ERROR:logger:🔥 Full rescan failed: boom", container=logs.output
+        )
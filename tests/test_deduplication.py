@@ -0,0 +1,70 @@
+"""Scan Deduplication Tests"""
+
+from unittest import TestCase
+from typing import Any, Optional
+from deduplication import group_tags_by_digest, fan_out_results
+
+
+class DeduplicationTests(TestCase):
+    """Scan Deduplication Tests Class"""
+
+    my_docker_registry: str = "docker-registry.example.com:12345"
+    my_digests: dict[str, Optional[str]] = {
+        "alpine:latest": "sha256:1234",
+        "alpine:3.7": "sha256:1234",
+        "alpine:3.7.3": "sha256:1234",
+        "alpine:3.6": "sha256:5678",
+        "alpine:unknown": None,
+    }
+
+    def test_group_tags_by_digest(self):
+        """Test Group Tags By Digest"""
+
+        self.assertEqual(
+            first=group_tags_by_digest(digests=self.my_digests),
+            second={
+                "alpine:latest": ["alpine:latest", "alpine:3.7", "alpine:3.7.3"],
+                "alpine:3.6": ["alpine:3.6"],
+                "alpine:unknown": ["alpine:unknown"],
+            },
+        )
+
+    def test_fan_out_results(self):
+        """Test Fan Out Results"""
+
+        results: dict[str, Any] = {
+            f"{self.my_docker_registry}/alpine:latest": {"status": "OK"},
+            f"{self.my_docker_registry}/alpine:unknown": {},
+        }
+        self.assertEqual(
+            first=fan_out_results(
+                results=results,
+                docker_registry=self.my_docker_registry,
+                groups=group_tags_by_digest(digests=self.my_digests),
+                digests=self.my_digests,
+            ),
+            second={
+                f"{self.my_docker_registry}/alpine:latest": {
+                    "status": "OK",
+                    "digest": "sha256:1234",
+                    "deduplicated": False,
+                },
+                f"{self.my_docker_registry}/alpine:3.7": {
+                    "status": "OK",
+                    "digest": "sha256:1234",
+                    "deduplicated": True,
+                    "scanned_as": f"{self.my_docker_registry}/alpine:latest",
+                },
+                f"{self.my_docker_registry}/alpine:3.7.3": {
+                    "status": "OK",
+                    "digest": "sha256:1234",
+                    "deduplicated": True,
+                    "scanned_as": f"{self.my_docker_registry}/alpine:latest",
+                },
+                f"{self.my_docker_registry}/alpine:unknown": {},
+            },
+        )
+        self.assertNotIn(
+            member="digest",
+            container=results.get(f"{self.my_docker_registry}/alpine:latest"),
+        )
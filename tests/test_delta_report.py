@@ -0,0 +1,83 @@
+"""Delta Report Tests"""
+
+from unittest import TestCase
+from json import loads
+from tempfile import TemporaryDirectory
+from typing import Any
+from delta_report import write_delta_report
+from report import ReportWriter, write_report
+
+
+def result(digest: str, *findings: str, status: str = "") -> dict[str, Any]:
+    """Get Scan Result Function (os-pkgs findings of `digest`)"""
+
+    return {
+        "status": status or ("NOK" if findings else "OK"),
+        "digest": digest,
+        "vulnerabilities": {
+            "os-pkgs (alpine (alpine 3.7.3))": list(findings),
+            "summary": {"HIGH": len(findings)},
+        },
+    }
+
+
+class DeltaReportTests(TestCase):
+    """Delta Report Tests Class"""
+
+    def test_write_delta_report(self):
+        """Test Delta Report Between Two Reports"""
+
+        with TemporaryDirectory() as tmp_dir:
+            write_report(
+                entries={
+                    "alpine:3.7": result("sha256:1", "CVE-1 (HIGH)", "CVE-2 (HIGH)"),
+                    "alpine:3.8": result("sha256:2"),
+                    "alpine:3.9": result("sha256:3", "CVE-1 (HIGH)"),
+                    "alpine:3.6": result("sha256:4", "CVE-1 (HIGH)"),
+                }.items(),
+                output_file=f"{tmp_dir}/previous.json",
+            )
+            with ReportWriter(report_file=f"{tmp_dir}/report.jsonl") as report_writer:
+                report_writer.write(
+                    results={
+                        "alpine:3.7": result(
+                            "sha256:1", "CVE-1 (HIGH)", "CVE-3 (CRITICAL)"
+                        ),
+                        "alpine:3.8": result("sha256:5", "CVE-3 (CRITICAL)"),
+                        "alpine:3.9": {"status": "TIMEOUT", "timeout": 60.0},
+                        "alpine:latest": result("sha256:5", "CVE-3 (CRITICAL)"),
+                    }
+                )
+
+            with self.assertLogs(level="INFO"):
+                changes: dict[str, int] = write_delta_report(
+                    previous_report_file=f"{tmp_dir}/previous.json",
+                    report_file=f"{tmp_dir}/report.jsonl",
+                    output_file=f"{tmp_dir}/delta.json",
+                )
+            with open(file=f"{tmp_dir}/delta.json", encoding="UTF-8") as file:
+                delta: dict[str, Any] = loads(file.read())
+
+        self.assertEqual(
+            first=delta,
+            second={
+                "added_tags": ["alpine:latest"],
+                "removed_tags": ["alpine:3.6"],
+                "newly_vulnerable_tags": ["alpine:3.8", "alpine:latest"],
+                "new_findings": {
+                    "sha256:1": ["CVE-3 (CRITICAL)"],
+                    "sha256:5": ["CVE-3 (CRITICAL)"],
+                },
+                "fixed_findings": {"alpine:3.7": ["CVE-2 (HIGH)"]},
+            },
+        )
+        self.assertEqual(
+            first=changes,
+            second={
+                "added_tags": 1,
+                "removed_tags": 1,
+                "newly_vulnerable_tags": 2,
+                "new_findings": 2,
+                "fixed_findings": 1,
+            },
+        )
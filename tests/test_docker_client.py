@@ -5,6 +5,8 @@ from unittest.mock import patch, MagicMock
 from typing import Any, Optional
 from json import dumps
 from http.client import HTTPException
+from urllib.parse import parse_qs, urlparse
+from fake_registry import FakeRegistry
 from docker_registry_client import DockerRegistryClient
 
 
@@ -72,6 +74,59 @@ class FakeHTTPResponse:  # pylint: disable=too-few-public-methods
         return self.__to_json(obj={})
 
 
+class FakePaginatedHTTPSConnection:
+    """FakePaginatedHTTPSConnection Class (serves 'Link' paginated lists)"""
+
+    items: list[str] = ["a", "b", "c", "d", "e"]
+
+    def request(self, url: str, **_):
+        """FakePaginatedHTTPSConnection Request Method"""
+
+        self.url = url  # pylint: disable=attribute-defined-outside-init
+
+    def getresponse(self):
+        """FakePaginatedHTTPSConnection getresponse Method"""
+
+        query: dict[str, list[str]] = parse_qs(qs=urlparse(url=self.url).query)
+        page_size: int = int(query.get("n", ["100"])[0])
+        last: Optional[str] = query.get("last", [None])[0]
+        start: int = self.items.index(last) + 1 if last else 0
+        end: int = start + page_size
+        page: list[str] = self.items[start:end]
+        headers: dict[str, str] = {}
+        if end < len(self.items):
+            headers.update(
+                {
+                    "link": f"<{urlparse(url=self.url).path}?last={page[-1]}"
+                    f'&n={page_size}>; rel="next"'
+                }
+            )
+        return FakePaginatedHTTPResponse(
+            body=dumps(obj={"repositories": page, "name": "fake-alpine", "tags": page}),
+            headers=headers,
+        )
+
+
+class FakePaginatedHTTPResponse:
+    """FakePaginatedHTTPResponse Class"""
+
+    status: int = 200
+
+    def __init__(self, body: str, headers: dict[str, str]):
+        self.body = body
+        self.headers = headers
+
+    def getheader(self, name: str) -> Optional[str]:
+        """FakePaginatedHTTPResponse Get Header Method"""
+
+        return self.headers.get(name)
+
+    def read(self) -> str:
+        """FakePaginatedHTTPResponse Read Method"""
+
+        return self.body
+
+
 class DockerRegistryClientTests(TestCase):
     """Docker Client Tests Class"""
 
@@ -172,3 +227,264 @@ class DockerRegistryClientTests(TestCase):
             first=my_fake_docker_registry_client.get_images(),
             second=["fake-alpine", "fake-ubuntu", "fake-python"],
         )
+
+    @patch(
+        target="docker_registry_client.HTTPSConnection",
+        new=MagicMock(
+            return_value=FakeHTTPSConnection(
+                headers={"Docker-Content-Digest": "sha256:1234"}
+            )
+        ),
+    )
+    def test_get_image_digest(self):
+        """Docker Client Get Image Digest Test"""
+
+        my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+            registry_url="https://fake.registry.example.com:12345"
+        )
+        self.assertEqual(
+            first=my_fake_docker_registry_client.get_image_digest(
+                image_tag="fake-alpine:a"
+            ),
+            second="sha256:1234",
+        )
+
+    @patch(
+        target="docker_registry_client.HTTPSConnection",
+        new=MagicMock(return_value=FakePaginatedHTTPSConnection()),
+    )
+    def test_iter_images_paginated(self):
+        """Docker Client Iterate Images Following Pagination Test"""
+
+        my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+            registry_url="https://fake.registry.example.com:12345"
+        )
+        self.assertEqual(
+            first=list(my_fake_docker_registry_client.iter_images(page_size=2)),
+            second=["a", "b", "c", "d", "e"],
+        )
+        self.assertEqual(
+            first=list(
+                my_fake_docker_registry_client.iter_images(page_size=2, pattern="[ae]")
+            ),
+            second=["a", "e"],
+        )
+
+    @patch(
+        target="docker_registry_client.HTTPSConnection",
+        new=MagicMock(return_value=FakePaginatedHTTPSConnection()),
+    )
+    def test_iter_image_tags_paginated(self):
+        """Docker Client Iterate Image Tags Following Pagination Test"""
+
+        my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+            registry_url="https://fake.registry.example.com:12345/my/path"
+        )
+        self.assertEqual(
+            first=list(
+                my_fake_docker_registry_client.iter_image_tags(
+                    image="fake-alpine", page_size=3
+                )
+            ),
+            second=[f"fake-alpine:{tag}" for tag in ["a", "b", "c", "d", "e"]],
+        )
+
+    def test_fake_registry(self):
+        """Docker Client Against Local Fake HTTPS Registry Test"""
+
+        with FakeRegistry(repositories=5, tags=4, aliases=2, page_size=2) as registry:
+            client: DockerRegistryClient = DockerRegistryClient(
+                registry_url=registry.url, ca_file=registry.ca_file
+            )
+            images: list[str] = list(client.iter_images(page_size=100))
+            image_tags: list[str] = list(client.iter_image_tags(image=images[0]))
+            digests: list[Optional[str]] = [
+                client.get_image_digest(image_tag=image_tag) for image_tag in image_tags
+            ]
+
+        self.assertEqual(first=len(images), second=5)
+        self.assertEqual(
+            first=image_tags, second=[f"{images[0]}:{i}" for i in range(4)]
+        )
+        self.assertEqual(first=digests[0], second=digests[1])
+        self.assertNotEqual(first=digests[1], second=digests[2])
+        self.assertEqual(first=registry.requests.get("HEAD"), second=4)
+
+    def test_get_image_created_dates(self):
+        """Docker Client Image Creation Dates From Config Blobs Test"""
+
+        with FakeRegistry(repositories=1, tags=3) as registry:
+            with DockerRegistryClient(
+                registry_url=registry.url, ca_file=registry.ca_file
+            ) as client:
+                created: dict[str, Optional[str]] = client.get_image_created_dates(
+                    image_tags=["repo-00000:0", "repo-00000:2"]
+                )
+
+        self.assertEqual(
+            first=created,
+            second={
+                "repo-00000:0": "2023-01-01T00:00:00+00:00",
+                "repo-00000:2": "2023-01-03T00:00:00+00:00",
+            },
+        )
+        self.assertEqual(first=registry.requests.get("GET"), second=4)
+
+    def test_get_image_tags_layers(self):
+        """Docker Client Image Layers From Manifests Test"""
+
+        with FakeRegistry(repositories=2, tags=1) as registry:
+            with DockerRegistryClient(
+                registry_url=registry.url, ca_file=registry.ca_file
+            ) as client:
+                layers: dict[str, list[tuple[str, int]]] = client.get_image_tags_layers(
+                    image_tags=["repo-00000:0", "repo-00001:0"]
+                )
+
+        self.assertEqual(first=len(layers["repo-00000:0"]), second=3)
+        self.assertEqual(
+            first=layers["repo-00000:0"][0], second=layers["repo-00001:0"][0]
+        )
+        self.assertNotEqual(
+            first=layers["repo-00000:0"][1], second=layers["repo-00001:0"][1]
+        )
+        self.assertEqual(first=layers["repo-00000:0"][0][1], second=1048576)
+
+    def test_connection_pool(self):
+        """Docker Client Keep-Alive Connection Pool Test"""
+
+        with FakeRegistry(repositories=1, tags=20, aliases=2) as registry:
+            with DockerRegistryClient(
+                registry_url=registry.url, ca_file=registry.ca_file, max_connections=1
+            ) as client:
+                image_tags: list[str] = list(client.iter_image_tags(image="repo-00000"))
+                digests: dict[str, Optional[str]] = client.get_image_digests(
+                    image_tags=image_tags
+                )
+
+        self.assertEqual(first=list(digests), second=image_tags)
+        self.assertEqual(first=len(set(digests.values())), second=len(image_tags) // 2)
+        self.assertEqual(first=registry.requests.get("CONNECT"), second=1)
+
+    def test_connection_pool_reconnect(self):
+        """Docker Client Reconnects When The Registry Closes Connections Test"""
+
+        with FakeRegistry(repositories=1, tags=20, keep_alive=3) as registry:
+            with DockerRegistryClient(
+                registry_url=registry.url, ca_file=registry.ca_file, max_connections=4
+            ) as client:
+                digests: dict[str, Optional[str]] = client.get_image_digests(
+                    image_tags=[f"repo-00000:{tag}" for tag in range(20)]
+                )
+
+        self.assertNotIn(member=None, container=digests.values())
+        self.assertEqual(first=registry.requests.get("HEAD"), second=20)
+        self.assertGreater(a=registry.requests.get("CONNECT"), b=4)
+
+    @patch(target="docker_registry_client.sleep")
+    def test_retry(self, mock_sleep):
+        """Docker Client Retries Throttled And Failed Requests Test"""
+
+        with FakeRegistry(repositories=2, errors=[429, 503]) as registry:
+            with DockerRegistryClient(
+                registry_url=registry.url, ca_file=registry.ca_file
+            ) as client, self.assertLogs(level="WARNING"):
+                images: list[str] = list(client.iter_images())
+
+        self.assertEqual(first=images, second=["repo-00000", "repo-00001"])
+        self.assertEqual(first=registry.requests.get("GET"), second=3)
+        self.assertEqual(first=mock_sleep.call_count, second=2)
+
+        with FakeRegistry(repositories=2, errors=[503, 503]) as registry:
+            with DockerRegistryClient(
+                registry_url=registry.url, ca_file=registry.ca_file, max_retries=1
+            ) as client, self.assertLogs(level="WARNING"):
+                with self.assertRaises(expected_exception=HTTPException):
+                    list(client.iter_images())
+
+    @patch(
+        target="docker_registry_client.HTTPSConnection",
+        new=MagicMock(
+            return_value=FakeHTTPSConnection(
+                status=302, headers={"location": "/v2/loop"}
+            )
+        ),
+    )
+    def test_request_redirect_loop(self):
+        """Docker Client Redirection Depth Limit Test"""
+
+        my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+            registry_url=self.my_registry_url, ca_file=self.my_ca_file
+        )
+        with self.assertRaises(expected_exception=HTTPException), self.assertLogs():
+            my_fake_docker_registry_client.get_images()
+
+    def test_blob_redirect(self):
+        """Docker Client Blob Redirected To Other Hosts Test"""
+
+        with FakeRegistry(repositories=0) as bucket, FakeRegistry(
+            repositories=0, blob_storage=bucket
+        ) as storage, FakeRegistry(
+            repositories=1,
+            tags=2,
+            credentials=("scanner", "s3cr3t"),
+            blob_storage=storage,
+        ) as registry:
+            with DockerRegistryClient(
+                registry_url=registry.url,
+                ca_file=registry.ca_file,
+                username="scanner",
+                password="s3cr3t",
+            ) as client, self.assertLogs(level="INFO"):
+                created: dict[str, Optional[str]] = client.get_image_created_dates(
+                    image_tags=["repo-00000:0", "repo-00000:1"]
+                )
+
+        self.assertEqual(
+            first=created,
+            second={
+                "repo-00000:0": "2023-01-01T00:00:00+00:00",
+                "repo-00000:1": "2023-01-02T00:00:00+00:00",
+            },
+        )
+        for server in [storage, bucket]:
+            self.assertEqual(first=server.requests.get("GET"), second=2)
+            self.assertEqual(first=server.requests.get("CONNECT"), second=2)
+            self.assertIsNone(obj=server.requests.get("AUTHORIZATION"))
+
+    def test_bearer_token(self):
+        """Docker Client Bearer Token Authentication Test"""
+
+        with FakeRegistry(
+            repositories=2, tags=3, credentials=("scanner", "s3cr3t")
+        ) as registry:
+            with DockerRegistryClient(
+                registry_url=registry.url,
+                ca_file=registry.ca_file,
+                username="scanner",
+                password="s3cr3t",
+            ) as client:
+                images: list[str] = list(client.iter_images())
+                image_tags: list[str] = list(client.iter_image_tags(image=images[0]))
+                digests: dict[str, Optional[str]] = client.get_image_digests(
+                    image_tags=image_tags
+                )
+                self.assertEqual(
+                    first=list(client.iter_image_tags(image=images[0])),
+                    second=image_tags,
+                )
+
+            with DockerRegistryClient(
+                registry_url=registry.url,
+                ca_file=registry.ca_file,
+                username="scanner",
+                password="wrong",
+            ) as client, self.assertRaises(expected_exception=HTTPException):
+                list(client.iter_images())
+
+        self.assertEqual(first=len(images), second=2)
+        self.assertNotIn(member=None, container=digests.values())
+        # One token for the catalog and one for the repository, plus the
+        # token request rejected with the wrong password
+        self.assertEqual(first=registry.requests.get("TOKEN"), second=3)
+        self.assertEqual(first=len(registry.tokens), second=2)
@@ -0,0 +1,94 @@
+"""Layer Cache Tests"""
+
+from unittest import TestCase
+from os import makedirs, path
+from tempfile import TemporaryDirectory
+from layer_cache import LayerCache, parse_size
+
+
+class LayerCacheTests(TestCase):
+    """Layer Cache Tests Class"""
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parse_size(self):
+        """Test Size Parsing"""
+
+        self.assertEqual(first=parse_size(value=None), second=0)
+        self.assertEqual(first=parse_size(value="1024"), second=1024)
+        self.assertEqual(first=parse_size(value="512M"), second=512 * 1024**2)
+        self.assertEqual(first=parse_size(value="1.5GiB"), second=3 * 1024**3 // 2)
+        with self.assertRaises(expected_exception=ValueError):
+            parse_size(value="big")
+
+    def test_record(self):
+        """Test Layer Cache Hits, Misses And Least Recently Used Eviction"""
+
+        cache: LayerCache = LayerCache(cache_dir=self.tmp_dir.name, max_size=300)
+        self.assertEqual(first=cache.hit_ratio, second=1.0)
+        self.assertEqual(
+            first=cache.record(layers=[("sha256:base", 100), ("sha256:a", 100)]),
+            second=(0, 2),
+        )
+        self.assertEqual(
+            first=cache.record(layers=[("sha256:base", 100), ("sha256:b", 100)]),
+            second=(1, 1),
+        )
+        # 'sha256:a' is the least recently used layer
+        self.assertEqual(
+            first=cache.record(layers=[("sha256:base", 100), ("sha256:c", 100)]),
+            second=(1, 1),
+        )
+        self.assertEqual(first=cache.size, second=300)
+        self.assertEqual(
+            first=list(cache.layers), second=["sha256:b", "sha256:base", "sha256:c"]
+        )
+        self.assertEqual(first=cache.hit_ratio, second=2 / 6)
+
+        cache.save()
+        self.assertEqual(
+            first=LayerCache(cache_dir=self.tmp_dir.name).layers, second=cache.layers
+        )
+
+    def test_prune(self):
+        """Test Dropping The Trivy Scan Cache Over Its Maximum Size"""
+
+        cache: LayerCache = LayerCache(cache_dir=self.tmp_dir.name, max_size=1024)
+        cache.record(layers=[("sha256:base", 100)])
+        makedirs(name=cache.scan_cache_dir)
+        makedirs(name=path.join(self.tmp_dir.name, "db"))
+        for file_name in ["fanal/fanal.db", "db/trivy.db"]:
+            with open(file=path.join(self.tmp_dir.name, file_name), mode="wb") as file:
+                file.write(b"\0" * 2048)
+
+        with self.assertLogs(level="WARNING"):
+            self.assertTrue(expr=cache.prune())
+        self.assertFalse(expr=path.exists(cache.scan_cache_dir))
+        self.assertTrue(expr=path.isfile(path.join(self.tmp_dir.name, "db/trivy.db")))
+        self.assertEqual(first=len(cache.layers), second=0)
+        self.assertFalse(expr=cache.prune())
+
+    def test_prune_in_use(self):
+        """Test Keeping The Trivy Scan Cache Locked By Another Scanner"""
+
+        cache: LayerCache = LayerCache(cache_dir=self.tmp_dir.name, max_size=1024)
+        makedirs(name=cache.scan_cache_dir)
+        with open(file=path.join(cache.scan_cache_dir, "fanal.db"), mode="wb") as file:
+            file.write(b"\0" * 2048)
+
+        other_cache: LayerCache = LayerCache(cache_dir=self.tmp_dir.name)
+        other_cache.acquire()
+        with self.assertLogs(level="WARNING"):
+            self.assertFalse(expr=cache.prune())
+        self.assertTrue(expr=path.isdir(cache.scan_cache_dir))
+
+        other_cache.close()
+        with self.assertLogs(level="WARNING"):
+            self.assertTrue(expr=cache.prune())
+        cache.acquire()
+        cache.close()
+        self.assertFalse(expr=path.exists(cache.scan_cache_dir))
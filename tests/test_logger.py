@@ -0,0 +1,46 @@
+"""Logger Tests"""
+
+from unittest import TestCase
+from json import loads
+from logging import INFO, LogRecord, getLogger
+from queue import SimpleQueue
+from logger import JSONFormatter, use_log_queue
+
+
+class LoggerTests(TestCase):
+    """Logger Tests Class"""
+
+    def test_json_formatter(self):
+        """Test JSON Lines Log Format"""
+
+        record: LogRecord = LogRecord(
+            name="logger",
+            level=INFO,
+            pathname=__file__,
+            lineno=1,
+            msg="🟢 OK\t%s",
+            args=("alpine:3.7",),
+            exc_info=None,
+        )
+        entry: dict[str, str] = loads(JSONFormatter().format(record=record))
+
+        self.assertEqual(first=entry.get("level"), second="INFO")
+        self.assertEqual(first=entry.get("message"), second="🟢 OK\talpine:3.7")
+        self.assertEqual(first=entry.get("process"), second="MainProcess")
+        self.assertIn(member="time", container=entry)
+
+    def test_use_log_queue(self):
+        """Test Logging Through A Queue (e.g. in scan pool workers)"""
+
+        root_handlers: list = list(getLogger().handlers)
+        log_queue: SimpleQueue = SimpleQueue()
+        try:
+            use_log_queue(log_queue=log_queue)
+            getLogger("worker").warning("⌛ TIMEOUT\t%s", "alpine:3.7")
+        finally:
+            getLogger().handlers = root_handlers
+
+        self.assertEqual(
+            first=log_queue.get().getMessage(), second="⌛ TIMEOUT\talpine:3.7"
+        )
+        self.assertTrue(expr=log_queue.empty())
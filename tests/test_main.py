@@ -1,52 +1,458 @@
 """Main Tests"""
 
 from unittest import TestCase
-from json import dumps
-from typing import Any
-from main import export_scan_results, display_results
+from unittest.mock import patch, MagicMock
+from argparse import Namespace
+from contextlib import redirect_stdout
+from io import StringIO
+from json import dumps, loads
+from os import path
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, Optional
+from test_sweep import FakeDockerRegistryClient, FakeScanPool
+from docker_registry_client import DockerRegistryClient
+from layer_cache import LayerCache
+from report import ReportWriter, export_scan_results
+from main import (
+    export_report,
+    load_registries_config,
+    open_clients,
+    open_layer_cache,
+    open_report_writer,
+    open_scan_cache,
+    open_sweeps,
+    open_trivy_server,
+    parse_args,
+    run_command,
+    run_daemon,
+    run_query,
+    run_sweeps,
+    validate_config,
+)
+from registries import RegistryConfig
+from result_model import CompactResults
+from scan_cache import ScanCache
+from scanner_options import ScannerOptions
+from sweep import Sweep
+from trivy_server import TrivyServer
 
 
 class MainTests(TestCase):
     """Main Tests Class"""
 
-    def test_display_results(self):
-        """Test Display Results Function"""
-
-        results: dict[str, Any] = {
-            "fake-docker-registry.example.com/path/to/fake-alpine:123": {
-                "status": "OK"
-            },
-            "fake-docker-registry.example.com/path/to/fake-alpine:456": {
-                "status": "NOK",
-                "vulnerabilities": {"summary": {"HIGH": 5}},
-            },
-        }
-
-        results_list: list[str] = [
-            "🟢 OK\tfake-docker-registry.example.com/path/to/fake-alpine:123",
-            "🔴 NOK\tfake-docker-registry.example.com/path/to/fake-alpine:456"
-            " ({'HIGH': 5})",
-        ]
+    previous_results: dict[str, Any] = {
+        "registry.example.com:443/alpine:3.7": {"status": "OK"},
+        "registry.example.com:443/alpine:3.8": {"status": "OK"},
+    }
+
+    def test_parse_args(self):
+        """Test Parsing Command Line Arguments"""
+
+        args: Namespace = parse_args(args=[])
+        self.assertFalse(expr=args.resume or args.finalize or args.daemon)
+        self.assertIsNone(obj=args.merge)
+        self.assertIsNone(obj=args.query_diff)
+        self.assertIsNone(obj=args.query_rollup)
+
+        args = parse_args(args=["--resume", "--query-diff", "1", "2"])
+        self.assertTrue(expr=args.resume)
+        self.assertEqual(first=args.query_diff, second=[1, 2])
+
+        self.assertEqual(
+            first=parse_args(args=["--query-rollup"]).query_rollup, second=0
+        )
+        self.assertEqual(
+            first=parse_args(args=["--merge", "a.json", "b.jsonl"]).merge,
+            second=["a.json", "b.jsonl"],
+        )
+
+    @patch(target="config.DOCKER_REGISTRY_URL", new="https://registry.example.com")
+    def test_validate_config(self):
+        """Test Validating Configuration Of Command Line Arguments"""
+
+        validate_config(args=parse_args(args=[]))
+        for args in [["--resume"], ["--finalize"], ["--daemon"], ["--query-cve=CVE-1"]]:
+            with self.assertRaises(expected_exception=ValueError):
+                validate_config(args=parse_args(args=args))
+
+        with patch(target="config.SCAN_RESULTS_STREAM_FILE", new="results.jsonl"):
+            validate_config(args=parse_args(args=["--resume", "--daemon"]))
+            with patch(target="config.DOCKER_REGISTRIES_FILE", new="registries.json"):
+                with self.assertRaises(expected_exception=ValueError):
+                    validate_config(args=parse_args(args=["--daemon"]))
+
+        with patch(target="config.SHARD_INDEX", new=2), patch(
+            target="config.SHARD_COUNT", new=2
+        ):
+            with self.assertRaises(expected_exception=ValueError):
+                validate_config(args=parse_args(args=[]))
+
+    @patch(target="config.DOCKER_REGISTRY_URL", new=None)
+    def test_validate_config_commands(self):
+        """Test Validating Configuration Of Commands Without Registry"""
+
+        with self.assertRaises(expected_exception=ValueError):
+            validate_config(args=parse_args(args=[]))
+        validate_config(args=parse_args(args=["--merge", "shard-0.json"]))
+        with patch(target="config.RESULTS_DB_FILE", new="results.db"):
+            validate_config(args=parse_args(args=["--query-rollup"]))
+
+    @patch(target="main.run_query")
+    @patch(target="main.finalize_report")
+    @patch(target="main.merge_reports")
+    def test_run_command(
+        self, merge_reports: MagicMock, finalize_report: MagicMock, query: MagicMock
+    ):
+        """Test Running Query, Merge And Finalize Commands"""
+
+        self.assertFalse(expr=run_command(args=parse_args(args=["--resume"])))
+        self.assertTrue(expr=run_command(args=parse_args(args=["--query-cve=CVE-1"])))
+        self.assertTrue(expr=run_command(args=parse_args(args=["--merge", "a.json"])))
+        self.assertTrue(expr=run_command(args=parse_args(args=["--finalize"])))
+
+        self.assertEqual(first=query.call_count, second=1)
+        self.assertEqual(
+            first=merge_reports.call_args.kwargs.get("report_files"), second=["a.json"]
+        )
+        self.assertEqual(first=finalize_report.call_count, second=1)
+
+    @patch(target="main.ResultsQuery")
+    def test_run_query(self, results_query: MagicMock):
+        """Test Run Query Function Printing Tab Separated Rows"""
 
-        with self.assertLogs(level="INFO") as logging_watcher:
-            display_results(results=results)
-            for result_list in results_list:
-                self.assertIn(
-                    member=result_list,
-                    container=[
-                        ":".join(str(x).split(":")[2:]) for x in logging_watcher.output
-                    ],
+        query: MagicMock = results_query.return_value.__enter__.return_value
+        query.cve.return_value = [("registry.example.com:443/alpine:3.7", "HIGH")]
+        query.rollup.return_value = [("HIGH", 2, 1, 1, 1)]
+        query.diff.return_value = {"added": [("alpine:3.8", "CVE-1")], "removed": []}
+
+        output: StringIO = StringIO()
+        with redirect_stdout(output):
+            run_query(
+                args=parse_args(
+                    args=["--query-cve=CVE-1", "--query-rollup", "--query-diff", "1"]
                 )
+            )
+        self.assertEqual(
+            first=output.getvalue().splitlines(),
+            second=[
+                "registry.example.com:443/alpine:3.7\tHIGH",
+                "SEVERITY\tFINDINGS\tVULNERABILITIES\tDIGESTS\tTAGS",
+                "HIGH\t2\t1\t1\t1",
+                "added\talpine:3.8\tCVE-1",
+            ],
+        )
+        query.rollup.assert_called_once_with(run_id=None)
+        query.diff.assert_called_once_with(old_run_id=1, new_run_id=None)
+
+    def test_open_scan_cache(self):
+        """Test Open Scan Cache Function"""
+
+        with TemporaryDirectory() as tmp_dir:
+            self.assertIsNone(obj=open_scan_cache(options=ScannerOptions()))
+            with patch(target="config.SCAN_CACHE_FILE", new=f"{tmp_dir}/cache.db"):
+                with patch(target="main.get_database_version", return_value=None):
+                    with self.assertLogs(level="WARNING"):
+                        self.assertIsNone(obj=open_scan_cache(options=ScannerOptions()))
+                with patch(
+                    target="main.get_database_version", return_value="2:2023-09-14"
+                ):
+                    cache: Optional[ScanCache] = open_scan_cache(
+                        options=ScannerOptions()
+                    )
+                self.assertEqual(first=cache.db_version, second="2:2023-09-14")
+                cache.close()
+
+    def test_open_report_writer(self):
+        """Test Open Report Writer Function (stream truncated unless resumed)"""
+
+        with TemporaryDirectory() as tmp_dir:
+            self.assertIsNone(obj=open_report_writer(resume=False))
+            stream_file: str = f"{tmp_dir}/results.jsonl"
+            with patch(target="config.SCAN_RESULTS_STREAM_FILE", new=stream_file):
+                for resume, lines in [(True, 2), (False, 1)]:
+                    with open(file=stream_file, mode="w", encoding="UTF-8") as file:
+                        file.write('{"alpine:3.7": {"status": "OK"}}\n')
+                    report_writer: Optional[ReportWriter] = open_report_writer(
+                        resume=resume
+                    )
+                    report_writer.write(results={"alpine:3.8": {"status": "OK"}})
+                    report_writer.close()
+                    with open(file=stream_file, encoding="UTF-8") as file:
+                        self.assertEqual(first=len(file.readlines()), second=lines)
+
+    def test_export_report(self):
+        """Test Export Report Function (streamed and in-memory results)"""
+
+        with TemporaryDirectory() as tmp_dir:
+            report_file: str = f"{tmp_dir}/results.json"
+            scan_results: CompactResults = CompactResults()
+            scan_results.update(results={"alpine:3.7": {"status": "OK"}})
+            with patch(target="config.SCAN_RESULTS_REPORT_FILE", new=report_file):
+                export_report(report_writer=None, scan_results=scan_results)
+                with open(file=report_file, encoding="UTF-8") as file:
+                    self.assertIn(member="alpine:3.7", container=file.read())
 
-    def test_export_scan_results(self):
-        """Test Export Scan Results Function"""
+                report_writer: MagicMock = MagicMock()
+                with patch(target="main.finalize_report") as finalize_report:
+                    export_report(
+                        report_writer=report_writer, scan_results=scan_results
+                    )
+                report_writer.close.assert_called_once_with()
+                finalize_report.assert_called_once()
 
-        my_output_file: str = "/tmp/results.json"
-        my_dict: dict[str, str] = {"Hello": "Wolrd"}
+    def test_export_report_delta(self):
+        """Test Export Report Function With A Delta Report"""
 
-        export_scan_results(scan_results=my_dict, output_file=my_output_file)
+        with TemporaryDirectory() as tmp_dir:
+            report_file: str = f"{tmp_dir}/results.json"
+            delta_file: str = f"{tmp_dir}/delta.json"
+            export_scan_results(
+                scan_results={
+                    "alpine:3.7": {"status": "OK"},
+                    "alpine:3.8": {"status": "OK"},
+                },
+                output_file=report_file,
+            )
+            scan_results: CompactResults = CompactResults()
+            scan_results.update(results={"alpine:3.7": {"status": "OK"}})
+            with patch.multiple(
+                target="config",
+                SCAN_RESULTS_REPORT_FILE=report_file,
+                SCAN_RESULTS_DELTA_FILE=delta_file,
+            ):
+                with self.assertLogs(level="INFO"):
+                    export_report(report_writer=None, scan_results=scan_results)
+                with open(file=delta_file, encoding="UTF-8") as file:
+                    self.assertEqual(
+                        first=loads(file.read()).get("removed_tags"),
+                        second=["alpine:3.8"],
+                    )
+                self.assertTrue(expr=path.exists(f"{report_file}.previous"))
+
+                # No scan result: the previous report stays the latest one
+                with patch(target="main.finalize_report"):
+                    export_report(report_writer=MagicMock(), scan_results=scan_results)
+                with open(file=report_file, encoding="UTF-8") as file:
+                    self.assertEqual(
+                        first=list(loads(file.read())), second=["alpine:3.7"]
+                    )
+
+    def test_export_report_stream(self):
+        """Test Exporting Streamed Results With A Delta Report"""
+
+        with TemporaryDirectory() as tmp_dir:
+            report_file: str = f"{tmp_dir}/report.json"
+            delta_file: str = f"{tmp_dir}/delta.json"
+            export_scan_results(
+                scan_results=self.previous_results, output_file=report_file
+            )
+            with patch.multiple(
+                target="config",
+                SCAN_RESULTS_REPORT_FILE=report_file,
+                SCAN_RESULTS_STREAM_FILE=f"{tmp_dir}/report.jsonl",
+                SCAN_RESULTS_DELTA_FILE=delta_file,
+            ):
+                report_writer: ReportWriter = ReportWriter(
+                    report_file=f"{tmp_dir}/report.jsonl"
+                )
+                report_writer.write(
+                    results={"registry.example.com:443/alpine:3.7": {"status": "OK"}}
+                )
+                with self.assertLogs(level="INFO"):
+                    export_report(
+                        report_writer=report_writer, scan_results=CompactResults()
+                    )
 
-        with open(file=my_output_file, encoding="UTF-8") as my_file:
+            with open(file=report_file, encoding="UTF-8") as file:
+                self.assertEqual(
+                    first=list(loads(file.read())),
+                    second=["registry.example.com:443/alpine:3.7"],
+                )
+            self.assertTrue(expr=path.exists(f"{report_file}.previous"))
+            with open(file=delta_file, encoding="UTF-8") as file:
+                self.assertEqual(
+                    first=loads(file.read()).get("removed_tags"),
+                    second=["registry.example.com:443/alpine:3.8"],
+                )
+
+    def test_export_report_empty_stream(self):
+        """Test Exporting An Empty Stream Keeps The Previous Report"""
+
+        with TemporaryDirectory() as tmp_dir:
+            report_file: str = f"{tmp_dir}/report.json"
+            delta_file: str = f"{tmp_dir}/delta.json"
+            export_scan_results(
+                scan_results=self.previous_results, output_file=report_file
+            )
+            with patch.multiple(
+                target="config",
+                SCAN_RESULTS_REPORT_FILE=report_file,
+                SCAN_RESULTS_STREAM_FILE=f"{tmp_dir}/report.jsonl",
+                SCAN_RESULTS_DELTA_FILE=delta_file,
+            ):
+                with self.assertLogs(level="WARNING"):
+                    export_report(
+                        report_writer=ReportWriter(
+                            report_file=f"{tmp_dir}/report.jsonl"
+                        ),
+                        scan_results=CompactResults(),
+                    )
+
+            with open(file=report_file, encoding="UTF-8") as file:
+                self.assertEqual(first=loads(file.read()), second=self.previous_results)
+            self.assertFalse(expr=path.exists(f"{report_file}.previous"))
+            self.assertFalse(expr=path.exists(delta_file))
+
+    def test_open_layer_cache(self):
+        """Test Open Layer Cache Function (pruned when opened)"""
+
+        with TemporaryDirectory() as tmp_dir:
+            self.assertIsNone(obj=open_layer_cache())
+            with patch.multiple(
+                target="config", TRIVY_CACHE_DIR=tmp_dir, TRIVY_CACHE_MAX_SIZE="1G"
+            ), patch(target="main.LayerCache.prune") as prune:
+                layer_cache: Optional[LayerCache] = open_layer_cache()
+            self.assertEqual(first=layer_cache.max_size, second=1024**3)
+            self.assertIsNotNone(obj=layer_cache.shared_lock)
+            layer_cache.close()
+            prune.assert_called_once_with()
+
+    def test_open_trivy_server(self):
+        """Test Open Trivy Server Function (not started yet)"""
+
+        self.assertIsNone(obj=open_trivy_server())
+        with patch.multiple(
+            target="config",
+            TRIVY_SERVER_MODE=True,
+            TRIVY_SERVER_LISTEN="127.0.0.1:12345",
+        ):
+            trivy_server: Optional[TrivyServer] = open_trivy_server()
+        self.assertEqual(first=trivy_server.url, second="http://127.0.0.1:12345")
+        self.assertIsNone(obj=trivy_server.process)
+
+    @patch(target="config.DOCKER_REGISTRY_URL", new="https://registry.example.com")
+    def test_load_registries_config(self):
+        """Test Load Registries Configuration Function (file or environment)"""
+
+        self.assertEqual(
+            first=[registry.url for registry in load_registries_config()],
+            second=["https://registry.example.com"],
+        )
+        with TemporaryDirectory() as tmp_dir:
+            registries_file: str = f"{tmp_dir}/registries.json"
+            with open(file=registries_file, mode="w", encoding="UTF-8") as file:
+                file.write(
+                    dumps(
+                        [
+                            {"url": "https://a.example.com", "concurrency": 64},
+                            {"url": "https://b.example.com", "username": "scanner"},
+                        ]
+                    )
+                )
+            with patch.multiple(
+                target="config",
+                DOCKER_REGISTRIES_FILE=registries_file,
+                DOCKER_REGISTRY_USERNAME="admin",
+                REGISTRY_CONCURRENCY=8,
+            ):
+                registries: list[RegistryConfig] = load_registries_config()
+        self.assertEqual(
+            first=[
+                (registry.username, registry.concurrency) for registry in registries
+            ],
+            second=[(None, 8), ("scanner", 8)],
+        )
+
+    def test_open_sweeps(self):
+        """Test Open Clients And Sweeps Functions (one per registry)"""
+
+        registries: list[RegistryConfig] = [
+            RegistryConfig(url="https://a.example.com", rate_limit=10.0),
+            RegistryConfig(url="https://b.example.com:5000", concurrency=2),
+        ]
+        clients: list[DockerRegistryClient] = open_clients(registries=registries)
+        sweeps: list[Sweep] = open_sweeps(
+            registries=registries, clients=clients, options=ScannerOptions()
+        )
+        for client in clients:
+            client.close()
+
+        self.assertEqual(
+            first=[sweep.docker_registry for sweep in sweeps],
+            second=["a.example.com:443", "b.example.com:5000"],
+        )
+        self.assertIs(expr1=sweeps[0].scheduler, expr2=sweeps[1].scheduler)
+        self.assertEqual(
+            first=[sweep.metric_labels for sweep in sweeps],
+            second=[
+                {"registry": "a.example.com:443"},
+                {"registry": "b.example.com:5000"},
+            ],
+        )
+        self.assertEqual(first=sweeps[1].registry_concurrency, second=2)
+
+    @patch(target="main.ScanPool", new=FakeScanPool)
+    def test_run_sweeps(self):
+        """Test Run Sweeps Function (registries one after the other)"""
+
+        registries: list[RegistryConfig] = [
+            RegistryConfig(url="https://a.example.com", images_filter=r"^alpine$"),
+            RegistryConfig(url="https://b.example.com"),
+        ]
+        sweeps: list[MagicMock] = [MagicMock(), MagicMock()]
+        for sweep in sweeps:
+            sweep.client.iter_images.return_value = iter(["alpine", "ubuntu"])
+        run_sweeps(registries=registries, sweeps=sweeps, options=ScannerOptions())
+
+        for registry, sweep in zip(registries, sweeps):
+            self.assertEqual(
+                first=list(sweep.run.call_args.kwargs.get("images")),
+                second=["alpine", "ubuntu"],
+            )
             self.assertEqual(
-                first="".join(my_file.readlines()), second=dumps(obj=my_dict, indent=2)
+                first=sweep.client.iter_images.call_args.kwargs.get("pattern"),
+                second=registry.images_filter,
+            )
+        self.assertIs(
+            expr1=sweeps[0].run.call_args.kwargs.get("scan_pool"),
+            expr2=sweeps[1].run.call_args.kwargs.get("scan_pool"),
+        )
+
+    @patch(target="main.update_databases")
+    @patch(target="main.get_database_version")
+    @patch(target="main.signal")
+    @patch(target="main.Daemon")
+    def test_run_daemon(
+        self,
+        daemon: MagicMock,
+        _,
+        get_database_version: MagicMock,
+        update_databases: MagicMock,
+    ):
+        """Test Run Daemon Function (database updated before each rescan)"""
+
+        get_database_version.side_effect = [
+            "1:2023-09-13",
+            "1:2023-09-13",
+            "2:2023-09-14",
+        ]
+        trivy_server: MagicMock = MagicMock()
+        with TemporaryDirectory() as tmp_dir:
+            cache: MagicMock = MagicMock(db_version="1:2023-09-13")
+            sweep: Sweep = Sweep(
+                client=FakeDockerRegistryClient(), options=ScannerOptions(), cache=cache
+            )
+            with patch(target="config.SCAN_QUEUE_FILE", new=f"{tmp_dir}/q.sqlite"):
+                run_daemon(sweep=sweep, trivy_server=trivy_server)
+            daemon.return_value.run.assert_called_once_with()
+
+            before_rescan: Callable[[], None] = daemon.call_args.kwargs.get(
+                "before_rescan"
             )
+            before_rescan()
+            trivy_server.restart.assert_not_called()
+            with self.assertLogs(level="INFO"):
+                before_rescan()
+            trivy_server.restart.assert_called_once_with()
+            self.assertEqual(first=update_databases.call_count, second=2)
+            self.assertEqual(first=cache.db_version, second="2:2023-09-14")
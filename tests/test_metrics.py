@@ -0,0 +1,88 @@
+"""Metrics Tests"""
+
+from unittest import TestCase
+from unittest.mock import patch
+from tempfile import TemporaryDirectory
+from metrics import Metrics, Progress, format_labels
+
+
+class MetricsTests(TestCase):
+    """Metrics Tests Class"""
+
+    def test_format_labels(self):
+        """Test Labels Escaping"""
+
+        self.assertEqual(first=format_labels(()), second="")
+        self.assertEqual(
+            first=format_labels((("image", 'my"image\\'),), le="+Inf"),
+            second='{image="my\\"image\\\\",le="+Inf"}',
+        )
+
+    def test_to_openmetrics(self):
+        """Test OpenMetrics Rendering"""
+
+        metrics: Metrics = Metrics(prefix="test", buckets=(0.1, 1.0))
+        metrics.observe("duration_seconds", 0.05, phase="tags")
+        metrics.observe("duration_seconds", 0.5, phase="tags")
+        metrics.inc("tags", status="OK")
+        metrics.inc("tags", 2, status="OK")
+        metrics.set("images", 3)
+        with metrics.time("duration_seconds", phase="report"):
+            pass
+
+        self.assertEqual(
+            first=metrics.to_openmetrics().splitlines()[:8],
+            second=[
+                "# TYPE test_duration_seconds histogram",
+                'test_duration_seconds_bucket{phase="tags",le="0.1"} 1',
+                'test_duration_seconds_bucket{phase="tags",le="1.0"} 2',
+                'test_duration_seconds_bucket{phase="tags",le="+Inf"} 2',
+                'test_duration_seconds_count{phase="tags"} 2',
+                'test_duration_seconds_sum{phase="tags"} 0.55',
+                'test_duration_seconds_bucket{phase="report",le="0.1"} 1',
+                'test_duration_seconds_bucket{phase="report",le="1.0"} 1',
+            ],
+        )
+        self.assertEqual(
+            first=metrics.to_openmetrics().splitlines()[-5:],
+            second=[
+                "# TYPE test_tags counter",
+                'test_tags_total{status="OK"} 3',
+                "# TYPE test_images gauge",
+                "test_images 3",
+                "# EOF",
+            ],
+        )
+
+    def test_export(self):
+        """Test OpenMetrics Textfile Export"""
+
+        metrics: Metrics = Metrics()
+        metrics.set("images", 1)
+        with TemporaryDirectory() as tmp_dir:
+            metrics.export(output_file=f"{tmp_dir}/metrics.prom")
+            with open(
+                file=f"{tmp_dir}/metrics.prom", mode="r", encoding="UTF-8"
+            ) as file:
+                self.assertEqual(first=file.read(), second=metrics.to_openmetrics())
+
+    @patch("metrics.monotonic")
+    def test_progress(self, mock_monotonic):
+        """Test Progress Line Interval And ETA"""
+
+        mock_monotonic.return_value = 0.0
+        progress: Progress = Progress(interval=60.0)
+
+        mock_monotonic.return_value = 30.0
+        self.assertIsNone(obj=progress.update(done=10, discovered=100))
+
+        mock_monotonic.return_value = 60.0
+        self.assertEqual(
+            first=progress.update(done=20, discovered=100),
+            second="⏱️ 20/100 tags done in 60s"
+            " (0.33 tags/s, ETA for discovered tags: 240s)",
+        )
+
+        mock_monotonic.return_value = 61.0
+        self.assertIsNone(obj=progress.update(done=21, discovered=100))
+        self.assertIsNotNone(obj=progress.update(done=21, discovered=100, force=True))
@@ -0,0 +1,68 @@
+"""Rate Limiter Tests"""
+
+from unittest import TestCase
+from unittest.mock import patch
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from rate_limiter import RateLimiter, retry_delay
+
+
+class RateLimiterTests(TestCase):
+    """Rate Limiter Tests Class"""
+
+    @patch("rate_limiter.sleep")
+    @patch("rate_limiter.monotonic", return_value=100.0)
+    def test_acquire(self, mock_monotonic, mock_sleep):
+        """Test Token Bucket Burst And Rate"""
+
+        rate_limiter: RateLimiter = RateLimiter(rate=10.0, burst=2)
+        waits: list[float] = [rate_limiter.acquire() for _ in range(4)]
+        self.assertEqual(first=waits[:2], second=[0.0, 0.0])
+        self.assertAlmostEqual(first=waits[2], second=0.1)
+        self.assertAlmostEqual(first=waits[3], second=0.2)
+        self.assertEqual(first=mock_sleep.call_count, second=2)
+
+        # Debt is paid after 0.2s, then the burst refills after 0.2s more
+        mock_monotonic.return_value = 100.4
+        self.assertEqual(first=rate_limiter.acquire(), second=0.0)
+        self.assertEqual(first=rate_limiter.acquire(), second=0.0)
+
+    @patch("rate_limiter.sleep")
+    @patch("rate_limiter.monotonic", return_value=100.0)
+    def test_pause(self, _, mock_sleep):
+        """Test Pausing Every Caller"""
+
+        rate_limiter: RateLimiter = RateLimiter(rate=10.0, burst=5)
+        rate_limiter.pause(seconds=2.0)
+        self.assertAlmostEqual(first=rate_limiter.acquire(), second=2.1)
+        mock_sleep.assert_called_once()
+
+    def test_unlimited(self):
+        """Test Disabled Rate Limiter"""
+
+        rate_limiter: RateLimiter = RateLimiter()
+        rate_limiter.pause(seconds=10.0)
+        self.assertEqual(first=rate_limiter.acquire(tokens=1000.0), second=0.0)
+
+    def test_retry_delay(self):
+        """Test Retry Delay Backoff And Retry-After"""
+
+        for attempt in range(10):
+            self.assertLessEqual(
+                a=retry_delay(attempt=attempt), b=min(0.5 * 2**attempt, 60.0)
+            )
+        self.assertEqual(first=retry_delay(attempt=0, retry_after="7"), second=7.0)
+        self.assertEqual(first=retry_delay(attempt=0, retry_after="3600"), second=60.0)
+        self.assertAlmostEqual(
+            first=retry_delay(
+                attempt=0,
+                retry_after=format_datetime(
+                    datetime.now(tz=timezone.utc) + timedelta(seconds=30), usegmt=True
+                ),
+            ),
+            second=30.0,
+            delta=1.5,
+        )
+        self.assertEqual(
+            first=retry_delay(attempt=3, retry_after="invalid"), second=4.0
+        )
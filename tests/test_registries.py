@@ -0,0 +1,86 @@
+"""Registries Tests"""
+
+from unittest import TestCase
+from json import dumps
+from tempfile import TemporaryDirectory
+from typing import Any
+from registries import RegistryConfig, load_registries
+
+
+class RegistriesTests(TestCase):
+    """Registries Tests Class"""
+
+    defaults: RegistryConfig = RegistryConfig(
+        url="https://registry.example.com",
+        ca_file="/etc/ssl/registry.pem",
+        username="scanner",
+        password="s3cr3t",
+        tags_filter=r"^v",
+        concurrency=8,
+    )
+
+    def load(self, registries: Any, max_concurrency: int = 0) -> list[RegistryConfig]:
+        """Load Registries From A Temporary File Method"""
+
+        with TemporaryDirectory() as tmp_dir:
+            with open(
+                file=f"{tmp_dir}/registries.json", mode="w", encoding="UTF-8"
+            ) as file:
+                file.write(dumps(registries))
+            return load_registries(
+                registries_file=f"{tmp_dir}/registries.json",
+                defaults=self.defaults,
+                max_concurrency=max_concurrency,
+            )
+
+    def test_load_registries(self):
+        """Test Loading Registries With Defaults And Concurrency Cap"""
+
+        registries: list[RegistryConfig] = self.load(
+            registries=[
+                {"url": "https://registry.example.com"},
+                {
+                    "url": "https://other.example.com:5000",
+                    "ca_file": "/etc/ssl/other.pem",
+                    "tags_filter": r".*",
+                    "rate_limit": 5.0,
+                    "concurrency": 2,
+                },
+            ],
+            max_concurrency=4,
+        )
+
+        self.assertEqual(
+            first=registries,
+            second=[
+                RegistryConfig(
+                    url="https://registry.example.com", tags_filter=r"^v", concurrency=4
+                ),
+                RegistryConfig(
+                    url="https://other.example.com:5000",
+                    ca_file="/etc/ssl/other.pem",
+                    rate_limit=5.0,
+                    concurrency=2,
+                ),
+            ],
+        )
+        self.assertEqual(
+            first=[registry.docker_registry for registry in registries],
+            second=["registry.example.com:443", "other.example.com:5000"],
+        )
+
+    def test_load_registries_errors(self):
+        """Test Invalid Registries Files"""
+
+        for registries in [
+            [],
+            {"url": "https://registry.example.com"},
+            [{"ca_file": "/etc/ssl/other.pem"}],
+            [{"url": "https://registry.example.com", "token": "s3cr3t"}],
+            [
+                {"url": "https://registry.example.com"},
+                {"url": "https://registry.example.com:443"},
+            ],
+        ]:
+            with self.assertRaises(expected_exception=ValueError):
+                self.load(registries=registries)
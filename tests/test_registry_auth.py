@@ -0,0 +1,73 @@
+"""Registry Authentication Tests"""
+
+from unittest import TestCase
+from registry_auth import RegistryAuth, parse_challenge, request_scope
+
+
+class RegistryAuthTests(TestCase):
+    """Registry Authentication Tests Class"""
+
+    def test_parse_challenge(self):
+        """Test 'WWW-Authenticate' Header Parsing"""
+
+        self.assertEqual(
+            first=parse_challenge(
+                header='Bearer realm="https://auth.example.com/token",'
+                'service="registry.example.com",scope="repository:alpine:pull"'
+            ),
+            second=(
+                "bearer",
+                {
+                    "realm": "https://auth.example.com/token",
+                    "service": "registry.example.com",
+                    "scope": "repository:alpine:pull",
+                },
+            ),
+        )
+        self.assertEqual(
+            first=parse_challenge(header='Basic realm="Registry"'),
+            second=("basic", {"realm": "Registry"}),
+        )
+
+    def test_request_scope(self):
+        """Test Token Scope Of Docker Registry API URLs"""
+
+        self.assertEqual(
+            first=request_scope(url="/path/v2/_catalog?n=100"),
+            second="registry:catalog:*",
+        )
+        self.assertEqual(
+            first=request_scope(url="/v2/library/alpine/tags/list?n=100"),
+            second="repository:library/alpine:pull",
+        )
+        self.assertEqual(
+            first=request_scope(url="/v2/alpine/manifests/3.7"),
+            second="repository:alpine:pull",
+        )
+        self.assertIsNone(obj=request_scope(url="/v2/"))
+
+    def test_basic(self):
+        """Test Basic Challenge"""
+
+        auth: RegistryAuth = RegistryAuth(username="user", password="pass")
+        self.assertEqual(first=auth.headers(url="/v2/_catalog"), second={})
+        self.assertTrue(
+            expr=auth.authenticate(
+                url="/v2/_catalog", challenge='Basic realm="Registry"', sent_headers={}
+            )
+        )
+        self.assertEqual(
+            first=auth.headers(url="/v2/_catalog"),
+            second={"Authorization": "Basic dXNlcjpwYXNz"},
+        )
+        # Credentials already sent and rejected
+        self.assertFalse(
+            expr=auth.authenticate(
+                url="/v2/_catalog", challenge='Basic realm="Registry"', sent_headers={}
+            )
+        )
+        self.assertFalse(
+            expr=RegistryAuth().authenticate(
+                url="/v2/_catalog", challenge='Basic realm="Registry"', sent_headers={}
+            )
+        )
@@ -0,0 +1,272 @@
+"""Report Tests"""
+
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from json import dumps, loads
+from os import path
+from typing import Any
+from report import (
+    ReportWriter,
+    StatusLog,
+    export_scan_results,
+    display_results,
+    finalize_report,
+    is_empty_report,
+    merge_reports,
+    read_scanned_tags,
+    truncate_torn_line,
+    write_report,
+)
+
+
+class ReportTests(TestCase):
+    """Report Tests Class"""
+
+    def test_display_results(self):
+        """Test Display Results Function"""
+
+        results: dict[str, Any] = {
+            "fake-docker-registry.example.com/path/to/fake-alpine:123": {
+                "status": "OK"
+            },
+            "fake-docker-registry.example.com/path/to/fake-alpine:456": {
+                "status": "NOK",
+                "vulnerabilities": {"summary": {"HIGH": 5}},
+            },
+            "fake-docker-registry.example.com/path/to/fake-alpine:789": {
+                "status": "TIMEOUT",
+                "timeout": 600.0,
+            },
+            "fake-docker-registry.example.com/path/to/fake-alpine:abc": {
+                "status": "FAILED",
+                "exit_code": 1,
+            },
+        }
+
+        results_list: list[str] = [
+            "🟢 OK\tfake-docker-registry.example.com/path/to/fake-alpine:123",
+            "🔴 NOK\tfake-docker-registry.example.com/path/to/fake-alpine:456"
+            " ({'HIGH': 5})",
+            "⌛ TIMEOUT\tfake-docker-registry.example.com/path/to/fake-alpine:789"
+            " (600.0s)",
+            "🔥 FAILED\tfake-docker-registry.example.com/path/to/fake-alpine:abc (1)",
+        ]
+
+        with self.assertLogs(level="INFO") as logging_watcher:
+            display_results(results=results)
+            for result_list in results_list:
+                self.assertIn(
+                    member=result_list,
+                    container=[
+                        ":".join(str(x).split(":")[2:]) for x in logging_watcher.output
+                    ],
+                )
+
+    def test_status_log(self):
+        """Test Status Lines Rate-Limited And Summarized"""
+
+        status_log: StatusLog = StatusLog(interval=3600, max_lines=2)
+        with self.assertLogs(level="INFO") as logging_watcher:
+            status_log.log(
+                results={f"alpine:{index}": {"status": "OK"} for index in range(5)}
+            )
+            status_log.log(results={"alpine:3.7": {"status": "NOK"}, "alpine:3.8": {}})
+            status_log.flush()
+            status_log.log(results={"alpine:latest": {"status": "OK"}})
+
+        self.assertEqual(first=len(logging_watcher.output), second=4)
+        self.assertIn(
+            member="5 more Docker tags in 0s: {'FAILED': 1, 'NOK': 1, 'OK': 3}",
+            container=logging_watcher.output[2],
+        )
+        self.assertIn(member="alpine:latest", container=logging_watcher.output[3])
+
+    def test_export_scan_results(self):
+        """Test Export Scan Results Function"""
+
+        my_output_file: str = "/tmp/results.json"
+        my_dict: dict[str, str] = {"Hello": "Wolrd"}
+
+        export_scan_results(scan_results=my_dict, output_file=my_output_file)
+
+        with open(file=my_output_file, encoding="UTF-8") as my_file:
+            self.assertEqual(
+                first="".join(my_file.readlines()), second=dumps(obj=my_dict, indent=2)
+            )
+
+    def test_report_writer(self):
+        """Test Report Writer, Resume And Finalize"""
+
+        scan_results: dict[str, Any] = {
+            "fake-docker-registry.example.com/fake-alpine:123": {"status": "OK"},
+            "fake-docker-registry.example.com/fake-alpine:456": {
+                "status": "NOK",
+                "vulnerabilities": {"summary": {"HIGH": 5}},
+            },
+            "fake-docker-registry.example.com/path/to/fake-alpine:789": {
+                "status": "TIMEOUT",
+                "timeout": 600.0,
+            },
+            "fake-docker-registry.example.com/path/to/fake-alpine:abc": {
+                "status": "FAILED",
+                "exit_code": 1,
+            },
+        }
+
+        with TemporaryDirectory() as tmp_dir:
+            report_file: str = f"{tmp_dir}/results.jsonl"
+            output_file: str = f"{tmp_dir}/results.json"
+
+            self.assertEqual(
+                first=read_scanned_tags(report_file=report_file), second=set()
+            )
+
+            with ReportWriter(report_file=report_file, fsync_every=1) as writer:
+                writer.write(results=scan_results)
+
+            # Simulate a crash in the middle of a line
+            with open(file=report_file, mode="a", encoding="UTF-8") as my_file:
+                my_file.write('{"fake-docker-registry.example.com/fake-alpine:789": {')
+
+            with self.assertLogs(level="WARNING"):
+                self.assertEqual(
+                    first=read_scanned_tags(report_file=report_file),
+                    second={
+                        "fake-docker-registry.example.com/fake-alpine:123",
+                        "fake-docker-registry.example.com/fake-alpine:456",
+                    },
+                )
+
+            # Resume: the torn line is truncated before appending
+            resumed_results: dict[str, Any] = {
+                "fake-docker-registry.example.com/fake-alpine:def": {"status": "OK"}
+            }
+            with self.assertLogs(level="WARNING"):
+                with ReportWriter(report_file=report_file, fsync_every=1) as writer:
+                    writer.write(results=resumed_results)
+
+            with self.assertLogs(level="INFO"):
+                finalize_report(report_file=report_file, output_file=output_file)
+
+            with open(file=output_file, encoding="UTF-8") as my_file:
+                output: str = my_file.read()
+            scan_results.update(resumed_results)
+            self.assertEqual(first=output, second=dumps(obj=scan_results, indent=2))
+            self.assertEqual(first=loads(output), second=scan_results)
+
+    def test_finalize_empty_report(self):
+        """Test Finalizing An Empty JSON Lines Report Keeps The Previous One"""
+
+        with TemporaryDirectory() as tmp_dir:
+            report_file: str = f"{tmp_dir}/results.jsonl"
+            output_file: str = f"{tmp_dir}/results.json"
+            self.assertTrue(expr=is_empty_report(report_file=output_file))
+            export_scan_results(
+                scan_results={"registry.example.com/alpine:3.7": {"status": "OK"}},
+                output_file=output_file,
+            )
+            self.assertFalse(expr=is_empty_report(report_file=output_file))
+            with ReportWriter(report_file=report_file):
+                pass
+
+            with self.assertLogs(level="WARNING"):
+                finalize_report(report_file=report_file, output_file=output_file)
+
+            self.assertEqual(
+                first=write_report(entries=[], output_file=output_file), second=0
+            )
+            with open(file=output_file, encoding="UTF-8") as my_file:
+                self.assertEqual(
+                    first=loads(my_file.read()),
+                    second={"registry.example.com/alpine:3.7": {"status": "OK"}},
+                )
+
+    def test_truncate_torn_line(self):
+        """Test Truncating A Torn Last Line Spanning Several Chunks"""
+
+        with TemporaryDirectory() as tmp_dir:
+            report_file: str = f"{tmp_dir}/results.jsonl"
+            with open(file=report_file, mode="w", encoding="UTF-8") as my_file:
+                my_file.write('{"alpine:3.7": {"status": "OK"}}\n{"alpine:3.8": {"st')
+            with self.assertLogs(level="WARNING"):
+                truncate_torn_line(report_file=report_file, chunk_size=4)
+            with open(file=report_file, encoding="UTF-8") as my_file:
+                self.assertEqual(
+                    first=my_file.read(), second='{"alpine:3.7": {"status": "OK"}}\n'
+                )
+
+            with open(file=report_file, mode="w", encoding="UTF-8") as my_file:
+                my_file.write('{"alpine:3.8": {"st')
+            with self.assertLogs(level="WARNING"):
+                truncate_torn_line(report_file=report_file, chunk_size=4)
+            self.assertEqual(first=path.getsize(report_file), second=0)
+
+    def test_read_scanned_tags(self):
+        """Test Resumed Tags Limited To Tags Last Scanned OK Or NOK"""
+
+        with TemporaryDirectory() as tmp_dir:
+            report_file: str = f"{tmp_dir}/results.jsonl"
+            with ReportWriter(report_file=report_file) as writer:
+                writer.write(
+                    results={
+                        "registry.example.com/alpine:3.7": {"status": "OK"},
+                        "registry.example.com/alpine:3.8": {"status": "SKIPPED"},
+                        "registry.example.com/alpine:3.9": {"status": "FAILED"},
+                        "registry.example.com/alpine:3.10": {"status": "TIMEOUT"},
+                        "registry.example.com/alpine:3.11": None,
+                    }
+                )
+                writer.write(
+                    results={
+                        "registry.example.com/alpine:3.9": {"status": "NOK"},
+                        "registry.example.com/alpine:3.7": {"status": "SKIPPED"},
+                    }
+                )
+
+            self.assertEqual(
+                first=read_scanned_tags(report_file=report_file),
+                second={"registry.example.com/alpine:3.9"},
+            )
+
+    def test_merge_reports(self):
+        """Test Merging Aggregated And JSON Lines Shard Reports"""
+
+        shard_results: list[dict[str, Any]] = [
+            {"registry.example.com/alpine:3.7": {"status": "OK"}},
+            {
+                "registry.example.com/ubuntu:22.04": {
+                    "status": "NOK",
+                    "vulnerabilities": {"summary": {"HIGH": 5}},
+                },
+                "registry.example.com/python:3.11": {"status": "OK"},
+            },
+        ]
+
+        with TemporaryDirectory() as tmp_dir:
+            output_file: str = f"{tmp_dir}/merged.json"
+            export_scan_results(
+                scan_results=shard_results[0], output_file=f"{tmp_dir}/shard-0.json"
+            )
+            with ReportWriter(report_file=f"{tmp_dir}/shard-1.jsonl") as writer:
+                writer.write(results=shard_results[1])
+                writer.write(results={"registry.example.com/alpine:3.7": {}})
+            # Shards without any scan result have no report
+            export_scan_results(scan_results={}, output_file=f"{tmp_dir}/shard-2.json")
+
+            with self.assertLogs(level="INFO"):
+                merge_reports(
+                    report_files=[
+                        f"{tmp_dir}/shard-0.json",
+                        f"{tmp_dir}/shard-1.jsonl",
+                        f"{tmp_dir}/shard-2.json",
+                    ],
+                    output_file=output_file,
+                )
+
+            with open(file=output_file, encoding="UTF-8") as my_file:
+                self.assertEqual(
+                    first=my_file.read(),
+                    second=dumps(
+                        obj={**shard_results[0], **shard_results[1]}, indent=2
+                    ),
+                )
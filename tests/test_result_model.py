@@ -0,0 +1,74 @@
+"""Result Model Tests"""
+
+from unittest import TestCase
+from json import dumps
+from typing import Any
+from deduplication import fan_out_results
+from result_model import CompactResults
+
+
+class ResultModelTests(TestCase):
+    """Result Model Tests Class"""
+
+    my_docker_registry: str = "docker-registry.example.com:12345"
+    scan_result: dict[str, Any] = {
+        "status": "NOK",
+        "created": "2019-03-07T22:19:53.447205048Z",
+        "id": "sha256:6d1ef012",
+        "labels": {"maintainer": "me"},
+        "vulnerabilities": {
+            "os-pkgs (alpine:3.7 (alpine 3.7.3))": [
+                "CVE-2019-14697 (CRITICAL)",
+                "CVE-2019-5747 (HIGH)",
+            ],
+            "secret (/etc/key)": ["private-key (HIGH)", "no severity"],
+            "summary": {"HIGH": 2, "CRITICAL": 1},
+        },
+    }
+
+    def test_round_trip(self):
+        """Test Compact Results Unpacked To The Report Format"""
+
+        results: dict[str, Any] = fan_out_results(
+            results={f"{self.my_docker_registry}/alpine:3.7": self.scan_result},
+            docker_registry=self.my_docker_registry,
+            groups={"alpine:3.7": ["alpine:3.7", "alpine:latest"]},
+            digests={"alpine:3.7": "sha256:1", "alpine:latest": "sha256:1"},
+        )
+        results.update(
+            {
+                f"{self.my_docker_registry}/alpine:3.6": {"status": "OK"},
+                f"{self.my_docker_registry}/alpine:3.5": {},
+                f"{self.my_docker_registry}/alpine:3.4": None,
+            }
+        )
+        compact_results: CompactResults = CompactResults()
+        compact_results.update(results)
+
+        self.assertEqual(first=compact_results, second=results)
+        self.assertEqual(
+            first=dumps(dict(compact_results.items()), indent=2),
+            second=dumps(results, indent=2),
+        )
+        self.assertIs(
+            expr1=compact_results.results[
+                f"{self.my_docker_registry}/alpine:3.7"
+            ].fields[4][1],
+            expr2=compact_results.results[
+                f"{self.my_docker_registry}/alpine:latest"
+            ].fields[4][1],
+        )
+
+    def test_interning(self):
+        """Test Findings Stored Once Across Images"""
+
+        compact_results: CompactResults = CompactResults()
+        for index in range(100):
+            compact_results.update({f"alpine:{index}": dict(self.scan_result)})
+
+        self.assertEqual(first=len(compact_results), second=100)
+        self.assertEqual(first=len(compact_results.findings), second=4)
+        self.assertEqual(
+            first=dict(compact_results["alpine:99"]).get("vulnerabilities"),
+            second=self.scan_result["vulnerabilities"],
+        )
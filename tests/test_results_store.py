@@ -0,0 +1,133 @@
+"""Results Store Tests"""
+
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from typing import Any
+from results_store import ResultsQuery, ResultsStore, iter_findings
+
+
+def result(digest: str, *findings: str, **fields: Any) -> dict[str, Any]:
+    """Get Scan Result Function (os-pkgs findings of `digest`)"""
+
+    return {
+        "status": "NOK" if findings else "OK",
+        "digest": digest,
+        "vulnerabilities": {
+            "os-pkgs (alpine (alpine 3.7.3))": list(findings),
+            "summary": {"HIGH": len(findings)},
+        },
+        **fields,
+    }
+
+
+class ResultsStoreTests(TestCase):
+    """Results Store Tests Class"""
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.results_file: str = f"{self.tmp_dir.name}/results.sqlite"
+        first_run: ResultsStore = ResultsStore(results_file=self.results_file)
+        first_run.write(
+            results={
+                "alpine:3.7": result("sha256:1", "CVE-1 (HIGH)", "CVE-2 (HIGH)"),
+                "alpine:latest": result(
+                    "sha256:1", "CVE-1 (HIGH)", "CVE-2 (HIGH)", deduplicated=True
+                ),
+                "alpine:3.6": result("sha256:2", "CVE-1 (HIGH)"),
+            }
+        )
+        first_run.close()
+        second_run: ResultsStore = ResultsStore(results_file=self.results_file)
+        second_run.write(
+            results={
+                "alpine:3.7": result("sha256:1", "CVE-1 (HIGH)", "CVE-2 (HIGH)"),
+                "alpine:latest": result("sha256:3", "CVE-3 (CRITICAL)"),
+                "alpine:3.8": {"status": "SKIPPED", "digest": "sha256:4"},
+            }
+        )
+        second_run.close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_iter_findings(self):
+        """Test Iterating Findings Of A Scan Result"""
+
+        self.assertEqual(
+            first=list(iter_findings(result=result("sha256:1", "CVE-1 (HIGH)"))),
+            second=[("os-pkgs", "alpine (alpine 3.7.3)", "CVE-1", "HIGH")],
+        )
+        self.assertEqual(first=list(iter_findings(result={"status": "OK"})), second=[])
+
+    def test_deduplication(self):
+        """Test Unchanged Results Stored Once Across Runs"""
+
+        with ResultsQuery(results_file=self.results_file) as query:
+            self.assertEqual(first=query.runs(), second=[2, 1])
+            self.assertEqual(
+                first=query.connection.execute(
+                    "SELECT COUNT(*) FROM results"
+                ).fetchone(),
+                second=(4,),
+            )
+            self.assertEqual(
+                first=query.connection.execute(
+                    "SELECT COUNT(*) FROM tags WHERE deduplicated"
+                ).fetchone(),
+                second=(1,),
+            )
+
+    def test_cve(self):
+        """Test Docker Image Tags Affected By A Vulnerability"""
+
+        with ResultsQuery(results_file=self.results_file) as query:
+            self.assertEqual(
+                first=query.cve(vuln_id="CVE-1"),
+                second=[
+                    (
+                        "alpine:3.7",
+                        "sha256:1",
+                        "HIGH",
+                        "os-pkgs",
+                        "alpine (alpine 3.7.3)",
+                    )
+                ],
+            )
+            self.assertEqual(
+                first=[row[0] for row in query.cve(vuln_id="CVE-1", run_id=1)],
+                second=["alpine:3.6", "alpine:3.7", "alpine:latest"],
+            )
+
+    def test_diff(self):
+        """Test Differences Between The Latest Two Runs"""
+
+        with ResultsQuery(results_file=self.results_file) as query:
+            self.assertEqual(
+                first=query.diff(),
+                second={
+                    "added_tags": [("alpine:3.8",)],
+                    "removed_tags": [("alpine:3.6",)],
+                    "new_findings": [("alpine:latest", "CVE-3", "CRITICAL")],
+                    "fixed_findings": [
+                        ("alpine:3.6", "CVE-1", "HIGH"),
+                        ("alpine:latest", "CVE-1", "HIGH"),
+                        ("alpine:latest", "CVE-2", "HIGH"),
+                    ],
+                },
+            )
+            self.assertEqual(
+                first=query.diff(old_run_id=2, new_run_id=1)["added_tags"],
+                second=[("alpine:3.6",)],
+            )
+
+    def test_rollup(self):
+        """Test Severity Rollup Of A Run"""
+
+        with ResultsQuery(results_file=self.results_file) as query:
+            self.assertEqual(
+                first=query.rollup(),
+                second=[("HIGH", 2, 2, 1, 1), ("CRITICAL", 1, 1, 1, 1)],
+            )
+            self.assertEqual(
+                first=query.rollup(run_id=1), second=[("HIGH", 5, 2, 2, 3)]
+            )
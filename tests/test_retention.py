@@ -0,0 +1,86 @@
+"""Tag Retention Tests"""
+
+from unittest import TestCase
+from unittest.mock import patch
+from retention import TagRetention, parse_semver
+
+
+class TagRetentionTests(TestCase):
+    """Tag Retention Tests Class"""
+
+    image_tags: list[str] = [
+        "alpine:latest",
+        "alpine:v1.2",
+        "alpine:1.10.0",
+        "alpine:1.9.3",
+        "alpine:2.0.0-rc.1",
+        "alpine:2.0.0-rc.10",
+        "alpine:ci-4f2a9c1",
+    ]
+    created: dict[str, str] = {
+        "alpine:latest": "2023-09-14T08:00:00Z",
+        "alpine:v1.2": "2023-01-01T00:00:00Z",
+        "alpine:1.10.0": "2023-06-01T00:00:00Z",
+        "alpine:1.9.3": "2023-05-01T00:00:00Z",
+        "alpine:2.0.0-rc.1": "2023-08-01T00:00:00Z",
+        "alpine:2.0.0-rc.10": "2023-08-15T00:00:00Z",
+        "alpine:ci-4f2a9c1": "2023-09-01T00:00:00Z",
+    }
+
+    def test_parse_semver(self):
+        """Test Semantic Version Parsing And Ordering"""
+
+        self.assertEqual(first=parse_semver(tag="v1.2"), second=(1, 2, 0, 1, ()))
+        self.assertIsNone(obj=parse_semver(tag="latest"))
+        self.assertIsNone(obj=parse_semver(tag="1"))
+        self.assertEqual(
+            first=sorted(
+                ["1.10.0", "1.9.3", "2.0.0", "2.0.0-rc.10", "2.0.0-rc.1", "2.0.0-beta"],
+                key=parse_semver,
+            ),
+            second=[
+                "1.9.3",
+                "1.10.0",
+                "2.0.0-beta",
+                "2.0.0-rc.1",
+                "2.0.0-rc.10",
+                "2.0.0",
+            ],
+        )
+
+    def test_select_semver(self):
+        """Test Keeping The Latest Tags By Semantic Version"""
+
+        self.assertFalse(expr=TagRetention())
+        self.assertEqual(
+            first=TagRetention().select(image_tags=self.image_tags),
+            second=self.image_tags,
+        )
+        retention: TagRetention = TagRetention(keep_semver=2)
+        self.assertFalse(expr=retention.needs_created)
+        self.assertEqual(
+            first=retention.select(image_tags=self.image_tags),
+            second=["alpine:2.0.0-rc.1", "alpine:2.0.0-rc.10"],
+        )
+
+    def test_select_recent(self):
+        """Test Keeping The Latest Tags By Image Creation Date"""
+
+        retention: TagRetention = TagRetention(keep_semver=1, keep_recent=2)
+        self.assertTrue(expr=retention.needs_created)
+        self.assertEqual(
+            first=retention.select(image_tags=self.image_tags, created=self.created),
+            second=["alpine:latest", "alpine:2.0.0-rc.10", "alpine:ci-4f2a9c1"],
+        )
+
+    @patch("retention.time", return_value=1694764800.0)
+    def test_select_max_age(self, _):
+        """Test Keeping Only Tags Of Recently Created Images"""
+
+        self.assertEqual(
+            first=TagRetention(max_age=30 * 86400).select(
+                image_tags=self.image_tags,
+                created={**self.created, "alpine:1.9.3": None},
+            ),
+            second=["alpine:latest", "alpine:1.9.3", "alpine:ci-4f2a9c1"],
+        )
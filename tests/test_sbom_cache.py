@@ -0,0 +1,46 @@
+"""SBOM Cache Tests"""
+
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from sbom_cache import SBOMCache
+
+
+class SBOMCacheTests(TestCase):
+    """SBOM Cache Tests Class"""
+
+    def test_get_set(self):
+        """Test SBOM Cache Get/Set"""
+
+        with TemporaryDirectory() as tmp_dir:
+            cache: SBOMCache = SBOMCache(cache_dir=f"{tmp_dir}/sboms")
+            self.assertEqual(
+                first=cache.sbom_file(digest="sha256:1234"),
+                second=f"{tmp_dir}/sboms/sha256_1234.cdx.json",
+            )
+            self.assertIsNone(
+                obj=cache.get(digest="sha256:1234", severity="HIGH", scanners="vuln")
+            )
+
+            # Metadata without SBOM is not usable
+            cache.set(
+                digest="sha256:1234",
+                metadata={"severity": "HIGH", "scanners": "vuln", "id": "abc"},
+            )
+            self.assertIsNone(
+                obj=cache.get(digest="sha256:1234", severity="HIGH", scanners="vuln")
+            )
+
+            with open(
+                file=cache.sbom_file(digest="sha256:1234"), mode="w", encoding="UTF-8"
+            ) as sbom_file:
+                sbom_file.write("{}")
+            self.assertEqual(
+                first=cache.get(digest="sha256:1234", severity="HIGH", scanners="vuln"),
+                second={"severity": "HIGH", "scanners": "vuln", "id": "abc"},
+            )
+            self.assertIsNone(
+                obj=cache.get(
+                    digest="sha256:1234", severity="CRITICAL", scanners="vuln"
+                )
+            )
+            self.assertIsNone(obj=cache.get(digest=None, severity="HIGH", scanners=""))
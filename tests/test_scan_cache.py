@@ -0,0 +1,92 @@
+"""Scan Cache Tests"""
+
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from typing import Any
+from scan_cache import ScanCache
+from scanner_options import ScannerOptions
+
+
+class ScanCacheTests(TestCase):
+    """Scan Cache Tests Class"""
+
+    my_scanner_options: ScannerOptions = ScannerOptions(
+        severity="HIGH,CRITICAL", scanners="vuln,secret"
+    )
+    my_result: dict[str, Any] = {
+        "status": "NOK",
+        "created": "2019-03-07T22:19:53.447205048Z",
+        "id": "sha256:6d1ef012b567",
+        "labels": None,
+        "vulnerabilities": {"summary": {"HIGH": 0, "CRITICAL": 1}},
+    }
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.cache_file: str = f"{self.tmp_dir.name}/cache.sqlite"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_set(self):
+        """Test Scan Cache Get/Set"""
+
+        cache: ScanCache = ScanCache(
+            cache_file=self.cache_file,
+            db_version="2:2023-09-14",
+            options=self.my_scanner_options,
+        )
+        self.assertIsNone(obj=cache.get(digest="sha256:1234"))
+        self.assertIsNone(obj=cache.get(digest=None))
+
+        cache.set(digest="sha256:1234", result=self.my_result)
+        cache.set(digest="sha256:5678", result={})
+        cache.set(digest="sha256:9abc", result={"status": "TIMEOUT"})
+        cache.set(digest=None, result=self.my_result)
+        cache.close()
+
+        cache = ScanCache(
+            cache_file=self.cache_file,
+            db_version="2:2023-09-14",
+            options=self.my_scanner_options,
+        )
+        self.assertEqual(first=cache.get(digest="sha256:1234"), second=self.my_result)
+        self.assertIsNone(obj=cache.get(digest="sha256:5678"))
+        self.assertIsNone(obj=cache.get(digest="sha256:9abc"))
+        cache.close()
+
+    def test_db_version_mismatch(self):
+        """Test Scan Cache Miss On New Database Version"""
+
+        cache: ScanCache = ScanCache(
+            cache_file=self.cache_file,
+            db_version="2:2023-09-14",
+            options=self.my_scanner_options,
+        )
+        cache.set(digest="sha256:1234", result=self.my_result)
+        cache.close()
+
+        cache = ScanCache(
+            cache_file=self.cache_file,
+            db_version="2:2023-09-15",
+            options=self.my_scanner_options,
+        )
+        self.assertIsNone(obj=cache.get(digest="sha256:1234"))
+        cache.close()
+
+    def test_last_result(self):
+        """Test Scan Cache Last Result Of Any Database Version"""
+
+        cache: ScanCache = ScanCache(
+            cache_file=self.cache_file,
+            db_version="2:2023-09-14",
+            options=self.my_scanner_options,
+        )
+        cache.set(digest="sha256:1234", result=self.my_result)
+        cache.db_version = "2:2023-09-15"
+        self.assertIsNone(obj=cache.get(digest="sha256:1234"))
+        self.assertEqual(
+            first=cache.last_result(digest="sha256:1234"), second=self.my_result
+        )
+        self.assertIsNone(obj=cache.last_result(digest=None))
+        cache.close()
@@ -0,0 +1,74 @@
+"""Scan Queue Tests"""
+
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from scan_queue import PRIORITY_PUSH, PRIORITY_RESCAN, QueuedScan, ScanQueue
+
+
+class ScanQueueTests(TestCase):
+    """Scan Queue Tests Class"""
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.queue_file: str = f"{self.tmp_dir.name}/queue.sqlite"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_priority(self):
+        """Test Pushes Are Taken Before Rescans"""
+
+        queue: ScanQueue = ScanQueue(queue_file=self.queue_file)
+        self.assertTrue(
+            expr=queue.put(
+                image_tag="alpine:3.7",
+                digest="sha256:1234",
+                aliases=("alpine:latest",),
+                priority=PRIORITY_RESCAN,
+            )
+        )
+        self.assertTrue(
+            expr=queue.put(image_tag="ubuntu:22.04", priority=PRIORITY_RESCAN)
+        )
+        self.assertTrue(
+            expr=queue.put(image_tag="python@sha256:5678", digest="sha256:5678")
+        )
+        self.assertFalse(expr=queue.put(image_tag="alpine:3.7", digest="sha256:1234"))
+        self.assertEqual(first=len(queue), second=3)
+
+        # Raised to push priority when pushed again, then oldest first
+        first: QueuedScan = queue.get()
+        self.assertEqual(
+            first=first,
+            second=QueuedScan(
+                id=first.id,
+                image_tag="alpine:3.7",
+                digest="sha256:1234",
+                aliases=("alpine:latest",),
+                priority=PRIORITY_PUSH,
+            ),
+        )
+        second: QueuedScan = queue.get()
+        self.assertEqual(first=second.image_tag, second="python@sha256:5678")
+        third: QueuedScan = queue.get()
+        self.assertIsNone(obj=third.digest)
+        self.assertIsNone(obj=queue.get())
+
+        for scan in [first, second, third]:
+            queue.done(scan_id=scan.id)
+        self.assertEqual(first=len(queue), second=0)
+        queue.close()
+
+    def test_requeue_running(self):
+        """Test Interrupted Scans Are Queued Again After A Restart"""
+
+        queue: ScanQueue = ScanQueue(queue_file=self.queue_file)
+        queue.put(image_tag="alpine:3.7", digest="sha256:1234")
+        queue.put(image_tag="alpine:3.6", digest="sha256:5678")
+        running: QueuedScan = queue.get()
+        queue.close()
+
+        queue = ScanQueue(queue_file=self.queue_file)
+        self.assertEqual(first=queue.requeue_running(), second=1)
+        self.assertEqual(first=queue.get(), second=running)
+        queue.close()
@@ -2,10 +2,26 @@
 
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
+from tempfile import TemporaryDirectory
+from os import makedirs
 from typing import Any
+from json import dumps, loads
 from dataclasses import dataclass
-from scanner import Scanner, download_database
+from subprocess import PIPE, TimeoutExpired
+from time import monotonic
+from scanner import (
+    Scanner,
+    ScanPool,
+    ScanTask,
+    download_database,
+    database_is_fresh,
+    get_database_version,
+    run_process,
+    update_databases,
+)
 from scanner_options import ScannerOptions
+from rate_limiter import RateLimiter
+from metrics import METRICS
 
 
 @dataclass
@@ -14,6 +30,22 @@ class FakeCompletedProcess:
 
     stdout: bytes = b""
     returncode: int = 0
+    stderr: bytes = b""
+
+
+class FakeTrivyRun:  # pylint: disable=too-few-public-methods
+    """FakeTrivyRun Class (writes the JSON report to Trivy '--output' file)"""
+
+    def __init__(self, stdout: str, returncode: int = 0):
+        self.stdout = stdout
+        self.returncode = returncode
+
+    def __call__(self, args: list[str], **_) -> FakeCompletedProcess:
+        if "--output" in args:
+            output_file: str = args[args.index("--output") + 1]
+            with open(file=output_file, mode="w", encoding="UTF-8") as file:
+                file.write(self.stdout)
+        return FakeCompletedProcess(returncode=self.returncode)
 
 
 class ScannerTests(TestCase):
@@ -35,7 +67,7 @@ class ScannerTests(TestCase):
         file="./tests/fixtures/trivy_scan_result.json",
         encoding="UTF-8",
     ) as my_file:
-        run_scan_stdout: bytes = "".join(my_file.readlines())
+        run_scan_stdout: str = "".join(my_file.readlines())
     run_scan_return: dict[str, Any] = {
         f"{my_docker_registry}/{my_image_tags[0]}": {
             "status": "NOK",
@@ -66,10 +98,8 @@ class ScannerTests(TestCase):
         self.assertEqual(first=self.my_scanner.scanners, second=self.my_scanners)
 
     @patch(
-        target="scanner.run",
-        new=MagicMock(
-            return_value=FakeCompletedProcess(stdout=run_scan_stdout, returncode=111)
-        ),
+        target="scanner.run_process",
+        new=FakeTrivyRun(stdout=run_scan_stdout, returncode=111),
     )
     def test_run_scan(self):
         """Test Run Scan Method"""
@@ -78,12 +108,349 @@ class ScannerTests(TestCase):
             second=self.run_scan_return,
         )
 
+    @patch(target="scanner.run_process")
+    def test_run_scan_server(self, run: MagicMock):
+        """Test Run Scan Method In Client/Server Mode"""
+
+        run.side_effect = FakeTrivyRun(stdout=self.run_scan_stdout, returncode=111)
+        scanner: Scanner = Scanner(
+            docker_registry=self.my_docker_registry,
+            image_tags=self.my_image_tags,
+            options=ScannerOptions(server_url="http://127.0.0.1:4954"),
+        )
+        scanner.run_scan(image_tag="alpine:3.7")
+        self.assertEqual(
+            first=run.call_args.kwargs.get("args")[:4],
+            second=["trivy", "image", "--server", "http://127.0.0.1:4954"],
+        )
+
+    @patch(target="scanner.run_process")
+    def test_run_scan_cache_dir(self, run: MagicMock):
+        """Test Run Scan Method With A Shared Trivy Cache Directory"""
+
+        run.side_effect = FakeTrivyRun(stdout=self.run_scan_stdout, returncode=111)
+        scanner: Scanner = Scanner(
+            docker_registry=self.my_docker_registry,
+            image_tags=self.my_image_tags,
+            options=ScannerOptions(cache_dir="/var/cache/trivy"),
+        )
+        scanner.run_scan(image_tag="alpine:3.7")
+        self.assertEqual(
+            first=run.call_args.kwargs.get("args")[:4],
+            second=["trivy", "image", "--cache-dir", "/var/cache/trivy"],
+        )
+
+    def test_run_process_timeout(self):
+        """Test Run Process Function Killing The Process Group On Timeout"""
+
+        start: float = monotonic()
+        with self.assertRaises(expected_exception=TimeoutExpired):
+            # The background child keeps the output pipe open: reading it
+            # to the end only returns once the child is killed too
+            run_process(args=["sh", "-c", "sleep 30 & wait"], timeout=0.2, stdout=PIPE)
+        self.assertLess(a=monotonic() - start, b=10)
+        self.assertEqual(
+            first=run_process(args=["sh", "-c", "exit 3"], timeout=10).returncode,
+            second=3,
+        )
+
+    @patch(target="scanner.run_process")
+    def test_run_scan_timeout(self, run: MagicMock):
+        """Test Run Scan Method Reporting Timed Out Scans"""
+
+        run.side_effect = TimeoutExpired(cmd="trivy", timeout=60)
+        scanner: Scanner = Scanner(
+            docker_registry=self.my_docker_registry,
+            image_tags=self.my_image_tags,
+            options=ScannerOptions(scan_timeout=60, scan_retries=2),
+        )
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(
+                first=scanner.run_scan(image_tag="alpine:3.7"),
+                second={
+                    f"{self.my_docker_registry}/alpine:3.7": {
+                        "status": "TIMEOUT",
+                        "timeout": 60,
+                    }
+                },
+            )
+        self.assertEqual(first=run.call_count, second=1)
+        self.assertEqual(first=run.call_args.kwargs.get("timeout"), second=60)
+
+    @patch(target="scanner.sleep")
+    @patch(target="scanner.run_process")
+    def test_run_scan_retries(self, run: MagicMock, _):
+        """Test Run Scan Method Retrying Failed Scans"""
+
+        scanner: Scanner = Scanner(
+            docker_registry=self.my_docker_registry,
+            image_tags=self.my_image_tags,
+            options=ScannerOptions(
+                severity=self.my_severity, scanners=self.my_scanners, scan_retries=2
+            ),
+        )
+        fake_trivy_run: FakeTrivyRun = FakeTrivyRun(
+            stdout=self.run_scan_stdout, returncode=111
+        )
+        run.side_effect = lambda **kwargs: (
+            fake_trivy_run(**kwargs)
+            if run.call_count > 1
+            else FakeCompletedProcess(returncode=1)
+        )
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(
+                first=scanner.run_scan(image_tag="alpine:3.7"),
+                second=self.run_scan_return,
+            )
+        self.assertEqual(first=scanner.timings.get("retries"), second=1)
+
+        run.side_effect = None
+        run.return_value = FakeCompletedProcess(returncode=1)
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(
+                first=scanner.run_scan(image_tag="alpine:3.7"),
+                second={
+                    f"{self.my_docker_registry}/alpine:3.7": {
+                        "status": "FAILED",
+                        "exit_code": 1,
+                    }
+                },
+            )
+        self.assertEqual(first=run.call_count, second=5)
+
+    @patch(target="scanner.download_database")
+    @patch(target="scanner.run_process")
+    def test_run_scan_java_database(self, run: MagicMock, download: MagicMock):
+        """Test Run Scan Method Downloading The Java DB When First Needed"""
+
+        fake_trivy_run: FakeTrivyRun = FakeTrivyRun(
+            stdout=self.run_scan_stdout, returncode=111
+        )
+        run.side_effect = lambda **kwargs: (
+            fake_trivy_run(**kwargs)
+            if run.call_count > 1
+            else FakeCompletedProcess(
+                returncode=1,
+                stderr=b"FATAL Unable to initialize the Java DB:"
+                b" '--skip-java-db-update' cannot be specified on the first run",
+            )
+        )
+        scanner: Scanner = Scanner(
+            docker_registry=self.my_docker_registry,
+            image_tags=self.my_image_tags,
+            options=ScannerOptions(
+                severity=self.my_severity, scanners=self.my_scanners
+            ),
+        )
+        self.assertEqual(
+            first=scanner.run_scan(image_tag="alpine:3.7"), second=self.run_scan_return
+        )
+        download.assert_called_once_with(database="java", cache_dir=None)
+        self.assertIn(
+            member="--skip-java-db-update", container=run.call_args.kwargs.get("args")
+        )
+
+    @patch(target="rate_limiter.RateLimiter.acquire", return_value=0.25)
+    @patch(target="scanner.run_process")
+    def test_run_scan_rate_limited(self, run: MagicMock, acquire: MagicMock):
+        """Test Run Scan Method Taking A Registry Rate Limiter Token"""
+
+        run.side_effect = FakeTrivyRun(stdout=self.run_scan_stdout, returncode=111)
+        scanner: Scanner = Scanner(
+            docker_registry=self.my_docker_registry,
+            image_tags=self.my_image_tags,
+            options=ScannerOptions(rate_limiter=RateLimiter(rate=20.0, burst=1)),
+        )
+        scanner.run_scan(image_tag="alpine:3.7")
+        self.assertEqual(first=acquire.call_count, second=1)
+        self.assertEqual(first=scanner.timings.get("rate_limit"), second=0.25)
+
+    @patch(target="scanner.run_process")
+    def test_run_scan_credentials(self, run: MagicMock):
+        """Test Run Scan Method Passing Registry Credentials To Trivy"""
+
+        run.side_effect = FakeTrivyRun(stdout=self.run_scan_stdout, returncode=111)
+        scanner: Scanner = Scanner(
+            docker_registry=self.my_docker_registry,
+            image_tags=self.my_image_tags,
+            options=ScannerOptions(
+                registry_username="scanner", registry_password="s3cr3t"
+            ),
+        )
+        scanner.run_scan(image_tag="alpine:3.7")
+        self.assertEqual(
+            first=run.call_args.kwargs.get("env").get("TRIVY_USERNAME"),
+            second="scanner",
+        )
+        self.assertEqual(
+            first=run.call_args.kwargs.get("env").get("TRIVY_PASSWORD"),
+            second="s3cr3t",
+        )
+
+    @patch(target="scanner.run_process")
+    def test_run_scan_sbom_cache(self, run: MagicMock):
+        """Test Run Scan Method With SBOM Cache"""
+
+        with TemporaryDirectory() as tmp_dir:
+            scanner: Scanner = Scanner(
+                docker_registry=self.my_docker_registry,
+                image_tags=self.my_image_tags,
+                options=ScannerOptions(
+                    severity=self.my_severity,
+                    scanners=self.my_scanners,
+                    sbom_cache_dir=tmp_dir,
+                ),
+            )
+            sbom_file: str = f"{tmp_dir}/sha256_1234.cdx.json"
+
+            def fake_image_run(args: list[str], **_) -> FakeCompletedProcess:
+                if "cyclonedx" in args:
+                    with open(file=sbom_file, mode="w", encoding="UTF-8") as file:
+                        file.write("{}")
+                    return FakeCompletedProcess()
+                return FakeTrivyRun(stdout=self.run_scan_stdout, returncode=111)(
+                    args=args
+                )
+
+            run.side_effect = fake_image_run
+            self.assertEqual(
+                first=scanner.run_scan(image_tag="alpine:3.7", digest="sha256:1234"),
+                second=self.run_scan_return,
+            )
+            self.assertEqual(first=run.call_count, second=2)
+
+            # Digest unchanged: only the cached SBOM is scanned
+            sbom_stdout: dict[str, Any] = loads(self.run_scan_stdout)
+            for result in sbom_stdout.get("Results"):
+                result.update(
+                    {
+                        "Target": result.get("Target").replace(
+                            f"{self.my_docker_registry}/alpine:3.7", sbom_file
+                        )
+                    }
+                )
+            run.side_effect = FakeTrivyRun(stdout=dumps(sbom_stdout), returncode=111)
+            self.assertEqual(
+                first=scanner.run_scan(image_tag="alpine:3.7", digest="sha256:1234"),
+                second=self.run_scan_return,
+            )
+            self.assertEqual(
+                first=run.call_args.kwargs.get("args")[:2], second=["trivy", "sbom"]
+            )
+
+    @patch(target="scanner.run_process")
+    def test_run_scan_sbom_credentials(self, run: MagicMock):
+        """Test SBOM Generation Passing Registry Credentials To Trivy"""
+
+        with TemporaryDirectory() as tmp_dir:
+            scanner: Scanner = Scanner(
+                docker_registry=self.my_docker_registry,
+                image_tags=self.my_image_tags,
+                options=ScannerOptions(
+                    sbom_cache_dir=tmp_dir,
+                    registry_username="scanner",
+                    registry_password="s3cr3t",
+                ),
+            )
+            run.side_effect = FakeTrivyRun(stdout=self.run_scan_stdout, returncode=111)
+            scanner.run_scan(image_tag="alpine:3.7", digest="sha256:1234")
+
+        self.assertEqual(first=run.call_count, second=2)
+        self.assertIn(member="cyclonedx", container=run.call_args.kwargs.get("args"))
+        self.assertEqual(
+            first=[
+                call.kwargs.get("env").get("TRIVY_USERNAME")
+                for call in run.call_args_list
+            ],
+            second=["scanner", "scanner"],
+        )
+
+    @patch(target="rate_limiter.RateLimiter.acquire", return_value=0.25)
+    @patch(target="scanner.run_process")
+    def test_run_scan_sbom_rate_limited(self, run: MagicMock, acquire: MagicMock):
+        """Test SBOM Generation Taking A Registry Rate Limiter Token"""
+
+        run.side_effect = FakeTrivyRun(stdout=self.run_scan_stdout, returncode=111)
+        with TemporaryDirectory() as tmp_dir:
+            scanner: Scanner = Scanner(
+                docker_registry=self.my_docker_registry,
+                image_tags=self.my_image_tags,
+                options=ScannerOptions(
+                    sbom_cache_dir=tmp_dir,
+                    rate_limiter=RateLimiter(rate=20.0, burst=1),
+                ),
+            )
+            scanner.run_scan(image_tag="alpine:3.7", digest="sha256:1234")
+
+        self.assertEqual(first=run.call_count, second=2)
+        self.assertEqual(first=acquire.call_count, second=2)
+        self.assertEqual(first=scanner.timings.get("rate_limit"), second=0.5)
+
+    @patch(
+        target="scanner.run_process",
+        new=FakeTrivyRun(stdout=run_scan_stdout, returncode=111),
+    )
+    def test_scan_pool(self):
+        """Test Scan Pool"""
+
+        tasks: list[ScanTask] = [
+            ScanTask(docker_registry=self.my_docker_registry, image_tag=image_tag)
+            for image_tag in ["alpine:3.7", "alpine:3.8", "alpine:3.9"]
+        ]
+        with ScanPool(options=self.my_scanner_options, max_pending=1) as scan_pool:
+            for task in tasks:
+                scan_pool.submit(task=task)
+            finished: dict[str, dict[str, Any]] = {
+                task.image_tag: results
+                for task, results in scan_pool.results(wait=True)
+            }
+        self.assertEqual(first=scan_pool.pending, second=0)
+        self.assertEqual(
+            first=sorted(finished), second=["alpine:3.7", "alpine:3.8", "alpine:3.9"]
+        )
+        self.assertEqual(first=finished.get("alpine:3.7"), second=self.run_scan_return)
+        # Histogram count of the image
+        self.assertGreaterEqual(
+            a=METRICS.histograms["image_scan_seconds"][(("image", "alpine"),)][-2],
+            b=3,
+        )
+
     @patch(target="scanner.run", new=MagicMock(return_value=FakeCompletedProcess()))
     def test_download_database(self):
         """Test Download Database"""
 
-        download_database()
-        download_database(database="java")
+        with TemporaryDirectory() as tmp_dir:
+            self.assertTrue(expr=download_database(cache_dir=tmp_dir))
+            self.assertTrue(expr=download_database(database="java", cache_dir=tmp_dir))
+
+    @patch(target="scanner.run")
+    def test_download_database_fresh(self, run: MagicMock):
+        """Test Download Database Skipped While The Database Is Fresh"""
+
+        run.return_value = FakeCompletedProcess()
+        with TemporaryDirectory() as tmp_dir:
+            makedirs(name=f"{tmp_dir}/db")
+            for next_update in [
+                "2999-01-01T00:00:00.123456789Z",
+                "2023-09-14T18:00:00Z",
+            ]:
+                with open(
+                    file=f"{tmp_dir}/db/metadata.json", mode="w", encoding="UTF-8"
+                ) as file:
+                    file.write(dumps({"Version": 2, "NextUpdate": next_update}))
+                with self.assertLogs(level="INFO"):
+                    download_database(cache_dir=tmp_dir)
+            self.assertTrue(expr=download_database(cache_dir=tmp_dir, force=True))
+            self.assertFalse(expr=database_is_fresh(database="java", cache_dir=tmp_dir))
+
+            # The Java DB is only updated once downloaded by a scan
+            update_databases(cache_dir=tmp_dir)
+
+        self.assertEqual(first=run.call_count, second=3)
+        self.assertEqual(
+            first=run.call_args.kwargs.get("args"),
+            second=["trivy", "image", "--download-db-only", "--cache-dir", tmp_dir],
+        )
 
     @patch(
         target="scanner.run",
@@ -92,5 +459,32 @@ class ScannerTests(TestCase):
     def test_download_database_raises(self):
         """Test Download Database"""
 
-        with self.assertRaises(expected_exception=SystemExit):
-            download_database()
+        with TemporaryDirectory() as tmp_dir, self.assertRaises(
+            expected_exception=SystemExit
+        ):
+            download_database(cache_dir=tmp_dir)
+
+    @patch(
+        target="scanner.run",
+        new=MagicMock(
+            return_value=FakeCompletedProcess(
+                stdout=b'{"Version": "0.45.1", "VulnerabilityDB": {"Version": 2,'
+                b' "UpdatedAt": "2023-09-14T12:07:06.123Z"}}'
+            )
+        ),
+    )
+    def test_get_database_version(self):
+        """Test Get Database Version"""
+
+        self.assertEqual(
+            first=get_database_version(), second="2:2023-09-14T12:07:06.123Z"
+        )
+
+    @patch(
+        target="scanner.run",
+        new=MagicMock(return_value=FakeCompletedProcess(stdout=b"{}")),
+    )
+    def test_get_database_version_unknown(self):
+        """Test Get Database Version Without Database"""
+
+        self.assertIsNone(obj=get_database_version())
@@ -1,7 +1,8 @@
 """ScannerOptionsTests"""
 
 from unittest import TestCase
-from scanner_options import ScannerOptions
+from rate_limiter import RateLimiter
+from scanner_options import RegistryAccess, ScannerOptions
 
 
 class ScannerOptionsTests(TestCase):
@@ -28,3 +29,29 @@ class ScannerOptionsTests(TestCase):
         self.assertEqual(
             first=ScannerOptions(min_severity="CRITICAL").severity, second="CRITICAL"
         )
+
+    def test_for_registry(self):
+        """Tests for_registry"""
+
+        rate_limiter: RateLimiter = RateLimiter(rate=10)
+        options: ScannerOptions = ScannerOptions(
+            registry_username="me",
+            registries={
+                "other.example.com:443": RegistryAccess(
+                    rate_limiter=rate_limiter, username="other", password="s3cr3t"
+                )
+            },
+        )
+
+        self.assertIs(expr1=options.for_registry("my.example.com:443"), expr2=options)
+        self.assertEqual(
+            first=options.for_registry("my.example.com:443").registry_credentials,
+            second={"TRIVY_USERNAME": "me", "TRIVY_PASSWORD": ""},
+        )
+        other_options: ScannerOptions = options.for_registry("other.example.com:443")
+        self.assertIs(expr1=other_options.rate_limiter, expr2=rate_limiter)
+        self.assertEqual(
+            first=other_options.registry_credentials,
+            second={"TRIVY_USERNAME": "other", "TRIVY_PASSWORD": "s3cr3t"},
+        )
+        self.assertIsNone(obj=options.rate_limiter)
@@ -0,0 +1,121 @@
+"""Scan Scheduler Tests"""
+
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+from typing import Any, Optional
+from scanner import ScanTask
+from scheduler import ScanScheduler, parse_created, parse_duration
+
+
+class ScanSchedulerTests(TestCase):
+    """Scan Scheduler Tests Class"""
+
+    my_docker_registry: str = "docker-registry.example.com:12345"
+
+    def test_parse_duration(self):
+        """Test Duration Parsing"""
+
+        self.assertEqual(first=parse_duration(value=None), second=0.0)
+        self.assertEqual(first=parse_duration(value="90"), second=90.0)
+        self.assertEqual(first=parse_duration(value="2h"), second=7200.0)
+        self.assertEqual(first=parse_duration(value="1h30m"), second=5400.0)
+        self.assertEqual(first=parse_duration(value="1.5d"), second=129600.0)
+        with self.assertRaises(expected_exception=ValueError):
+            parse_duration(value="2 hours")
+
+    def test_parse_created(self):
+        """Test Image Creation Date Parsing"""
+
+        self.assertEqual(
+            first=parse_created(value="2019-03-07T22:19:53.447205048Z"),
+            second=1551997193.447205,
+        )
+        self.assertEqual(first=parse_created(value=None), second=0.0)
+        self.assertEqual(first=parse_created(value="yesterday"), second=0.0)
+
+    def test_priority(self):
+        """Test Critical Tags, Never Scanned Digests And Recent Images First"""
+
+        cache: MagicMock = MagicMock()
+        last_results: dict[str, dict[str, Any]] = {
+            "sha256:old": {"created": "2019-03-07T22:19:53Z"},
+            "sha256:new": {"created": "2023-09-14T08:00:00Z"},
+        }
+
+        def last_result(digest: str) -> Optional[dict[str, Any]]:
+            return last_results.get(digest)
+
+        cache.last_result.side_effect = last_result
+        scheduler: ScanScheduler = ScanScheduler(
+            critical_tags=r"^(latest|prod-.*)$", cache=cache
+        )
+        for image_tag, digest, aliases in [
+            ("alpine:3.6", "sha256:old", ()),
+            ("alpine:3.7", "sha256:new", ()),
+            ("alpine:3.8", "sha256:unknown", ()),
+            ("ubuntu:22.04", "sha256:old", ("ubuntu:latest",)),
+            ("ubuntu:20.04", "sha256:old", ()),
+        ]:
+            scheduler.push(
+                task=ScanTask(
+                    docker_registry=self.my_docker_registry,
+                    image_tag=image_tag,
+                    digest=digest,
+                    aliases=aliases,
+                )
+            )
+
+        self.assertEqual(first=len(scheduler), second=5)
+        self.assertEqual(
+            first=[scheduler.pop().image_tag for _ in range(4)],
+            second=["ubuntu:22.04", "alpine:3.8", "alpine:3.7", "alpine:3.6"],
+        )
+        self.assertEqual(
+            first=[task.image_tag for task in scheduler.drain()],
+            second=["ubuntu:20.04"],
+        )
+        self.assertIsNone(obj=scheduler.pop())
+
+    @patch("scheduler.monotonic", return_value=100.0)
+    def test_time_budget(self, mock_monotonic):
+        """Test No Task Is Taken Once The Time Budget Is Spent"""
+
+        scheduler: ScanScheduler = ScanScheduler(time_budget=60.0)
+        scheduler.push(task=ScanTask(docker_registry="", image_tag="alpine:3.7"))
+        self.assertFalse(expr=scheduler.exhausted)
+
+        mock_monotonic.return_value = 160.0
+        self.assertTrue(expr=scheduler.exhausted)
+        self.assertIsNone(obj=scheduler.pop())
+        self.assertEqual(first=len(scheduler.drain()), second=1)
+        self.assertFalse(expr=ScanScheduler().exhausted)
+
+    def test_layer_affinity(self):
+        """Test Tasks Sharing A Base Layer Taken Back To Back"""
+
+        scheduler: ScanScheduler = ScanScheduler(critical_tags=r"^prod$")
+        for image_tag, base_layer in [
+            ("alpine:3.7", "sha256:alpine"),
+            ("ubuntu:22.04", "sha256:ubuntu"),
+            ("app:1.0", "sha256:alpine"),
+            ("api:prod", "sha256:ubuntu"),
+            ("web:1.0", "sha256:alpine"),
+            ("tool:1.0", None),
+        ]:
+            scheduler.push(
+                task=ScanTask(docker_registry="", image_tag=image_tag),
+                base_layer=base_layer,
+            )
+
+        self.assertEqual(
+            first=[scheduler.pop().image_tag for _ in range(len(scheduler))],
+            second=[
+                "api:prod",
+                "ubuntu:22.04",
+                "alpine:3.7",
+                "app:1.0",
+                "web:1.0",
+                "tool:1.0",
+            ],
+        )
+        self.assertIsNone(obj=scheduler.pop())
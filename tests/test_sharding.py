@@ -0,0 +1,39 @@
+"""Sharding Tests"""
+
+from unittest import TestCase
+from sharding import iter_shard, shard_of
+
+
+class ShardingTests(TestCase):
+    """Sharding Tests Class"""
+
+    my_images: list[str] = [f"repo-{index:05d}" for index in range(1000)]
+
+    def test_shard_of(self):
+        """Test Stable Shard Assignment"""
+
+        self.assertEqual(first=shard_of(key="alpine", shard_count=1), second=0)
+        self.assertEqual(
+            first=[shard_of(key="alpine", shard_count=count) for count in [2, 3, 4]],
+            second=[int("54c5b3dd459d5ef7", 16) % count for count in [2, 3, 4]],
+        )
+
+    def test_iter_shard(self):
+        """Test Shards Are Disjoint, Complete And Balanced"""
+
+        shards: list[list[str]] = [
+            list(iter_shard(keys=self.my_images, shard_index=index, shard_count=4))
+            for index in range(4)
+        ]
+        self.assertEqual(
+            first=sorted(image for shard in shards for image in shard),
+            second=self.my_images,
+        )
+        for shard in shards:
+            self.assertAlmostEqual(first=len(shard), second=250, delta=50)
+        self.assertEqual(
+            first=list(iter_shard(keys=self.my_images, shard_index=0, shard_count=1)),
+            second=self.my_images,
+        )
+        with self.assertRaises(expected_exception=ValueError):
+            list(iter_shard(keys=self.my_images, shard_index=4, shard_count=4))
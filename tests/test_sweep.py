@@ -0,0 +1,367 @@
+"""Sweep Tests"""
+
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+from http.client import HTTPException
+from threading import current_thread
+from typing import Any, Iterator, Optional
+from tempfile import TemporaryDirectory
+from fake_registry import FakeRegistry
+from docker_registry_client import DockerRegistryClient
+from layer_cache import LayerCache
+from metrics import METRICS
+from result_model import CompactResults
+from retention import TagRetention
+from sweep import Sweep
+from scanner import ScanTask
+from scanner_options import ScannerOptions
+
+
+class FakeDockerRegistryClient:
+    """FakeDockerRegistryClient Class"""
+
+    registry_host: str = "docker-registry.example.com"
+    registry_port: int = 12345
+    tags: dict[str, dict[str, Optional[str]]] = {
+        "alpine": {"latest": "sha256:1234", "3.7": "sha256:1234", "3.6": None},
+        "ubuntu": {},
+    }
+
+    def iter_images(self, **_) -> Iterator[str]:
+        """FakeDockerRegistryClient Iterate Images Method"""
+
+        yield from self.tags
+
+    def iter_image_tags(self, image: str, **_) -> Iterator[str]:
+        """FakeDockerRegistryClient Iterate Image Tags Method"""
+
+        for tag in self.tags.get(image, {}):
+            yield f"{image}:{tag}"
+
+    def get_image_digest(self, image_tag: str) -> Optional[str]:
+        """FakeDockerRegistryClient Get Image Digest Method"""
+
+        image, _, tag = image_tag.rpartition(":")
+        return self.tags.get(image, {}).get(tag)
+
+    def get_image_digests(self, image_tags: list[str]) -> dict[str, Optional[str]]:
+        """FakeDockerRegistryClient Get Image Digests Method"""
+
+        return {
+            image_tag: self.get_image_digest(image_tag=image_tag)
+            for image_tag in image_tags
+        }
+
+    def get_image_tags_layers(
+        self, image_tags: list[str]
+    ) -> dict[str, list[tuple[str, int]]]:
+        """FakeDockerRegistryClient Get Image Tags Layers Method"""
+
+        return {
+            image_tag: [("sha256:base", 100), (f"sha256:{image_tag}", 10)]
+            for image_tag in image_tags
+        }
+
+
+class OtherFakeDockerRegistryClient(FakeDockerRegistryClient):
+    """OtherFakeDockerRegistryClient Class (another registry)"""
+
+    registry_host: str = "other-registry.example.com"
+    registry_port: int = 443
+
+
+class LayersFailingDockerRegistryClient(FakeDockerRegistryClient):
+    """LayersFailingDockerRegistryClient Class (layers of 'alpine' not found)"""
+
+    def __init__(self) -> None:
+        self.layers_threads: set[str] = set()
+
+    def get_image_tags_layers(
+        self, image_tags: list[str]
+    ) -> dict[str, list[tuple[str, int]]]:
+        """LayersFailingDockerRegistryClient Get Image Tags Layers Method"""
+
+        self.layers_threads.add(current_thread().name)
+        if any(image_tag.startswith("alpine:") for image_tag in image_tags):
+            raise HTTPException("404 Not Found")
+        return super().get_image_tags_layers(image_tags=image_tags)
+
+
+class FakeScanPool:
+    """FakeScanPool Class (runs tasks synchronously)"""
+
+    available: int = 1
+
+    def __init__(self, **_) -> None:
+        self.finished: list[tuple[ScanTask, dict[str, Any]]] = []
+
+    def __enter__(self) -> "FakeScanPool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        pass
+
+    def submit(self, task: ScanTask) -> None:
+        """FakeScanPool Submit Method"""
+
+        self.finished.append((task, {task.docker_image_tag: {"status": "OK"}}))
+
+    def results(self, **_) -> Iterator[tuple[ScanTask, dict[str, Any]]]:
+        """FakeScanPool Results Method"""
+
+        while self.finished:
+            yield self.finished.pop(0)
+
+
+class SweepTests(TestCase):
+    """Sweep Tests Class"""
+
+    my_docker_registry: str = "docker-registry.example.com:12345"
+
+    @patch(target="sweep.ScanPool", new=FakeScanPool)
+    def test_run(self):
+        """Test Sweep Run"""
+
+        cache: MagicMock = MagicMock()
+        cache.get.return_value = None
+        sweep: Sweep = Sweep(
+            client=FakeDockerRegistryClient(), options=ScannerOptions(), cache=cache
+        )
+        with self.assertLogs(level="INFO"):
+            scan_results: dict[str, Any] = sweep.run(images=["alpine", "ubuntu"])
+
+        self.assertEqual(
+            first=sorted(scan_results),
+            second=[
+                f"{self.my_docker_registry}/alpine:3.6",
+                f"{self.my_docker_registry}/alpine:3.7",
+                f"{self.my_docker_registry}/alpine:latest",
+            ],
+        )
+        self.assertTrue(
+            expr=scan_results.get(f"{self.my_docker_registry}/alpine:3.7").get(
+                "deduplicated"
+            )
+        )
+        self.assertEqual(first=sweep.total_images, second=2)
+        self.assertEqual(first=sweep.total_tags_scanned, second=3)
+        self.assertEqual(first=cache.set.call_count, second=2)
+
+    @patch(target="sweep.ScanPool", new=FakeScanPool)
+    def test_run_cached(self):
+        """Test Sweep Run Answered From Scan Cache"""
+
+        cache: MagicMock = MagicMock()
+        cache.get.side_effect = lambda digest: (
+            {"status": "NOK", "vulnerabilities": {"summary": {"HIGH": 1}}}
+            if digest
+            else None
+        )
+        sweep: Sweep = Sweep(
+            client=FakeDockerRegistryClient(), options=ScannerOptions(), cache=cache
+        )
+        with self.assertLogs(level="INFO"):
+            scan_results: dict[str, Any] = sweep.run(images=["alpine"])
+
+        self.assertEqual(
+            first=scan_results.get(f"{self.my_docker_registry}/alpine:latest").get(
+                "status"
+            ),
+            second="NOK",
+        )
+        self.assertEqual(
+            first=scan_results.get(f"{self.my_docker_registry}/alpine:3.6"),
+            second={"status": "OK", "digest": None, "deduplicated": False},
+        )
+        self.assertEqual(first=cache.set.call_count, second=1)
+
+    @patch(target="sweep.ScanPool", new=FakeScanPool)
+    def test_run_resume(self):
+        """Test Sweep Run Streaming Results And Skipping Scanned Tags"""
+
+        report_writer: MagicMock = MagicMock()
+        sweep: Sweep = Sweep(
+            client=FakeDockerRegistryClient(),
+            options=ScannerOptions(),
+            report_writer=report_writer,
+            skip_tags={
+                f"{self.my_docker_registry}/alpine:latest",
+                f"{self.my_docker_registry}/alpine:3.7",
+            },
+        )
+        with self.assertLogs(level="INFO"):
+            scan_results: dict[str, Any] = sweep.run(images=["alpine"])
+
+        self.assertEqual(first=scan_results, second={})
+        report_writer.write.assert_called_once_with(
+            results={
+                f"{self.my_docker_registry}/alpine:3.6": {
+                    "status": "OK",
+                    "digest": None,
+                    "deduplicated": False,
+                }
+            }
+        )
+
+    @patch(target="sweep.ScanPool", new=FakeScanPool)
+    def test_run_time_budget(self):
+        """Test Sweep Run Reporting Skipped Tags Once Out Of Time"""
+
+        scheduler: MagicMock = MagicMock(exhausted=True)
+        scheduler.pop.return_value = None
+        scheduler.drain.return_value = [
+            ScanTask(
+                docker_registry=self.my_docker_registry,
+                image_tag="alpine:latest",
+                aliases=("alpine:latest", "alpine:3.7"),
+            )
+        ]
+        sweep: Sweep = Sweep(
+            client=FakeDockerRegistryClient(),
+            options=ScannerOptions(),
+            scheduler=scheduler,
+        )
+        with self.assertLogs(level="WARNING"):
+            scan_results: dict[str, Any] = sweep.run(images=["alpine"])
+
+        self.assertEqual(
+            first=scan_results.get(f"{self.my_docker_registry}/alpine:3.7"),
+            second={
+                "status": "SKIPPED",
+                "digest": None,
+                "deduplicated": True,
+                "scanned_as": f"{self.my_docker_registry}/alpine:latest",
+            },
+        )
+        self.assertEqual(first=sweep.total_tags_scanned, second=0)
+        self.assertEqual(first=sweep.total_tags_skipped, second=2)
+
+    @patch(target="sweep.ScanPool", new=FakeScanPool)
+    def test_run_registry_errors(self):
+        """Test Sweep Run Skipping An Image Missing From The Registry (404)"""
+
+        with FakeRegistry(repositories=2, tags=2) as registry:
+            with DockerRegistryClient(
+                registry_url=registry.url, ca_file=registry.ca_file
+            ) as client:
+                sweep: Sweep = Sweep(client=client, options=ScannerOptions())
+                with self.assertLogs(level="INFO") as logs:
+                    scan_results: dict[str, Any] = sweep.run(
+                        images=["repo-00000", "missing", "repo-00001"]
+                    )
+
+        docker_registry: str = sweep.docker_registry
+        self.assertEqual(
+            first=sorted(scan_results),
+            second=[
+                f"{docker_registry}/repo-00000:0",
+                f"{docker_registry}/repo-00000:1",
+                f"{docker_registry}/repo-00001:0",
+                f"{docker_registry}/repo-00001:1",
+            ],
+        )
+        self.assertTrue(
+            expr=any("'missing' not listed" in line for line in logs.output)
+        )
+
+    @patch(target="sweep.ScanPool", new=FakeScanPool)
+    def test_run_retention(self):
+        """Test Sweep Run Scanning Only Retained Tags"""
+
+        sweep: Sweep = Sweep(
+            client=FakeDockerRegistryClient(),
+            options=ScannerOptions(),
+            retention=TagRetention(keep_semver=1),
+        )
+        with self.assertLogs(level="INFO"):
+            scan_results: dict[str, Any] = sweep.run(images=["alpine"])
+
+        self.assertEqual(
+            first=list(scan_results), second=[f"{self.my_docker_registry}/alpine:3.7"]
+        )
+        self.assertEqual(first=sweep.total_tags, second=1)
+
+    @patch(target="sweep.ScanPool", new=FakeScanPool)
+    def test_run_layer_cache(self):
+        """Test Sweep Run Recording Layers Of Scanned Images"""
+
+        with TemporaryDirectory() as tmp_dir:
+            layer_cache: LayerCache = LayerCache(cache_dir=tmp_dir)
+            sweep: Sweep = Sweep(
+                client=FakeDockerRegistryClient(),
+                options=ScannerOptions(),
+                layer_cache=layer_cache,
+            )
+            with self.assertLogs(level="INFO"):
+                sweep.run(images=["alpine", "ubuntu"])
+
+        self.assertEqual(first=(layer_cache.hits, layer_cache.misses), second=(1, 3))
+        self.assertEqual(first=sweep.task_layers, second={})
+
+    @patch(target="sweep.ScanPool", new=FakeScanPool)
+    def test_run_layer_errors(self):
+        """Test Sweep Run Reading Layers In Metadata Threads, Errors Per Image"""
+
+        client: LayersFailingDockerRegistryClient = LayersFailingDockerRegistryClient()
+        client.tags = {"alpine": {"3.7": "sha256:1234"}, "debian": {"12": "sha256:12"}}
+        with TemporaryDirectory() as tmp_dir:
+            sweep: Sweep = Sweep(
+                client=client,
+                options=ScannerOptions(),
+                layer_cache=LayerCache(cache_dir=tmp_dir),
+            )
+            with self.assertLogs(level="INFO") as logs:
+                scan_results: dict[str, Any] = sweep.run(images=["alpine", "debian"])
+
+        self.assertEqual(
+            first=sorted(scan_results),
+            second=[
+                f"{self.my_docker_registry}/alpine:3.7",
+                f"{self.my_docker_registry}/debian:12",
+            ],
+        )
+        self.assertTrue(expr=any("layers not read" in line for line in logs.output))
+        self.assertTrue(expr=client.layers_threads)
+        self.assertTrue(
+            expr=all(name.startswith("metadata") for name in client.layers_threads)
+        )
+        self.assertEqual(first=sweep.task_layers, second={})
+
+    def test_run_registries(self):
+        """Test Sweeps Of Several Registries Sharing A Scan Pool And Results"""
+
+        scan_pool: FakeScanPool = FakeScanPool()
+        scan_results: CompactResults = CompactResults()
+        sweeps: list[Sweep] = [
+            Sweep(
+                client=client,
+                options=ScannerOptions(),
+                scan_results=scan_results,
+                metric_labels={"registry": f"{client.registry_host}"},
+            )
+            for client in [FakeDockerRegistryClient(), OtherFakeDockerRegistryClient()]
+        ]
+        with self.assertLogs(level="INFO"):
+            for sweep in sweeps:
+                self.assertIs(
+                    expr1=sweep.run(images=["alpine"], scan_pool=scan_pool),
+                    expr2=scan_results,
+                )
+
+        self.assertEqual(
+            first=sorted(scan_results),
+            second=[
+                f"{self.my_docker_registry}/alpine:3.6",
+                f"{self.my_docker_registry}/alpine:3.7",
+                f"{self.my_docker_registry}/alpine:latest",
+                "other-registry.example.com:443/alpine:3.6",
+                "other-registry.example.com:443/alpine:3.7",
+                "other-registry.example.com:443/alpine:latest",
+            ],
+        )
+        self.assertEqual(
+            first=METRICS.gauges["tags_discovered"][
+                (("registry", "other-registry.example.com"),)
+            ],
+            second=3,
+        )
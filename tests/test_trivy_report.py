@@ -0,0 +1,137 @@
+"""Trivy JSON Report Reader Tests"""
+
+from unittest import TestCase
+from unittest.mock import patch
+from tempfile import TemporaryDirectory
+from io import StringIO
+from json import JSONDecodeError, dumps, loads
+from os import path
+from typing import Any
+from tracemalloc import get_traced_memory, start, stop
+from test_scanner import FakeTrivyRun
+from trivy_report import JSONStream, read_trivy_report
+from scanner import Scanner
+from scanner_options import ScannerOptions
+
+
+class TrivyReportTests(TestCase):
+    """Trivy JSON Report Reader Tests Class"""
+
+    my_docker_registry: str = "docker-registry.example.com:12345"
+    with open(
+        file="./tests/fixtures/trivy_scan_result.json",
+        encoding="UTF-8",
+    ) as my_file:
+        trivy_scan_result: dict[str, Any] = loads(my_file.read())
+
+    def test_json_stream(self):
+        """Test JSON Stream Across Chunk Boundaries"""
+
+        document: dict[str, Any] = {
+            "number": 1234567890,
+            "list": [1, "two", {"three": 3.0}, [], {}],
+            "empty": {},
+            "null": None,
+        }
+        stream: JSONStream = JSONStream(file=StringIO(dumps(document)), chunk_size=1)
+        streamed: dict[str, Any] = {}
+        for key in stream.iter_object():
+            if key == "list":
+                streamed.update(
+                    {key: [stream.read_value() for _ in stream.iter_array()]}
+                )
+            else:
+                streamed.update({key: stream.read_value()})
+        self.assertEqual(first=streamed, second=document)
+        self.assertEqual(first=stream.peek(), second="")
+
+        empty: JSONStream = JSONStream(file=StringIO("{} []"), chunk_size=1)
+        self.assertEqual(first=list(empty.iter_object()), second=[])
+        self.assertEqual(first=list(empty.iter_array()), second=[])
+
+        with self.assertRaises(expected_exception=JSONDecodeError):
+            JSONStream(file=StringIO('"truncated'), chunk_size=1).read_value()
+        with self.assertRaises(expected_exception=JSONDecodeError):
+            list(JSONStream(file=StringIO('{"truncated": [1, 2')).iter_object())
+        with self.assertRaises(expected_exception=JSONDecodeError):
+            read_trivy_report(file=StringIO('{"Results": [{"Target": "a"'))
+
+    def test_read_trivy_report(self):
+        """Test Read Trivy Report"""
+
+        metadata, results = read_trivy_report(
+            file=StringIO(dumps(self.trivy_scan_result))
+        )
+        self.assertEqual(first=metadata, second=self.trivy_scan_result.get("Metadata"))
+        self.assertEqual(
+            first=results,
+            second=[
+                {
+                    "Target": f"{self.my_docker_registry}/alpine:3.7 (alpine 3.7.3)",
+                    "Class": "os-pkgs",
+                    "Type": "alpine",
+                    "Findings": [
+                        ["CVE-2019-14697", "CRITICAL"],
+                        ["CVE-2019-14697", "CRITICAL"],
+                    ],
+                }
+            ],
+        )
+        self.assertEqual(
+            first=read_trivy_report(file=StringIO('{"Results": null}')),
+            second=({}, []),
+        )
+
+    def test_large_report(self):
+        """Test Large Report (bounded memory and linear deduplication)"""
+
+        vulnerabilities_number: int = 20000
+        large_result: dict[str, Any] = loads(dumps(self.trivy_scan_result))
+        vulnerability: dict[str, Any] = large_result.get("Results")[0].get(
+            "Vulnerabilities"
+        )[0]
+        large_result.get("Results")[0].update(
+            {
+                "Vulnerabilities": [
+                    dict(vulnerability, VulnerabilityID=f"CVE-2023-{index // 2}")
+                    for index in range(vulnerabilities_number)
+                ]
+            }
+        )
+
+        with TemporaryDirectory() as tmp_dir:
+            report_file: str = path.join(tmp_dir, "report.json")
+            with open(file=report_file, mode="w", encoding="UTF-8") as file:
+                file.write(dumps(large_result))
+            del large_result
+            report_size: int = path.getsize(report_file)
+
+            start()
+            with open(file=report_file, encoding="UTF-8") as file:
+                _, results = read_trivy_report(file=file)
+            _, peak = get_traced_memory()
+            stop()
+
+            self.assertEqual(
+                first=len(results[0].get("Findings")), second=vulnerabilities_number
+            )
+            self.assertLess(a=peak, b=report_size // 4)
+
+            with open(file=report_file, encoding="UTF-8") as file:
+                fake_trivy_run: FakeTrivyRun = FakeTrivyRun(
+                    stdout=file.read(), returncode=111
+                )
+
+        with patch(target="scanner.run_process", new=fake_trivy_run):
+            scan_result: dict[str, Any] = Scanner(
+                docker_registry=self.my_docker_registry,
+                image_tags=["alpine:3.7"],
+                options=ScannerOptions(severity="HIGH,CRITICAL"),
+            ).run_scan(image_tag="alpine:3.7")
+        vulnerabilities: dict[str, Any] = scan_result.get(
+            f"{self.my_docker_registry}/alpine:3.7"
+        ).get("vulnerabilities")
+        self.assertEqual(
+            first=vulnerabilities.get("summary"),
+            second={"HIGH": 0, "CRITICAL": vulnerabilities_number // 2},
+        )
@@ -0,0 +1,80 @@
+"""Trivy Server Tests"""
+
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+from typing import Optional
+from urllib.error import URLError
+from trivy_server import TrivyServer
+
+
+class FakePopen:
+    """FakePopen Class"""
+
+    def __init__(self, returncode: Optional[int] = None, **_):
+        self.returncode = returncode
+        self.terminated: bool = False
+
+    def poll(self) -> Optional[int]:
+        """FakePopen Poll Method"""
+
+        return self.returncode
+
+    def terminate(self) -> None:
+        """FakePopen Terminate Method"""
+
+        self.terminated = True
+        self.returncode = 0
+
+    def wait(self, **_) -> Optional[int]:
+        """FakePopen Wait Method"""
+
+        return self.returncode
+
+
+class TrivyServerTests(TestCase):
+    """Trivy Server Tests Class"""
+
+    @patch(target="trivy_server.Popen", new=FakePopen)
+    @patch(target="trivy_server.urlopen")
+    def test_start_stop(self, urlopen: MagicMock):
+        """Test Trivy Server Start And Stop"""
+
+        urlopen.return_value.__enter__.return_value.status = 200
+
+        with self.assertLogs(level="INFO"):
+            with TrivyServer(listen="127.0.0.1:12345") as trivy_server:
+                self.assertEqual(
+                    first=trivy_server.url, second="http://127.0.0.1:12345"
+                )
+                self.assertTrue(expr=trivy_server.healthy())
+                process: FakePopen = trivy_server.process
+        self.assertTrue(expr=process.terminated)  # pylint: disable=no-member
+        self.assertFalse(expr=trivy_server.healthy())
+
+    @patch(target="trivy_server.Popen", new=FakePopen)
+    @patch(target="trivy_server.urlopen")
+    def test_restart(self, urlopen: MagicMock):
+        """Test Trivy Server Restart (new process, error when not healthy)"""
+
+        urlopen.return_value.__enter__.return_value.status = 200
+        trivy_server: TrivyServer = TrivyServer(startup_timeout=0)
+        with self.assertLogs(level="INFO"):
+            trivy_server.start()
+            process: FakePopen = trivy_server.process
+            trivy_server.restart()
+        self.assertTrue(expr=process.terminated)  # pylint: disable=no-member
+        self.assertIsNot(expr1=trivy_server.process, expr2=process)
+
+        urlopen.side_effect = URLError("down")
+        with self.assertLogs(level="INFO"):
+            with self.assertRaises(expected_exception=RuntimeError):
+                trivy_server.restart()
+
+    @patch(target="trivy_server.Popen", new=FakePopen)
+    @patch(target="trivy_server.urlopen", new=MagicMock(side_effect=URLError("down")))
+    def test_start_timeout(self):
+        """Test Trivy Server Never Healthy"""
+
+        with self.assertLogs(level="INFO"):
+            with self.assertRaises(expected_exception=SystemExit):
+                TrivyServer(startup_timeout=0).start()